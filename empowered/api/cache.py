@@ -0,0 +1,195 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from dotenv import load_dotenv
+
+from empowered.utils.logger_setup import get_logger
+
+logger = get_logger(name=__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "empowered" / "census"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 2 * 1024**3
+# ACS vintages are published the year after they cover; once a vintage is
+# this many years old its responses no longer change.
+IMMUTABLE_AFTER_YEARS = 2
+EVICT_EVERY_WRITES = 200
+
+_YEAR_IN_PATH = re.compile(r"/data/(\d{4})/")
+
+
+def normalize_url(url: str) -> str:
+    """Drop the API key and sort query parameters so equal requests share a key."""
+    parts = urlsplit(url)
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "key"
+    )
+    return urlunsplit(
+        (parts.scheme, parts.netloc, parts.path, urlencode(query, safe="*:(),"), "")
+    )
+
+
+def is_immutable(url: str, today: Optional[date] = None) -> bool:
+    match = _YEAR_IN_PATH.search(url)
+    if not match:
+        return False
+    today = today or date.today()
+    return int(match.group(1)) <= today.year - IMMUTABLE_AFTER_YEARS
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of raw Census API responses.
+
+    Entries are gzip-compressed JSON envelopes holding the normalized URL
+    (API key stripped), the fetch time and the original response body, so the
+    cache doubles as the raw-response archive. Entries for past vintages live
+    under `immutable/` and are never expired or evicted; everything else is
+    subject to `ttl_seconds` and to `max_bytes` (oldest first).
+    """
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_CACHE_DIR,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _path(self, normalized: str) -> Path:
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        tier = "immutable" if is_immutable(normalized) else "mutable"
+        return self.directory / tier / digest[:2] / f"{digest}.json.gz"
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the cached response body for `url`, or None on a miss."""
+        normalized = normalize_url(url)
+        path = self._path(normalized)
+        try:
+            if path.parent.parent.name == "mutable":
+                age = time.time() - path.stat().st_mtime
+                if age > self.ttl_seconds:
+                    path.unlink(missing_ok=True)
+                    self._count("misses")
+                    return None
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                envelope = json.load(f)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            self._count("misses")
+            return None
+        self._count("hits")
+        return envelope["body"]
+
+    def set(self, url: str, body: str) -> None:
+        normalized = normalize_url(url)
+        path = self._path(normalized)
+        envelope = {"url": normalized, "fetched_at": time.time(), "body": body}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(envelope, f)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._counters["writes"] += 1
+            self._writes_since_evict += 1
+            should_evict = self._writes_since_evict >= EVICT_EVERY_WRITES
+            if should_evict:
+                self._writes_since_evict = 0
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired mutable entries, then the oldest ones until under max_bytes."""
+        mutable = self.directory / "mutable"
+        if not mutable.exists():
+            return 0
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in mutable.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._counters["evictions"] += removed
+        if removed:
+            logger.info(f"Evicted {removed} cached Census responses")
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+_DISABLED = object()  # remembered like a cache, so .env is read only once
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Shared cache configured from the environment:
+    CENSUS_CACHE_DIR, CENSUS_CACHE_TTL (seconds), CENSUS_CACHE_MAX_BYTES.
+    Set CENSUS_CACHE_DISABLED=1 to bypass it.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                load_dotenv()
+                if os.getenv("CENSUS_CACHE_DISABLED") == "1":
+                    _cache = _DISABLED
+                    logger.info("Census response cache disabled")
+                else:
+                    _cache = ResponseCache(
+                        directory=Path(
+                            os.getenv("CENSUS_CACHE_DIR", DEFAULT_CACHE_DIR)
+                        ),
+                        ttl_seconds=float(
+                            os.getenv("CENSUS_CACHE_TTL", DEFAULT_TTL_SECONDS)
+                        ),
+                        max_bytes=int(
+                            os.getenv("CENSUS_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+                        ),
+                    )
+                    logger.info(f"Census response cache at {_cache.directory}")
+    return None if _cache is _DISABLED else _cache
@@ -1,16 +1,31 @@
 from bs4 import BeautifulSoup
+from collections import defaultdict
 from functools import lru_cache
+import json
 import re
 import requests
 from typing import List, Dict, Optional
+from empowered.api.cache import get_response_cache, normalize_url
+from empowered.api.decode import EstimateTable, decode_estimates
+from empowered.api.rate_limit import get_rate_limiter, key_id
+from empowered.api.single_flight import SingleFlight
+from empowered.api.transport import get_transport
 from empowered.utils.logger_setup import get_logger
-from empowered.utils.helpers import get_census_api_key
+from empowered.utils.helpers import get_census_api_base_url, get_census_api_key
 
 logger = get_logger(name=__name__)
 
 ACS5_URL = "https://www.census.gov/data/developers/data-sets/acs-5year.html"
 ACS1_URL = "https://www.census.gov/data/developers/data-sets/acs-1year.html"
 
+# Shared by the sync and async fetchers: identical concurrent requests wait on
+# one in-flight call instead of each hitting the network
+REQUEST_FLIGHT = SingleFlight()
+
+# Pass as place_fips/county_fips/tract/block_group to fetch every geography of
+# that level in a state (or, for block groups, a county)
+WILDCARD = "*"
+
 
 class CensusAPIError(Exception):
     def __init__(self, message, status_code=None):
@@ -18,7 +33,15 @@ class CensusAPIError(Exception):
         self.status_code = status_code
 
 
+class CensusRateLimitError(CensusAPIError):
+    def __init__(self, message, retry_after: float, status_code=429):
+        super().__init__(message, status_code=status_code)
+        self.retry_after = retry_after
+
+
 def convert_single_digit_fips(fips: int) -> str:
+    if fips == WILDCARD:
+        return fips
     if len(str(fips)) == 1:
         updated_fips = f"0{fips}"
         # print(f"fips={fips} to {updated_fips}")
@@ -28,12 +51,18 @@ def convert_single_digit_fips(fips: int) -> str:
 
 # ------------------ HTML Parsing ------------------
 def get_html(url: str) -> str:
-    response = requests.get(url)
+    cache = get_response_cache()
+    cached = cache.get(url) if cache else None
+    if cached is not None:
+        return cached
+    response = get_transport().get(url)
     if response.status_code != 200:
         raise CensusAPIError(
             f"Request at {url} failed with status code={response.status_code}",
             status_code=response.status_code,
         )
+    if cache:
+        cache.set(url, response.text)
     return response.text
 
 
@@ -65,61 +94,154 @@ def get_years(acs_id: int) -> List[int]:
     return parse_years_from_html(html)
 
 
-# ------------------ Groups ------------------
-@lru_cache(maxsize=32)
-def get_groups(
-    acs_id: int,
-    year: int,
-    api_key: str = get_census_api_key(),
-) -> List[Dict]:
-    url = f"https://api.census.gov/data/{year}/acs/acs{acs_id}/groups?key={api_key}"
+# ------------------ Requests ------------------
+def _get_text(url: str, what: str) -> str:
+    """GET a JSON body as text, coalescing identical in-flight requests."""
+    return REQUEST_FLIGHT.do(normalize_url(url), _fetch_text, url, what)
+
+
+def _fetch_text(url: str, what: str) -> str:
+    """GET a JSON body as text, served from the on-disk cache when possible."""
+    cache = get_response_cache()
+    cached = cache.get(url) if cache else None
+    if cached is not None:
+        return cached
+    limiter = get_rate_limiter()
     try:
-        response = requests.get(url)
+        limiter.acquire(key_id(url))
+        response = get_transport().get(url)
+        retry_after = limiter.observe(response.status_code, response.headers)
+        if retry_after is not None:
+            raise CensusRateLimitError(
+                f"Failed to fetch {what}: rate limited", retry_after=retry_after
+            )
         response.raise_for_status()
-        groups = response.json().get("groups", [])
-        return groups  # raw API JSON
+        text = response.text
+    except CensusAPIError:
+        raise
     except requests.HTTPError as e:
         raise CensusAPIError(
-            f"Failed to fetch groups: {e}", status_code=e.response.status_code
+            f"Failed to fetch {what}: {e}", status_code=e.response.status_code
         )
     except Exception as e:
-        raise CensusAPIError(f"Failed to fetch groups: {e}")
+        raise CensusAPIError(f"Failed to fetch {what}: {e}")
+    # the API reports some errors as 200 with an HTML/plain-text body
+    if not text.lstrip().startswith(("[", "{")):
+        raise CensusAPIError(f"Failed to fetch {what}: non-JSON body {text[:200]}")
+    if cache:
+        cache.set(url, text)
+    return text
+
+
+def _get_json(url: str, what: str):
+    try:
+        return json.loads(_get_text(url, what))
+    except json.JSONDecodeError as e:
+        raise CensusAPIError(f"Failed to fetch {what}: {e}")
+
+
+def dataset_url(acs_id: int, year: int) -> str:
+    return f"{get_census_api_base_url()}/data/{year}/acs/acs{acs_id}"
+
+
+# ------------------ Groups ------------------
+def groups_url(acs_id: int, year: int, api_key: str) -> str:
+    return f"{dataset_url(acs_id, year)}/groups?key={api_key}"
+
+
+def parse_groups(payload: Dict) -> List[Dict]:
+    return payload.get("groups", [])  # raw API JSON
 
 
 @lru_cache(maxsize=32)
-def get_group_ids(acs_id: int, year: int) -> set:
-    groups = get_groups(acs_id, year)
-    return {g["name"] for g in groups}
+def get_groups(
+    acs_id: int,
+    year: int,
+    api_key: str = get_census_api_key(),
+) -> List[Dict]:
+    payload = _get_json(groups_url(acs_id, year, api_key), "groups")
+    return parse_groups(payload)
 
 
 def validate_group_id(acs_id: int, year: int, group_id: str) -> bool:
-    return group_id in get_group_ids(acs_id, year)
+    return group_id in get_variable_catalog(acs_id, year)
 
 
 # ------------------ Variables ------------------
-@lru_cache(maxsize=64)
+def variables_url(acs_id: int, year: int, group_id: str, api_key: str) -> str:
+    return f"{dataset_url(acs_id, year)}/groups/{group_id}.json?key={api_key}"
+
+
+def all_variables_url(acs_id: int, year: int, api_key: str) -> str:
+    return f"{dataset_url(acs_id, year)}/variables.json?key={api_key}"
+
+
+def parse_variables(payload: Dict) -> List[Dict]:
+    variables = payload.get("variables", {})
+    return [{"id": vid, **v} for vid, v in variables.items()]  # raw JSON
+
+
+class VariableCatalog:
+    """
+    In-memory index of a dataset's variables.json by group, so one download
+    per (dataset, year) answers every per-group variable lookup.
+    """
+
+    def __init__(self, variables: List[Dict]) -> None:
+        by_group: Dict[str, List[Dict]] = defaultdict(list)
+        for v in variables:
+            group_id = v.get("group")
+            if group_id and group_id != "N/A":
+                by_group[group_id].append(v)
+        self.by_group = dict(by_group)
+
+    def __contains__(self, group_id: str) -> bool:
+        return group_id in self.by_group
+
+    def group_ids(self) -> set:
+        return set(self.by_group)
+
+    def variables(self, group_id: str) -> List[Dict]:
+        return self.by_group.get(group_id, [])
+
+
+# one catalog per dataset and year: room for every vintage of ACS-1 and
+# ACS-5 an ingest runs, like get_groups
+@lru_cache(maxsize=32)
+def get_variable_catalog(
+    acs_id: int,
+    year: int,
+    api_key: str = get_census_api_key(),
+) -> VariableCatalog:
+    payload = _get_json(all_variables_url(acs_id, year, api_key), "variables")
+    return VariableCatalog(parse_variables(payload))
+
+
 def get_variables(
     acs_id: int,
     year: int,
     group_id: str,
     api_key: str = get_census_api_key(),
 ) -> List[Dict]:
-    url = f"https://api.census.gov/data/{year}/acs/acs{acs_id}/groups/{group_id}.json?key={api_key}"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        variables = response.json().get("variables", {})
-        return [{"id": vid, **v} for vid, v in variables.items()]  # raw JSON
-    except requests.HTTPError as e:
-        raise CensusAPIError(
-            f"Failed to fetch variables for group {group_id}: {e}",
-            status_code=e.response.status_code,
-        )
-    except Exception as e:
-        raise CensusAPIError(f"Failed to fetch variables for group {group_id}: {e}")
+    return get_variable_catalog(acs_id, year, api_key).variables(group_id)
 
 
 # -------------------- Geography ----------------
+def states_url(acs_id: int, year: int, api_key: str) -> str:
+    return f"{dataset_url(acs_id, year)}?get=NAME&for=state:*&key={api_key}"
+
+
+def parse_states(payload: List[List], state_name: Optional[str] = None) -> Dict:
+    rows = payload[1:]
+    states_list = [{"state_name": row[0], "state_fips": row[1]} for row in rows]
+    if state_name:
+        match = [s for s in states_list if s["state_name"] == state_name]
+        if not match:
+            raise CensusAPIError(f"State '{state_name}' not found.")
+        return {"states": match}
+    return {"states": states_list}
+
+
 @lru_cache(maxsize=128)
 def get_states(
     acs_id: int,
@@ -127,24 +249,37 @@ def get_states(
     state_name: Optional[str] = None,
     api_key: str = get_census_api_key(),
 ):
-    url = f"https://api.census.gov/data/{year}/acs/acs{acs_id}?get=NAME&for=state:*&key={api_key}"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        rows = response.json()[1:]
-        states_list = [{"state_name": row[0], "state_fips": row[1]} for row in rows]
-        if state_name:
-            match = [s for s in states_list if s["state_name"] == state_name]
-            if not match:
-                raise CensusAPIError(f"State '{state_name}' not found.")
-            return {"states": match}
-        return {"states": states_list}
-    except requests.HTTPError as e:
-        raise CensusAPIError(
-            f"Failed to fetch states: {e}", status_code=e.response.status_code
-        )
-    except Exception as e:
-        raise CensusAPIError(f"Failed to fetch states: {e}")
+    payload = _get_json(states_url(acs_id, year, api_key), "states")
+    return parse_states(payload, state_name)
+
+
+def counties_url(acs_id: int, year: int, fips_code: str, api_key: str) -> str:
+    return (
+        f"{dataset_url(acs_id, year)}"
+        f"?get=NAME&for=county:*&in=state:{fips_code}&key={api_key}"
+    )
+
+
+def parse_counties(
+    payload: List[List], fips_code: str, county_name: Optional[str] = None
+) -> Dict:
+    rows = payload[1:]
+    counties_list = [
+        {
+            "county_name": row[0],
+            "county_fips": row[-1],
+            "state_fips": str(fips_code),
+        }
+        for row in rows
+    ]
+    if county_name:
+        match = [c for c in counties_list if c["county_name"] == county_name]
+        if not match:
+            raise CensusAPIError(
+                f"County '{county_name}' not found in state {fips_code}."
+            )
+        return {"state_fips": str(fips_code), "counties": match}
+    return {"state_fips": str(fips_code), "counties": counties_list}
 
 
 @lru_cache(maxsize=256)
@@ -156,36 +291,33 @@ def get_counties(
     api_key: str = get_census_api_key(),
 ):
     fips_code = convert_single_digit_fips(fips=fips_code)
-    url = (
-        f"https://api.census.gov/data/{year}/acs/acs{acs_id}"
-        f"?get=NAME&for=county:*&in=state:{fips_code}&key={api_key}"
+    payload = _get_json(counties_url(acs_id, year, fips_code, api_key), "counties")
+    return parse_counties(payload, fips_code, county_name)
+
+
+def places_url(acs_id: int, year: int, state_fips_code: str, api_key: str) -> str:
+    return (
+        f"{dataset_url(acs_id, year)}"
+        f"?get=NAME&for=place:*&in=state:{state_fips_code}&key={api_key}"
     )
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        rows = response.json()[1:]
-        counties_list = [
-            {
-                "county_name": row[0],
-                "county_fips": row[-1],
-                "state_fips": str(fips_code),
-            }
-            for row in rows
-        ]
-        if county_name:
-            match = [c for c in counties_list if c["county_name"] == county_name]
-            if not match:
-                raise CensusAPIError(
-                    f"County '{county_name}' not found in state {fips_code}."
-                )
-            return {"state_fips": str(fips_code), "counties": match}
-        return {"state_fips": str(fips_code), "counties": counties_list}
-    except requests.HTTPError as e:
-        raise CensusAPIError(
-            f"Failed to fetch counties: {e}", status_code=e.response.status_code
-        )
-    except Exception as e:
-        raise CensusAPIError(f"Failed to fetch counties: {e}")
+
+
+def parse_places(
+    payload: List[List], state_fips_code: str, place_name: Optional[str] = None
+) -> Dict:
+    rows = payload[1:]
+    places_list = [
+        {"place_name": row[0], "state_fips": row[1], "place_fips": row[2]}
+        for row in rows
+    ]
+    if place_name:
+        match = [p for p in places_list if p["place_name"] == place_name]
+        if not match:
+            raise CensusAPIError(
+                f"Place '{place_name}' not found in state {state_fips_code}"
+            )
+        return {"state_fips": str(state_fips_code), "places": match}
+    return {"state_fips": str(state_fips_code), "places": places_list}
 
 
 @lru_cache(maxsize=128)
@@ -197,36 +329,108 @@ def get_places(
     api_key: str = get_census_api_key(),
 ):
     state_fips_code = convert_single_digit_fips(fips=state_fips_code)
-    url = (
-        f"https://api.census.gov/data/{year}/acs/acs{acs_id}"
-        f"?get=NAME&for=place:*&in=state:{state_fips_code}&key={api_key}"
+    payload = _get_json(
+        places_url(acs_id, year, state_fips_code, api_key), "places"
     )
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        rows = response.json()[1:]
-        places_list = [
-            {"place_name": row[0], "state_fips": row[1], "place_fips": row[2]}
-            for row in rows
-        ]
-        if place_name:
-            match = [p for p in places_list if p["place_name"] == place_name]
-            if not match:
-                raise CensusAPIError(
-                    f"Place '{place_name}' not found in state {state_fips_code}"
-                )
-            return {"state_fips": str(state_fips_code), "places": match}
-        return {"state_fips": str(state_fips_code), "places": places_list}
-    except requests.HTTPError as e:
-        raise CensusAPIError(
-            f"Failed to fetch places: {e}", status_code=e.response.status_code
-        )
-    except Exception as e:
-        raise CensusAPIError(f"Failed to fetch places: {e}")
+    return parse_places(payload, state_fips_code, place_name)
+
+
+def tracts_url(acs_id: int, year: int, state_fips_code: str, api_key: str) -> str:
+    return (
+        f"{dataset_url(acs_id, year)}"
+        f"?get=NAME&for=tract:*&in=state:{state_fips_code}&key={api_key}"
+    )
+
+
+def parse_tracts(payload: List[List], state_fips_code: str) -> Dict:
+    index = {name: i for i, name in enumerate(payload[0])}
+    tracts_list = [
+        {
+            "tract_name": row[index["NAME"]],
+            "state_fips": row[index["state"]],
+            "county_fips": row[index["county"]],
+            "tract_code": row[index["tract"]],
+        }
+        for row in payload[1:]
+    ]
+    return {"state_fips": str(state_fips_code), "tracts": tracts_list}
+
+
+@lru_cache(maxsize=64)
+def get_tracts(
+    acs_id: int,
+    year: int,
+    state_fips_code: int,
+    api_key: str = get_census_api_key(),
+):
+    """Every census tract of a state in one request (5-year datasets only)."""
+    state_fips_code = convert_single_digit_fips(fips=state_fips_code)
+    payload = _get_json(tracts_url(acs_id, year, state_fips_code, api_key), "tracts")
+    return parse_tracts(payload, state_fips_code)
+
+
+def block_groups_url(
+    acs_id: int, year: int, state_fips_code: str, county_fips: str, api_key: str
+) -> str:
+    return (
+        f"{dataset_url(acs_id, year)}?get=NAME&for=block%20group:*"
+        f"&in=state:{state_fips_code}&in=county:{county_fips}&key={api_key}"
+    )
+
+
+def parse_block_groups(
+    payload: List[List], state_fips_code: str, county_fips: str
+) -> Dict:
+    index = {name: i for i, name in enumerate(payload[0])}
+    block_groups_list = [
+        {
+            "block_group_name": row[index["NAME"]],
+            "state_fips": row[index["state"]],
+            "county_fips": row[index["county"]],
+            "tract_code": row[index["tract"]],
+            "block_group": row[index["block group"]],
+        }
+        for row in payload[1:]
+    ]
+    return {
+        "state_fips": str(state_fips_code),
+        "county_fips": str(county_fips),
+        "block_groups": block_groups_list,
+    }
+
+
+@lru_cache(maxsize=64)
+def get_block_groups(
+    acs_id: int,
+    year: int,
+    state_fips_code: int,
+    county_fips: str,
+    api_key: str = get_census_api_key(),
+):
+    """
+    Every block group of a county in one request (5-year datasets only; the
+    API only lists block groups within a county).
+    """
+    state_fips_code = convert_single_digit_fips(fips=state_fips_code)
+    payload = _get_json(
+        block_groups_url(acs_id, year, state_fips_code, county_fips, api_key),
+        "block groups",
+    )
+    return parse_block_groups(payload, state_fips_code, county_fips)
 
 
 # -------------------- Estimates ----------------
-def get_estimate(
+def with_margins(variables: List[str]) -> List[str]:
+    """Each `_E` estimate id followed by its `_M` margin of error id."""
+    paired = []
+    for var in variables:
+        paired.append(var)
+        if var.endswith("E"):
+            paired.append(var[:-1] + "M")
+    return paired
+
+
+def estimate_url(
     acs_id: int,
     year: int,
     variables: List[str],
@@ -234,7 +438,20 @@ def get_estimate(
     place_fips: Optional[int] = None,
     county_fips: Optional[int] = None,
     api_key: str = get_census_api_key(),
-):
+    group: Optional[str] = None,
+    margins: bool = False,
+    tract: Optional[str] = None,
+    block_group: Optional[str] = None,
+) -> str:
+    """
+    With `group` set the request asks for `get=group(TABLE)`, returning every
+    estimate and margin of error of the table in one response. With
+    `margins`, each `_E` variable of an explicit list is requested together
+    with its `_M` margin of error (two of the API's 50 variables).
+
+    `tract` asks for tracts of the state (of `county_fips` when given);
+    `block_group` for block groups of a county, which the API requires.
+    """
     if state_fips is None and place_fips is None and county_fips is None:
         raise CensusAPIError(
             "One of state_fips, place_fips, or county_fips must be provided."
@@ -243,28 +460,72 @@ def get_estimate(
     county_fips = convert_single_digit_fips(fips=county_fips)
     place_fips = convert_single_digit_fips(fips=place_fips)
 
-    variables_stringified = ",".join(variables)
-    base_url = f"https://api.census.gov/data/{year}/acs/acs{acs_id}?get={variables_stringified}"
+    if margins:
+        variables = with_margins(variables)
+    variables_stringified = f"group({group})" if group else ",".join(variables)
+    base_url = f"{dataset_url(acs_id, year)}?get={variables_stringified}"
 
+    if block_group is not None:
+        if state_fips is None or county_fips in (None, WILDCARD):
+            raise CensusAPIError("Block groups need a state_fips and a county_fips.")
+        return (
+            f"{base_url}&for=block%20group:{block_group}"
+            f"&in=state:{state_fips}&in=county:{county_fips}&key={api_key}"
+        )
+    if tract is not None:
+        county = f"&in=county:{county_fips}" if county_fips is not None else ""
+        return f"{base_url}&for=tract:{tract}&in=state:{state_fips}{county}&key={api_key}"
     if place_fips is not None:
-        url = f"{base_url}&for=place:{place_fips}&in=state:{state_fips}&key={api_key}"
+        return f"{base_url}&for=place:{place_fips}&in=state:{state_fips}&key={api_key}"
+    elif county_fips is not None and state_fips is not None:
+        return (
+            f"{base_url}&for=county:{county_fips}&in=state:{state_fips}&key={api_key}"
+        )
     elif county_fips is not None:
-        url = f"{base_url}&for=county:{county_fips}&key={api_key}"
-    else:
-        url = f"{base_url}&for=state:{state_fips}&key={api_key}"
+        return f"{base_url}&for=county:{county_fips}&key={api_key}"
+    return f"{base_url}&for=state:{state_fips}&key={api_key}"
+
+
+def get_estimate(
+    acs_id: int,
+    year: int,
+    variables: List[str],
+    state_fips: Optional[int] = None,
+    place_fips: Optional[int] = None,
+    county_fips: Optional[int] = None,
+    api_key: str = get_census_api_key(),
+    group: Optional[str] = None,
+    margins: bool = False,
+    tract: Optional[str] = None,
+    block_group: Optional[str] = None,
+):
+    """
+    Returns {"estimates": [{"variable", "estimate", "margin_of_error",
+    "state_fips", "county_fips", "place_fips", "tract_code",
+    "block_group"}, ...]}, one entry per geography and variable with a
+    non-null estimate.
+    """
+    url = estimate_url(
+        acs_id,
+        year,
+        variables,
+        state_fips=state_fips,
+        place_fips=place_fips,
+        county_fips=county_fips,
+        api_key=api_key,
+        group=group,
+        margins=margins,
+        tract=tract,
+        block_group=block_group,
+    )
+    return {"estimates": _get_estimate_table(url, variables).to_records()}
+
+
+def _get_estimate_table(
+    url: str, variables: Optional[List[str]] = None
+) -> EstimateTable:
+    text = _get_text(url, "estimates")
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        rows = response.json()[1:]
-        print(f"rows={rows}")
-        estimates = [
-            [{"variable": var, "estimate": row[i]} for i, var in enumerate(variables)]
-            for row in rows
-        ]
-        return {"estimates": estimates}
-    except requests.HTTPError as e:
-        raise CensusAPIError(
-            f"Failed to fetch estimates: {e}", status_code=e.response.status_code
-        )
-    except Exception as e:
-        raise CensusAPIError(f"Failed to fetch estimates: {e}")
+        return decode_estimates(text, variables)
+    except ValueError as e:
+        raise CensusAPIError(f"Failed to decode estimates: {e}")
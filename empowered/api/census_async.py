@@ -0,0 +1,307 @@
+"""
+Asyncio counterparts of the fetchers in `empowered.api.census`.
+
+URL building and response parsing are shared with the sync module; only the
+transport differs, so results have exactly the same shape.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import wraps
+from typing import AsyncContextManager, Callable, Dict, List, Optional
+
+from empowered.api.census import (
+    ACS1_URL,
+    ACS5_URL,
+    REQUEST_FLIGHT,
+    CensusAPIError,
+    VariableCatalog,
+    all_variables_url,
+    block_groups_url,
+    CensusRateLimitError,
+    convert_single_digit_fips,
+    counties_url,
+    estimate_url,
+    groups_url,
+    parse_block_groups,
+    parse_counties,
+    parse_groups,
+    parse_places,
+    parse_states,
+    parse_tracts,
+    parse_variables,
+    parse_years_from_html,
+    places_url,
+    states_url,
+    tracts_url,
+)
+from empowered.api.cache import get_response_cache, normalize_url
+from empowered.api.decode import EstimateTable, decode_estimates
+from empowered.api.rate_limit import get_rate_limiter, key_id
+from empowered.api.transport import get_async_transport
+from empowered.utils.helpers import get_census_api_key
+from empowered.utils.logger_setup import get_logger
+
+logger = get_logger(name=__name__)
+
+# held around each Census transport call (see set_fetch_slot)
+_fetch_slot: Optional[Callable[[], AsyncContextManager]] = None
+
+
+def set_fetch_slot(slot: Optional[Callable[[], AsyncContextManager]]) -> None:
+    """
+    Hold `slot()` (e.g. AdaptiveLimiter.slot) around every Census request
+    once the rate limiter and daily quota have let it through, so what it
+    times and bounds is the network call alone. None removes it.
+    """
+    global _fetch_slot
+    _fetch_slot = slot
+
+
+def _async_lru_cache(maxsize: int) -> Callable:
+    """`functools.lru_cache` for coroutine functions (caches results)."""
+
+    def decorator(func: Callable) -> Callable:
+        cache: OrderedDict = OrderedDict()
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+            result = await func(*args, **kwargs)
+            cache[key] = result
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+# ------------------ Requests ------------------
+async def _get_text(url: str, what: str) -> str:
+    """GET a JSON body as text, coalescing identical in-flight requests."""
+    return await REQUEST_FLIGHT.do_async(normalize_url(url), _fetch_text, url, what)
+
+
+async def _fetch_text(url: str, what: str) -> str:
+    cache = get_response_cache()
+    cached = await asyncio.to_thread(cache.get, url) if cache else None
+    if cached is not None:
+        return cached
+    limiter = get_rate_limiter()
+    await limiter.acquire_async(key_id(url))
+    async with _fetch_slot() if _fetch_slot else nullcontext():
+        try:
+            response = await get_async_transport().get(url)
+        except Exception as e:
+            raise CensusAPIError(f"Failed to fetch {what}: {e}")
+        retry_after = limiter.observe(response.status, response.headers)
+        if retry_after is not None:
+            raise CensusRateLimitError(
+                f"Failed to fetch {what}: rate limited", retry_after=retry_after
+            )
+        if response.status >= 400:
+            raise CensusAPIError(
+                f"Failed to fetch {what}: {response.status} for url {url}",
+                status_code=response.status,
+            )
+    text = response.text
+    # the API reports some errors as 200 with an HTML/plain-text body
+    if not text.lstrip().startswith(("[", "{")):
+        raise CensusAPIError(f"Failed to fetch {what}: non-JSON body {text[:200]}")
+    if cache:
+        await asyncio.to_thread(cache.set, url, text)
+    return text
+
+
+async def _get_json(url: str, what: str):
+    try:
+        return json.loads(await _get_text(url, what))
+    except json.JSONDecodeError as e:
+        raise CensusAPIError(f"Failed to fetch {what}: {e}")
+
+
+# ------------------ HTML Parsing ------------------
+async def get_html(url: str) -> str:
+    cache = get_response_cache()
+    cached = await asyncio.to_thread(cache.get, url) if cache else None
+    if cached is not None:
+        return cached
+    response = await get_async_transport().get(url)
+    if response.status != 200:
+        raise CensusAPIError(
+            f"Request at {url} failed with status code={response.status}",
+            status_code=response.status,
+        )
+    if cache:
+        await asyncio.to_thread(cache.set, url, response.text)
+    return response.text
+
+
+# ------------------ Years ------------------
+async def get_years(acs_id: int) -> List[int]:
+    if acs_id == 1:
+        html = await get_html(ACS1_URL)
+    elif acs_id == 5:
+        html = await get_html(ACS5_URL)
+    else:
+        raise ValueError("acs_id must be 1 or 5")
+    return parse_years_from_html(html)
+
+
+# ------------------ Groups ------------------
+@_async_lru_cache(maxsize=32)
+async def get_groups(
+    acs_id: int,
+    year: int,
+    api_key: str = get_census_api_key(),
+) -> List[Dict]:
+    payload = await _get_json(groups_url(acs_id, year, api_key), "groups")
+    return parse_groups(payload)
+
+
+async def validate_group_id(acs_id: int, year: int, group_id: str) -> bool:
+    return group_id in await get_variable_catalog(acs_id, year)
+
+
+# ------------------ Variables ------------------
+# one catalog per dataset and year, sized like get_groups
+@_async_lru_cache(maxsize=32)
+async def get_variable_catalog(
+    acs_id: int,
+    year: int,
+    api_key: str = get_census_api_key(),
+) -> VariableCatalog:
+    payload = await _get_json(all_variables_url(acs_id, year, api_key), "variables")
+    return VariableCatalog(parse_variables(payload))
+
+
+async def get_variables(
+    acs_id: int,
+    year: int,
+    group_id: str,
+    api_key: str = get_census_api_key(),
+) -> List[Dict]:
+    catalog = await get_variable_catalog(acs_id, year, api_key)
+    return catalog.variables(group_id)
+
+
+# -------------------- Geography ----------------
+@_async_lru_cache(maxsize=128)
+async def get_states(
+    acs_id: int,
+    year: int,
+    state_name: Optional[str] = None,
+    api_key: str = get_census_api_key(),
+):
+    payload = await _get_json(states_url(acs_id, year, api_key), "states")
+    return parse_states(payload, state_name)
+
+
+@_async_lru_cache(maxsize=256)
+async def get_counties(
+    acs_id: int,
+    year: int,
+    fips_code: int,
+    county_name: Optional[str] = None,
+    api_key: str = get_census_api_key(),
+):
+    fips_code = convert_single_digit_fips(fips=fips_code)
+    payload = await _get_json(
+        counties_url(acs_id, year, fips_code, api_key), "counties"
+    )
+    return parse_counties(payload, fips_code, county_name)
+
+
+@_async_lru_cache(maxsize=128)
+async def get_places(
+    acs_id: int,
+    year: int,
+    state_fips_code: int,
+    place_name: Optional[str] = None,
+    api_key: str = get_census_api_key(),
+):
+    state_fips_code = convert_single_digit_fips(fips=state_fips_code)
+    payload = await _get_json(
+        places_url(acs_id, year, state_fips_code, api_key), "places"
+    )
+    return parse_places(payload, state_fips_code, place_name)
+
+
+@_async_lru_cache(maxsize=64)
+async def get_tracts(
+    acs_id: int,
+    year: int,
+    state_fips_code: int,
+    api_key: str = get_census_api_key(),
+):
+    state_fips_code = convert_single_digit_fips(fips=state_fips_code)
+    payload = await _get_json(
+        tracts_url(acs_id, year, state_fips_code, api_key), "tracts"
+    )
+    return parse_tracts(payload, state_fips_code)
+
+
+@_async_lru_cache(maxsize=64)
+async def get_block_groups(
+    acs_id: int,
+    year: int,
+    state_fips_code: int,
+    county_fips: str,
+    api_key: str = get_census_api_key(),
+):
+    state_fips_code = convert_single_digit_fips(fips=state_fips_code)
+    payload = await _get_json(
+        block_groups_url(acs_id, year, state_fips_code, county_fips, api_key),
+        "block groups",
+    )
+    return parse_block_groups(payload, state_fips_code, county_fips)
+
+
+# -------------------- Estimates ----------------
+async def get_estimate(
+    acs_id: int,
+    year: int,
+    variables: List[str],
+    state_fips: Optional[int] = None,
+    place_fips: Optional[int] = None,
+    county_fips: Optional[int] = None,
+    api_key: str = get_census_api_key(),
+    group: Optional[str] = None,
+    margins: bool = False,
+    tract: Optional[str] = None,
+    block_group: Optional[str] = None,
+):
+    url = estimate_url(
+        acs_id,
+        year,
+        variables,
+        state_fips=state_fips,
+        place_fips=place_fips,
+        county_fips=county_fips,
+        api_key=api_key,
+        group=group,
+        margins=margins,
+        tract=tract,
+        block_group=block_group,
+    )
+    table = await _get_estimate_table(url, variables)
+    return {"estimates": await asyncio.to_thread(table.to_records)}
+
+
+async def _get_estimate_table(
+    url: str, variables: Optional[List[str]] = None
+) -> EstimateTable:
+    text = await _get_text(url, "estimates")
+    try:
+        # large wildcard/group() responses are decoded off the event loop
+        return await asyncio.to_thread(decode_estimates, text, variables)
+    except ValueError as e:
+        raise CensusAPIError(f"Failed to decode estimates: {e}")
@@ -0,0 +1,166 @@
+"""
+Columnar decoding of Census estimate responses.
+
+The API returns a JSON array of rows, header first. Rows are scanned one at a
+time off the response text into per-column buffers, and numeric conversion and
+sentinel handling run once per column (vectorized) instead of once per cell.
+"""
+
+import json
+import re
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Estimate columns look like B17001_002E; margins of error like B17001_002M
+ESTIMATE_COLUMN = re.compile(r"^[A-Z0-9]+_\d+E$")
+GEOGRAPHY_COLUMNS = {
+    "state": "state_fips",
+    "county": "county_fips",
+    "place": "place_fips",
+    "tract": "tract_code",
+    "block group": "block_group",
+}
+# Census annotation values reported in place of a number (e.g. -666666666:
+# "estimate could not be computed"); all decode to null.
+SENTINELS = (
+    -999999999,
+    -888888888,
+    -666666666,
+    -555555555,
+    -333333333,
+    -222222222,
+)
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[\s,]*")
+
+
+def iter_rows(text: str) -> Iterator[List]:
+    """Yield the rows of a JSON array-of-arrays one at a time."""
+    pos = _whitespace.match(text, 0).end()
+    if text[pos : pos + 1] != "[":
+        raise ValueError("Census response is not a JSON array")
+    pos += 1
+    end = len(text)
+    while True:
+        pos = _whitespace.match(text, pos).end()
+        if pos >= end or text[pos] == "]":
+            return
+        row, pos = _decoder.raw_decode(text, pos)
+        yield row
+
+
+def to_numeric(values: List) -> np.ndarray:
+    """Convert a column to float64 in one pass; blanks and sentinels become NaN."""
+    column = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+    array = column.to_numpy(dtype="float64", na_value=np.nan)
+    return np.where(np.isin(array, SENTINELS), np.nan, array)
+
+
+class EstimateTable:
+    """
+    Typed columns of one estimate response.
+
+    estimates / margins: {variable_id: float64 array}, NaN where null
+    geography: {"state_fips" | "county_fips" | "place_fips" | "tract_code" |
+                "block_group": [fips, ...]}
+    """
+
+    def __init__(
+        self,
+        variables: List[str],
+        estimates: Dict[str, np.ndarray],
+        margins: Dict[str, np.ndarray],
+        geography: Dict[str, List[Optional[str]]],
+        n_rows: int,
+    ) -> None:
+        self.variables = variables
+        self.estimates = estimates
+        self.margins = margins
+        self.geography = geography
+        self.n_rows = n_rows
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def to_records(self) -> List[Dict]:
+        """
+        Long-format rows ready for `insert_estimates`:
+        {"variable", "estimate", "margin_of_error", "state_fips",
+         "county_fips", "place_fips", "tract_code", "block_group"}. Cells with
+        a null estimate are skipped.
+        """
+        keys = list(GEOGRAPHY_COLUMNS.values())
+        geo = [self.geography.get(key, [None] * self.n_rows) for key in keys]
+        # one dict per geography row, shared by its variables' records
+        geo_rows = [dict(zip(keys, row)) for row in zip(*geo)]
+        records = []
+        for var in self.variables:
+            estimates = self.estimates[var]
+            margins = self.margins.get(var)
+            for i in np.flatnonzero(~np.isnan(estimates)).tolist():
+                margin = None
+                if margins is not None and not np.isnan(margins[i]):
+                    margin = float(margins[i])
+                records.append(
+                    {
+                        "variable": var,
+                        "estimate": float(estimates[i]),
+                        "margin_of_error": margin,
+                        **geo_rows[i],
+                    }
+                )
+        return records
+
+
+def decode_estimates(
+    text: str, variables: Optional[List[str]] = None
+) -> EstimateTable:
+    """
+    Decode an estimate response. Columns are located through the header row,
+    so explicit variable lists and group() responses decode the same way.
+    Without `variables`, every estimate column of the response is kept. Each
+    estimate is paired with its margin of error when the response carries the
+    matching `M` column. FIPS columns are kept so wildcard responses (one row
+    per place/county/tract/block group) can be split back out by geography.
+    """
+    rows = iter_rows(text)
+    try:
+        header = next(rows)
+    except StopIteration:
+        raise ValueError("Census response has no header row")
+    index = {name: i for i, name in enumerate(header)}
+    if not variables:
+        variables = [name for name in header if ESTIMATE_COLUMN.match(name)]
+    variables = [var for var in variables if var in index]
+    margin_of = {var: index.get(var[:-1] + "M") for var in variables}
+    geo_index = {
+        key: index[name] for name, key in GEOGRAPHY_COLUMNS.items() if name in index
+    }
+
+    wanted = sorted(
+        {index[var] for var in variables}
+        | {i for i in margin_of.values() if i is not None}
+        | set(geo_index.values())
+    )
+    columns: Dict[int, List] = {i: [] for i in wanted}
+    appenders = [(i, columns[i].append) for i in wanted]
+    n_rows = 0
+    for row in rows:
+        for i, append in appenders:
+            append(row[i])
+        n_rows += 1
+
+    return EstimateTable(
+        variables=variables,
+        estimates={var: to_numeric(columns[index[var]]) for var in variables},
+        margins={
+            var: to_numeric(columns[i])
+            for var, i in margin_of.items()
+            if i is not None
+        },
+        geography={key: columns[i] for key, i in geo_index.items()},
+        n_rows=n_rows,
+    )
@@ -0,0 +1,319 @@
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from empowered.api.cache import DEFAULT_CACHE_DIR
+from empowered.utils.logger_setup import get_logger
+
+logger = get_logger(name=__name__)
+
+DEFAULT_REQUESTS_PER_SECOND = 20.0
+DEFAULT_BURST = 20
+# etl.md: 500 requests per day; 0 disables the daily budget
+DEFAULT_DAILY_LIMIT = 500
+DEFAULT_RETRY_AFTER = 60.0
+# requests a process takes from the shared daily budget at a time
+DEFAULT_BLOCK_SIZE = 20
+
+
+def _utc_today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def seconds_until_next_window() -> float:
+    """Seconds until the daily quota window resets (UTC midnight)."""
+    now = datetime.now(timezone.utc)
+    tomorrow = (now + timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return (tomorrow - now).total_seconds()
+
+
+def key_id(url: str) -> str:
+    """Ledger id for the API key in `url` (hashed, never stored in clear)."""
+    key = parse_qs(urlsplit(url).query).get("key", [""])[0]
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12] if key else "anonymous"
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    value = next((v for k, v in headers.items() if k.lower() == "retry-after"), None)
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except Exception:
+        return None
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on `path` (created if missing) across processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class QuotaLedger:
+    """
+    Persistent count of requests sent per API key per UTC day, shared by
+    every process that uses the same file.
+
+    Stored as a small JSON file ({"2024-05-01": {"<key id>": 123}}) so the
+    budget survives restarts. Processes take the budget from the file in
+    blocks of up to `block_size` requests, under an exclusive lock that
+    re-reads what the others took, and spend each block in memory; so the
+    file is touched once per block, and concurrent processes can never
+    spend more than the daily limit between them. `flush` (also run at
+    exit) hands the unspent rest of a block back; a process that dies
+    without it leaves that rest counted as used.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        daily_limit: int = DEFAULT_DAILY_LIMIT,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        self.path = Path(path)
+        self.daily_limit = daily_limit
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._day = _utc_today()
+        self._reserved: Dict[str, int] = {}  # taken from the file, not yet spent
+        atexit.register(self.flush)
+
+    def used(self, key: str) -> int:
+        return self.used_today().get(key, 0)
+
+    def used_today(self) -> Dict[str, int]:
+        with self._lock:
+            self._roll()
+            with _file_lock(self._lock_path):
+                counts = self._read()
+            return {
+                key: max(count - self._reserved.get(key, 0), 0)
+                for key, count in counts.items()
+            }
+
+    def try_consume(self, key: str) -> bool:
+        """Record one request for `key`; False if today's budget is spent."""
+        with self._lock:
+            self._roll()
+            if not self._reserved.get(key):
+                self._reserve(key)
+            if not self._reserved.get(key):
+                return False
+            self._reserved[key] -= 1
+            return True
+
+    def flush(self) -> None:
+        """Give the unspent rest of this process's blocks back to the file."""
+        with self._lock:
+            self._roll()
+            self._release()
+
+    @property
+    def _lock_path(self) -> Path:
+        return self.path.with_suffix(".lock")
+
+    def _roll(self) -> None:
+        # a new UTC day: the old day's blocks are void, so drop them rather
+        # than write them back over what other processes took since midnight
+        today = _utc_today()
+        if today != self._day:
+            self._reserved = {}
+            self._day = today
+
+    def _read(self) -> Dict[str, int]:
+        return dict(self._read_days().get(self._day, {}))
+
+    def _read_days(self) -> Dict[str, Dict[str, int]]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable quota ledger {self.path}: {e}")
+            return {}
+
+    def _write(self, counts: Dict[str, int]) -> None:
+        # keep only the current window on disk
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({self._day: counts}))
+        os.replace(tmp, self.path)
+
+    def _reserve(self, key: str) -> None:
+        with _file_lock(self._lock_path):
+            counts = self._read()
+            used = counts.get(key, 0)
+            block = self.block_size
+            if self.daily_limit:
+                block = max(min(block, self.daily_limit - used), 0)
+            if block:
+                counts[key] = used + block
+                self._write(counts)
+        self._reserved[key] = block
+
+    def _release(self) -> None:
+        unspent = {key: n for key, n in self._reserved.items() if n}
+        self._reserved = {}
+        if not unspent:
+            return
+        with _file_lock(self._lock_path):
+            days = self._read_days()
+            if self._day not in days:
+                # the file has moved on to another day; nothing of ours is left
+                return
+            counts = dict(days[self._day])
+            for key, count in unspent.items():
+                counts[key] = max(counts.get(key, 0) - count, 0)
+            self._write(counts)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every Census call, backed by a daily `QuotaLedger`.
+
+    Send slots are handed out at `rate` per second (bursts up to
+    `burst`). When the API answers 429 the whole bucket pauses for the
+    advertised Retry-After. When the daily budget is spent, callers wait for
+    the next UTC window instead of failing, so a long ingest pauses and
+    resumes on its own.
+    """
+
+    def __init__(
+        self,
+        ledger: QuotaLedger,
+        rate: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: int = DEFAULT_BURST,
+    ) -> None:
+        self.ledger = ledger
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait before sending."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            delay = max(-self._tokens / self.rate, 0.0)
+            return max(delay, self._paused_until - now)
+
+    def _quota_delay(self, key: str) -> float:
+        if self.ledger.try_consume(key):
+            return 0.0
+        wait = seconds_until_next_window()
+        logger.warning(
+            f"Daily Census request budget ({self.ledger.daily_limit}) spent for key "
+            f"{key}; pausing {wait / 3600:.1f}h until the next window"
+        )
+        return wait
+
+    def acquire(self, key: str) -> None:
+        while True:
+            delay = self._quota_delay(key)
+            if delay == 0.0:
+                break
+            time.sleep(delay)
+        time.sleep(self._reserve())
+
+    async def acquire_async(self, key: str) -> None:
+        while True:
+            # a new block takes a file lock and file I/O; keep it off the loop
+            delay = await asyncio.to_thread(self._quota_delay, key)
+            if delay == 0.0:
+                break
+            await asyncio.sleep(delay)
+        await asyncio.sleep(self._reserve())
+
+    def observe(self, status: int, headers: Mapping[str, str]) -> Optional[float]:
+        """Feed a response back; on 429 pause everyone and return the pause length."""
+        if status != 429:
+            return None
+        retry_after = parse_retry_after(headers) or DEFAULT_RETRY_AFTER
+        with self._lock:
+            self._paused_until = max(
+                self._paused_until, time.monotonic() + retry_after
+            )
+        logger.warning(f"Census API throttled (429); pausing {retry_after:.0f}s")
+        return retry_after
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Shared limiter configured from the environment:
+    CENSUS_REQUESTS_PER_SECOND, CENSUS_BURST, CENSUS_DAILY_REQUEST_LIMIT and
+    CENSUS_QUOTA_LEDGER (path of the ledger file).
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                load_dotenv()
+                ledger_path = os.getenv(
+                    "CENSUS_QUOTA_LEDGER", DEFAULT_CACHE_DIR / "quota_ledger.json"
+                )
+                ledger = QuotaLedger(
+                    Path(ledger_path),
+                    daily_limit=int(
+                        os.getenv("CENSUS_DAILY_REQUEST_LIMIT", DEFAULT_DAILY_LIMIT)
+                    ),
+                )
+                _limiter = RateLimiter(
+                    ledger,
+                    rate=float(
+                        os.getenv(
+                            "CENSUS_REQUESTS_PER_SECOND", DEFAULT_REQUESTS_PER_SECOND
+                        )
+                    ),
+                    burst=int(os.getenv("CENSUS_BURST", DEFAULT_BURST)),
+                )
+    return _limiter
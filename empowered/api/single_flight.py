@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key onto one in-flight execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    running wait for and share its result (or exception). Nothing is cached
+    once the call finishes. `do` serves threads, `do_async` coroutines on an
+    event loop; both feed the same counters.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._counters = {"executed": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counters["executed"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is None:
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                self._tasks[key] = task
+                task.add_done_callback(lambda _: self._forget(key, task))
+                self._counters["executed"] += 1
+            else:
+                self._counters["coalesced"] += 1
+        # shield: one waiter being cancelled must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
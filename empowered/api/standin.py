@@ -0,0 +1,502 @@
+"""
+Local stand-in for the Census API, for offline runs and benchmarks.
+
+Serves the endpoints `empowered.api.census` uses under
+/data/{year}/acs/acs{n}: groups.json, groups/{group}.json, variables.json and
+the ?get=...&for=...&in=... data endpoint (wildcards and group() included).
+Three backends:
+
+    synthetic  deterministic national-scale data, no network or key needed
+    record     proxy to the real API and save every response as a fixture
+    replay     serve previously recorded fixtures
+
+Latency and error injection (500s and 429s with Retry-After) apply to every
+backend. Point the client at it with CENSUS_API_BASE_URL, e.g.
+
+    python -m empowered.api.standin synthetic --port 8089 --latency-ms 80
+    CENSUS_API_BASE_URL=http://127.0.0.1:8089 CENSUS_DAILY_REQUEST_LIMIT=0 \\
+        python -m empowered.ingest.ingest_census
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from empowered.api.cache import normalize_url
+from empowered.utils.logger_setup import get_logger, set_logger
+
+logger = get_logger(name=__name__)
+
+DATASET_PATH = re.compile(r"^/data/(\d{4})/acs/acs(\d)(?:/(.*))?$")
+
+# State FIPS as used by the ACS (50 states, DC and Puerto Rico)
+STATE_FIPS = [
+    "01", "02", "04", "05", "06", "08", "09", "10", "11", "12", "13", "15",
+    "16", "17", "18", "19", "20", "21", "22", "23", "24", "25", "26", "27",
+    "28", "29", "30", "31", "32", "33", "34", "35", "36", "37", "38", "39",
+    "40", "41", "42", "44", "45", "46", "47", "48", "49", "50", "51", "53",
+    "54", "55", "56", "72",
+]  # fmt: skip
+
+# FIPS columns the API returns for each level, outermost first
+GEOGRAPHY_COLUMNS = {
+    "state": ["state"],
+    "county": ["state", "county"],
+    "place": ["state", "place"],
+    "tract": ["state", "county", "tract"],
+    "block group": ["state", "county", "tract", "block group"],
+}
+
+# group -> number of estimate variables (the tables ingest_census selects)
+DEFAULT_GROUPS = {
+    "B01003": 1,
+    "B09010": 13,
+    "B14006": 21,
+    "B14007": 19,
+    "B15003": 25,
+    "B17001": 59,
+    "B19001": 17,
+    "B19013": 1,
+    "B19301": 1,
+    "B25001": 1,
+    "B25002": 3,
+    "B25010": 3,
+    "B25064": 1,
+    "B25070": 11,
+    "B25077": 1,
+}
+
+
+class StandinError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def parse_geography(query: Dict[str, List[str]]) -> Tuple[str, str, Dict[str, str]]:
+    """`for=place:*&in=state:01` -> ("place", "*", {"state": "01"})"""
+    if "for" not in query:
+        raise StandinError(400, "error: missing 'for' clause")
+    level, _, code = query["for"][0].partition(":")
+    parents: Dict[str, str] = {}
+    for clause in query.get("in", []):
+        for part in clause.split(" "):
+            name, _, value = part.partition(":")
+            if name:
+                parents[name] = value
+    return level, code or "*", parents
+
+
+class SyntheticCensus:
+    """
+    Deterministic fake ACS dataset at national scale.
+
+    Every vintage has the same geography: STATE_FIPS states, with
+    `counties_per_state` counties and `places_per_state` places each,
+    `tracts_per_county` tracts per county and `block_groups_per_tract`
+    block groups per tract (defaults give ~3,100 counties, ~19,500 places,
+    ~84,000 tracts and ~250,000 block groups, close to the real ACS-5).
+    As in the API, block groups are only served within one county. Values
+    are a hash of (seed, geography, variable), so repeated requests agree;
+    roughly 1% of cells carry the -666666666 sentinel.
+    """
+
+    def __init__(
+        self,
+        groups: Optional[Dict[str, int]] = None,
+        counties_per_state: int = 60,
+        places_per_state: int = 375,
+        extra_groups: int = 0,
+        seed: int = 0,
+        tracts_per_county: int = 27,
+        block_groups_per_tract: int = 3,
+    ) -> None:
+        self.groups = dict(groups or DEFAULT_GROUPS)
+        for i in range(extra_groups):
+            self.groups[f"B9{i:04d}"] = 10
+        self.counties_per_state = counties_per_state
+        self.places_per_state = places_per_state
+        self.tracts_per_county = tracts_per_county
+        self.block_groups_per_tract = block_groups_per_tract
+        self.seed = seed
+
+    # ---- metadata ----
+    def groups_json(self) -> Dict:
+        return {
+            "groups": [
+                {"name": gid, "description": f"Synthetic table {gid}"}
+                for gid in self.groups
+            ]
+        }
+
+    def group_variables(self, group_id: str) -> Dict[str, Dict]:
+        if group_id not in self.groups:
+            raise StandinError(404, f"unknown group {group_id}")
+        variables = {}
+        for n in range(1, self.groups[group_id] + 1):
+            base = f"{group_id}_{n:03d}"
+            label = f"Estimate!!Synthetic {group_id} line {n}"
+            variables[f"{base}E"] = {"label": label, "group": group_id}
+            variables[f"{base}M"] = {"label": f"Margin of Error {n}", "group": group_id}
+            variables[f"{base}EA"] = {"label": "Annotation", "group": group_id}
+            variables[f"{base}MA"] = {"label": "Annotation", "group": group_id}
+        return variables
+
+    def variables_json(self) -> Dict:
+        variables = {"NAME": {"label": "Geographic Area Name", "group": "N/A"}}
+        for gid in self.groups:
+            variables.update(self.group_variables(gid))
+        return {"variables": variables}
+
+    # ---- geography ----
+    def counties(self, parents: Dict[str, str]) -> List[str]:
+        return [
+            c
+            for c in (f"{i * 2 + 1:03d}" for i in range(self.counties_per_state))
+            if parents.get("county", "*") in ("*", c)
+        ]
+
+    def tracts(self, parents: Dict[str, str]) -> List[str]:
+        return [
+            t
+            for t in (f"{(i + 1) * 100:06d}" for i in range(self.tracts_per_county))
+            if parents.get("tract", "*") in ("*", t)
+        ]
+
+    def geographies(self, level: str, code: str, parents: Dict[str, str]) -> List[Dict]:
+        states = [s for s in STATE_FIPS if parents.get("state", "*") in ("*", s)]
+        if level == "state":
+            return [
+                {"NAME": f"State {s}", "state": s}
+                for s in states
+                if code in ("*", s)
+            ]
+        if level == "county":
+            return [
+                {"NAME": f"County {c} (State {s})", "state": s, "county": c}
+                for s in states
+                for c in self.counties(parents)
+                if code in ("*", c)
+            ]
+        if level == "tract":
+            return [
+                {
+                    "NAME": f"Census Tract {t}, County {c}, State {s}",
+                    "state": s,
+                    "county": c,
+                    "tract": t,
+                }
+                for s in states
+                for c in self.counties(parents)
+                for t in self.tracts(parents)
+                if code in ("*", t)
+            ]
+        if level == "block group":
+            if parents.get("state", "*") == "*" or parents.get("county", "*") == "*":
+                raise StandinError(
+                    400, "error: block group requires a state and a county"
+                )
+            return [
+                {
+                    "NAME": f"Block Group {b}, Census Tract {t}, County {c}, State {s}",
+                    "state": s,
+                    "county": c,
+                    "tract": t,
+                    "block group": b,
+                }
+                for s in states
+                for c in self.counties(parents)
+                for t in self.tracts(parents)
+                for b in (str(i + 1) for i in range(self.block_groups_per_tract))
+                if code in ("*", b)
+            ]
+        if level == "place":
+            return [
+                {"NAME": f"Place {p}, State {s}", "state": s, "place": p}
+                for s in states
+                for p in (f"{(i + 1) * 10:05d}" for i in range(self.places_per_state))
+                if code in ("*", p)
+            ]
+        raise StandinError(400, f"error: unknown/unsupported geography '{level}'")
+
+    def value(self, geo_key: str, variable: str) -> Optional[int]:
+        h = zlib.crc32(f"{self.seed}|{geo_key}|{variable}".encode())
+        if variable.endswith("A"):
+            return None
+        if h % 100 == 0:
+            return -666666666
+        return h % 100000 if variable.endswith("E") else h % 1000
+
+    def data(self, query: Dict[str, List[str]]) -> List[List]:
+        columns: List[str] = []
+        explicit = 0
+        for item in query.get("get", [""])[0].split(","):
+            match = re.fullmatch(r"group\((\w+)\)", item)
+            if match:
+                columns.append("GEO_ID")
+                columns.append("NAME")
+                columns.extend(self.group_variables(match.group(1)))
+            elif item:
+                columns.append(item)
+                explicit += 1
+        if not columns:
+            raise StandinError(400, "error: missing 'get' clause")
+        if explicit > 50:
+            raise StandinError(400, "error: cannot exceed 50 variables per request")
+
+        level, code, parents = parse_geography(query)
+        geo_columns = GEOGRAPHY_COLUMNS.get(level, [*parents.keys(), level])
+        rows: List[List] = [columns + geo_columns]
+        for geo in self.geographies(level, code, parents):
+            geo_key = "|".join(geo[c] for c in geo_columns if c in geo)
+            row = []
+            for c in columns:
+                if c == "NAME":
+                    row.append(geo["NAME"])
+                elif c == "GEO_ID":
+                    row.append(f"{level}:{geo_key}")
+                else:
+                    v = self.value(geo_key, c)
+                    row.append(None if v is None else str(v))
+            row.extend(geo.get(c) for c in geo_columns)
+            rows.append(row)
+        if len(rows) == 1:
+            raise StandinError(204, "")
+        return rows
+
+    def respond(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, str]:
+        match = DATASET_PATH.match(path)
+        if not match:
+            raise StandinError(404, "unknown path")
+        rest = match.group(3) or ""
+        if rest in ("groups", "groups.json"):
+            body = self.groups_json()
+        elif rest.startswith("groups/") and rest.endswith(".json"):
+            body = {"variables": self.group_variables(rest[len("groups/") : -5])}
+        elif rest == "variables.json":
+            body = self.variables_json()
+        elif rest == "":
+            body = self.data(query)
+        else:
+            raise StandinError(404, "unknown path")
+        return 200, json.dumps(body)
+
+
+class FixtureStore:
+    """Recorded responses on disk, one JSON file per normalized request path."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, path_and_query: str) -> Path:
+        key = normalize_url(path_and_query)
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def load(self, path_and_query: str) -> Optional[Tuple[int, str]]:
+        fixture = self._path(path_and_query)
+        if not fixture.exists():
+            return None
+        record = json.loads(fixture.read_text())
+        return record["status"], record["body"]
+
+    def save(self, path_and_query: str, status: int, body: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record = {
+            "request": normalize_url(path_and_query),
+            "status": status,
+            "body": body,
+        }
+        self._path(path_and_query).write_text(json.dumps(record))
+
+
+class ReplayBackend:
+    def __init__(self, store: FixtureStore) -> None:
+        self.store = store
+
+    def respond(self, path_and_query: str) -> Tuple[int, str]:
+        found = self.store.load(path_and_query)
+        if found is None:
+            raise StandinError(404, f"no fixture recorded for {path_and_query}")
+        return found
+
+
+class RecordBackend:
+    def __init__(self, store: FixtureStore, upstream: str, api_key: Optional[str]):
+        self.store = store
+        self.upstream = upstream.rstrip("/")
+        self.api_key = api_key
+        self.session = requests.Session()
+
+    def respond(self, path_and_query: str) -> Tuple[int, str]:
+        url = f"{self.upstream}{path_and_query}"
+        if self.api_key and "key=" not in path_and_query:
+            url += ("&" if "?" in url else "?") + f"key={self.api_key}"
+        response = self.session.get(url, timeout=(5, 120))
+        if response.status_code == 200:
+            self.store.save(path_and_query, response.status_code, response.text)
+        return response.status_code, response.text
+
+
+class StandinServer:
+    """
+    Threaded HTTP server wrapping a backend with latency and error injection.
+
+    latency_ms / jitter_ms: per-request delay (uniform jitter around latency)
+    error_rate: fraction of requests answered with 500
+    throttle_rate: fraction answered with 429 and Retry-After: retry_after
+    """
+
+    def __init__(
+        self,
+        backend,
+        host: str = "127.0.0.1",
+        port: int = 8089,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.backend = backend
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def do_GET(self):
+                status, body, headers = server.handle(self.path)
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json;charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def handle(self, path_and_query: str) -> Tuple[int, str, Dict[str, str]]:
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency_ms + self.random.uniform(
+                -self.jitter_ms, self.jitter_ms
+            )
+            roll = self.random.random()
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if roll < self.throttle_rate:
+            return 429, "Too Many Requests", {"Retry-After": str(self.retry_after)}
+        if roll < self.throttle_rate + self.error_rate:
+            return 500, "Internal Server Error", {}
+
+        try:
+            if isinstance(self.backend, SyntheticCensus):
+                parts = urlsplit(path_and_query)
+                query: Dict[str, List[str]] = {}
+                for k, v in parse_qsl(parts.query, keep_blank_values=True):
+                    query.setdefault(k, []).append(v)
+                status, body = self.backend.respond(parts.path, query)
+            else:
+                status, body = self.backend.respond(path_and_query)
+        except StandinError as e:
+            return e.status, str(e), {}
+        return status, body, {}
+
+    def serve_forever(self) -> None:
+        logger.info(f"Census stand-in listening on {self.base_url}")
+        self._httpd.serve_forever()
+
+    def start(self) -> "StandinServer":
+        """Serve from a daemon thread (for in-process benchmarks)."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("mode", choices=["synthetic", "record", "replay"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--fixtures", type=Path, default=Path("census_fixtures"))
+    parser.add_argument("--upstream", default="https://api.census.gov")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--places-per-state", type=int, default=375)
+    parser.add_argument("--counties-per-state", type=int, default=60)
+    parser.add_argument("--tracts-per-county", type=int, default=27)
+    parser.add_argument("--block-groups-per-tract", type=int, default=3)
+    parser.add_argument("--extra-groups", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.mode == "synthetic":
+        backend = SyntheticCensus(
+            counties_per_state=args.counties_per_state,
+            places_per_state=args.places_per_state,
+            extra_groups=args.extra_groups,
+            seed=args.seed,
+            tracts_per_county=args.tracts_per_county,
+            block_groups_per_tract=args.block_groups_per_tract,
+        )
+    elif args.mode == "record":
+        backend = RecordBackend(
+            FixtureStore(args.fixtures), args.upstream, args.api_key
+        )
+    else:
+        backend = ReplayBackend(FixtureStore(args.fixtures))
+
+    set_logger()
+    StandinServer(
+        backend,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from empowered.utils.logger_setup import get_logger
+
+logger = get_logger(name=__name__)
+
+DEFAULT_POOL_SIZE = 10
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT: Tuple[float, float] = (5.0, 60.0)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class HTTPTransport:
+    """
+    Shared keep-alive HTTP transport.
+
+    Wraps a single `requests.Session` whose adapter keeps up to `pool_size`
+    open connections per host, so repeated Census calls reuse TCP+TLS
+    connections instead of opening a new one per request. The underlying
+    urllib3 pools are thread-safe, so one instance can serve every worker
+    thread of an executor.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._requests = 0
+
+        self._adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=pool_size,
+            pool_block=False,
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+
+    def get(self, url: str, timeout: Optional[Timeout] = None) -> requests.Response:
+        with self._lock:
+            self._requests += 1
+        return self._session.get(url, timeout=timeout or self.timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Connection reuse counters:
+        {"requests": n, "connections_opened": n, "connections_reused": n}
+        """
+        pools = self._adapter.poolmanager.pools
+        opened = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+        with self._lock:
+            sent = self._requests
+        return {
+            "requests": sent,
+            "connections_opened": opened,
+            "connections_reused": max(sent - opened, 0),
+        }
+
+    def close(self) -> None:
+        self._session.close()
+
+
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HTTPTransport()
+    return _transport
+
+
+# ------------------ Async ------------------
+class AsyncResponse(NamedTuple):
+    url: str
+    status: int
+    headers: Dict[str, str]
+    text: str
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class AsyncHTTPTransport:
+    """
+    Keep-alive aiohttp counterpart of `HTTPTransport`.
+
+    Up to `pool_size` requests are in flight at once over reused connections,
+    all on the running event loop, so concurrency is not tied to a thread
+    count. Must be created (and closed) on the loop that uses it.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.loop = asyncio.get_running_loop()
+        self._counters = {
+            "requests": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+        }
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self._on_connection_created)
+        trace.on_connection_reuseconn.append(self._on_connection_reused)
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size, limit_per_host=pool_size),
+            timeout=_client_timeout(timeout),
+            trace_configs=[trace],
+        )
+
+    async def _on_connection_created(self, session, ctx, params) -> None:
+        self._counters["connections_opened"] += 1
+
+    async def _on_connection_reused(self, session, ctx, params) -> None:
+        self._counters["connections_reused"] += 1
+
+    async def get(self, url: str, timeout: Optional[Timeout] = None) -> AsyncResponse:
+        self._counters["requests"] += 1
+        kwargs = {"timeout": _client_timeout(timeout)} if timeout else {}
+        async with self._session.get(url, **kwargs) as response:
+            text = await response.text()
+            return AsyncResponse(
+                url=url,
+                status=response.status,
+                headers=dict(response.headers),
+                text=text,
+            )
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._counters)
+
+    async def close(self) -> None:
+        await self._session.close()
+
+
+def _client_timeout(timeout: Timeout) -> aiohttp.ClientTimeout:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+_async_transport: Optional[AsyncHTTPTransport] = None
+_async_settings: Dict[str, Any] = {
+    "pool_size": DEFAULT_POOL_SIZE,
+    "timeout": DEFAULT_TIMEOUT,
+}
+
+
+def configure_async_transport(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    timeout: Timeout = DEFAULT_TIMEOUT,
+) -> None:
+    """Set the pool size and timeouts used when the async transport is created."""
+    _async_settings["pool_size"] = pool_size
+    _async_settings["timeout"] = timeout
+
+
+def get_async_transport() -> AsyncHTTPTransport:
+    """Return the async transport for the running loop, creating it on first use."""
+    global _async_transport
+    loop = asyncio.get_running_loop()
+    if _async_transport is None or _async_transport.loop is not loop:
+        _async_transport = AsyncHTTPTransport(**_async_settings)
+        logger.info(
+            f"Async HTTP transport created (pool_size={_async_settings['pool_size']})"
+        )
+    return _async_transport
+
+
+async def close_async_transport() -> None:
+    global _async_transport
+    if _async_transport is not None:
+        await _async_transport.close()
+        _async_transport = None
@@ -0,0 +1,203 @@
+import asyncio
+import functools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Deque, Dict, Optional
+
+from empowered.utils.logger_setup import get_logger
+
+logger = get_logger(name=__name__)
+
+
+def _is_timeout(error: BaseException) -> bool:
+    while error is not None:
+        if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class AdaptiveLimiter:
+    """
+    In-flight limit tuned by AIMD (additive increase, multiplicative
+    decrease), for one pipeline stage such as Census fetches or DB writes.
+
+    Every `window` finished calls are judged together: if their error rate
+    stays under `max_error_rate` and their p95 latency under `tolerance`
+    times the stage's smoothed baseline p95, the limit grows by `step`. A
+    congestion error (`congestion(error)`, by default a timeout) or an
+    unhealthy window cuts it by `backoff` at once; cuts are at most one per
+    `cooldown` seconds, so a burst of 429s from one overload counts once.
+    Latencies under `latency_floor` seconds never count as slow (cache hits
+    would otherwise set an unreachable baseline). The limit stays within
+    [minimum, maximum] and every change is logged with its reason.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        minimum: int = 1,
+        maximum: Optional[int] = None,
+        step: float = 1.0,
+        backoff: float = 0.5,
+        window: int = 50,
+        max_error_rate: float = 0.05,
+        tolerance: float = 2.0,
+        latency_floor: float = 0.5,
+        cooldown: float = 5.0,
+        congestion: Callable[[BaseException], bool] = _is_timeout,
+    ) -> None:
+        if minimum < 1:
+            raise ValueError("minimum must be at least 1")
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum or initial
+        self.limit = float(min(max(initial, minimum), self.maximum))
+        self.step = step
+        self.backoff = backoff
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.tolerance = tolerance
+        self.latency_floor = latency_floor
+        self.cooldown = cooldown
+        self.congestion = congestion
+        self.in_flight = 0
+        self.baseline_p95: Optional[float] = None
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._samples = 0
+        self._errors = 0
+        self._last_cut = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._counters = {"increases": 0, "decreases": 0, "congestion": 0}
+
+    # ---- admission ----
+    async def acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # granted just as we were cancelled: hand the slot back
+                self.release()
+            else:
+                self._waiters.remove(future)
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            future = self._waiters.popleft()
+            if future.cancelled():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one slot; the block's latency and outcome feed the controller."""
+        await self.acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.observe(time.perf_counter() - start, e)
+            raise
+        else:
+            self.observe(time.perf_counter() - start)
+        finally:
+            self.release()
+
+    def wrap(self, func: Callable) -> Callable:
+        """Coroutine function running `func` inside a slot."""
+
+        @functools.wraps(func)
+        async def limited(*args, **kwargs):
+            async with self.slot():
+                return await func(*args, **kwargs)
+
+        return limited
+
+    # ---- control ----
+    def observe(self, latency: float, error: Optional[BaseException] = None) -> None:
+        if error is not None and self.congestion(error):
+            self._counters["congestion"] += 1
+            self._decrease(f"congestion: {type(error).__name__}")
+        self._samples += 1
+        if error is not None:
+            self._errors += 1
+        else:
+            self._latencies.append(latency)
+        if self._samples >= self.window:
+            self._judge_window()
+
+    def _judge_window(self) -> None:
+        error_rate = self._errors / self._samples
+        p95 = None
+        if self._latencies:
+            ordered = sorted(self._latencies)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        self._samples = 0
+        self._errors = 0
+        self._latencies.clear()
+
+        slow = (
+            p95 is not None
+            and self.baseline_p95 is not None
+            and p95 > max(self.baseline_p95 * self.tolerance, self.latency_floor)
+        )
+        if error_rate > self.max_error_rate:
+            self._decrease(f"error rate {error_rate:.1%}")
+        elif slow:
+            self._decrease(f"p95 {p95:.2f}s vs baseline {self.baseline_p95:.2f}s")
+        else:
+            if p95 is not None:
+                self.baseline_p95 = (
+                    p95
+                    if self.baseline_p95 is None
+                    else 0.8 * self.baseline_p95 + 0.2 * p95
+                )
+            self._increase(p95)
+
+    def _increase(self, p95: Optional[float]) -> None:
+        if self.limit >= self.maximum:
+            return
+        old = self.limit
+        self.limit = min(self.maximum, self.limit + self.step)
+        self._counters["increases"] += 1
+        if int(self.limit) != int(old):
+            logger.info(
+                f"[AIMD {self.name}] limit {int(old)} -> {int(self.limit)} (healthy window, p95={p95 or 0:.2f}s)"
+            )
+        self._wake()
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if self.limit <= self.minimum or now - self._last_cut < self.cooldown:
+            return
+        self._last_cut = now
+        old = self.limit
+        self.limit = max(float(self.minimum), self.limit * self.backoff)
+        self._counters["decreases"] += 1
+        logger.warning(
+            f"[AIMD {self.name}] limit {int(old)} -> {int(self.limit)} ({reason})"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "baseline_p95": (
+                None if self.baseline_p95 is None else round(self.baseline_p95, 3)
+            ),
+        }
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from empowered.ingest.budget import FairShareLimiter
+from empowered.utils.logger_setup import get_logger
+
+logger = get_logger(name=__name__)
+
+_DONE = object()
+
+
+class BatchWriter:
+    """
+    Write stage that decouples fetching from the database.
+
+    Producers `put` decoded rows tagged with a key (e.g. (dataset_id,
+    year_id)) and optionally a token identifying where they came from.
+    Writer tasks accumulate rows per key and call `flush(key, rows, tokens)`
+    once `batch_rows` rows are buffered or `max_delay` seconds have passed
+    since the first buffered row, so callers can record which work a batch
+    completed in the same transaction; a batch's rows keep the order of
+    their puts, as do its tokens. The queue holds at most `queue_size`
+    puts, so when the database falls behind `put` blocks and the fetchers
+    slow down with it.
+
+    A flush that raises is logged and its rows counted as failed; the
+    writer keeps going. With a `budget`, every flush holds one of its slots
+    under `tenant`, so concurrent ingests share one DB write limit.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Hashable, List[Dict], List[Any]], Awaitable[Any]],
+        batch_rows: int = 20000,
+        max_delay: float = 2.0,
+        queue_size: int = 200,
+        writers: int = 2,
+        name: str = "WRITE",
+        budget: Optional[FairShareLimiter] = None,
+        tenant: Any = None,
+    ) -> None:
+        self.flush = flush
+        self.batch_rows = batch_rows
+        self.max_delay = max_delay
+        self.writers = writers
+        self.name = name
+        self.budget = budget
+        self.tenant = tenant
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+        self._counters = {
+            "rows_written": 0,
+            "rows_failed": 0,
+            "flushes": 0,
+            "put_wait_seconds": 0.0,
+        }
+
+    def start(self) -> "BatchWriter":
+        self._tasks = [
+            asyncio.create_task(self._run()) for _ in range(self.writers)
+        ]
+        return self
+
+    async def put(self, key: Hashable, rows: List[Dict], token: Any = None) -> None:
+        """
+        Queue rows for writing; waits while the queue is full (backpressure).
+        An empty put still travels with its token so it can be acknowledged.
+        """
+        if not rows and token is None:
+            return
+        t0 = time.perf_counter()
+        await self.queue.put((key, rows, token))
+        self._counters["put_wait_seconds"] += time.perf_counter() - t0
+
+    async def _flush(self, key: Hashable, rows: List[Dict], tokens: List[Any]) -> None:
+        slot = self.budget.slot(self.tenant) if self.budget else nullcontext()
+        try:
+            async with slot:
+                t0 = time.perf_counter()
+                await self.flush(key, rows, tokens)
+        except Exception as e:
+            self._counters["rows_failed"] += len(rows)
+            logger.exception(
+                f"[{self.name}][ERROR] Failed to write {len(rows)} rows for {key}: {e}"
+            )
+            return
+        self._counters["rows_written"] += len(rows)
+        self._counters["flushes"] += 1
+        logger.debug(
+            f"[{self.name}] Wrote {len(rows)} rows for {key} in {time.perf_counter() - t0:.2f}s"
+        )
+
+    async def _run(self) -> None:
+        buffers: Dict[Hashable, Tuple[List[Dict], List[Any]]] = {}
+        deadline: Optional[float] = None
+        # one get() outlives the waits that time out, so an item dequeued
+        # just as a timeout fires is kept (wait_for could drop it before 3.12)
+        getter: Optional[asyncio.Future] = None
+        try:
+            while True:
+                timeout = None
+                if deadline is not None:
+                    timeout = max(deadline - time.monotonic(), 0.0)
+                if getter is None:
+                    getter = asyncio.ensure_future(self.queue.get())
+                await asyncio.wait({getter}, timeout=timeout)
+                item = None
+                if getter.done():
+                    item, getter = getter.result(), None
+
+                if item is _DONE:
+                    for key, (rows, tokens) in buffers.items():
+                        await self._flush(key, rows, tokens)
+                    return
+                if item is not None:
+                    key, rows, token = item
+                    buffered_rows, tokens = buffers.setdefault(key, ([], []))
+                    buffered_rows.extend(rows)
+                    if token is not None:
+                        tokens.append(token)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.max_delay
+
+                full = [k for k, b in buffers.items() if len(b[0]) >= self.batch_rows]
+                if deadline is not None and time.monotonic() >= deadline:
+                    full = list(buffers)
+                for key in full:
+                    await self._flush(key, *buffers.pop(key))
+                if not buffers:
+                    deadline = None
+        finally:
+            if getter is not None:
+                getter.cancel()
+
+    async def close(self) -> Dict[str, Any]:
+        """Flush everything still buffered, stop the writers and return stats."""
+        for _ in self._tasks:
+            await self.queue.put(_DONE)
+        await asyncio.gather(*self._tasks)
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._counters)
+        stats["put_wait_seconds"] = round(stats["put_wait_seconds"], 2)
+        stats["queued"] = self.queue.qsize()
+        return stats
@@ -0,0 +1,109 @@
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from typing import Dict, Hashable, List, Tuple
+
+from empowered.utils.logger_setup import get_logger
+
+logger = get_logger(name=__name__)
+
+
+class FairShareLimiter:
+    """
+    A fixed number of slots shared by several tenants (e.g. concurrent
+    (dataset, year) ingests) in proportion to their weights.
+
+    While slots are free anyone gets one at once. Under contention, each
+    freed slot goes to the waiting tenant holding the fewest slots relative
+    to its weight, so a tenant with weight 2 settles at twice the in-flight
+    work of a tenant with weight 1, and no tenant is starved.
+    """
+
+    def __init__(self, capacity: int, name: str = "BUDGET") -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.name = name
+        self.in_use = 0
+        self._weights: Dict[Hashable, float] = {}
+        self._held: Dict[Hashable, int] = {}
+        self._granted: Dict[Hashable, int] = {}
+        self._waiters: Dict[Hashable, List[Tuple[int, asyncio.Future]]] = {}
+        self._order = itertools.count()
+
+    def register(self, tenant: Hashable, weight: float = 1.0) -> None:
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self._weights[tenant] = weight
+        self._held.setdefault(tenant, 0)
+        self._granted.setdefault(tenant, 0)
+        self._waiters.setdefault(tenant, [])
+
+    def _grant(self, tenant: Hashable) -> None:
+        self.in_use += 1
+        self._held[tenant] += 1
+        self._granted[tenant] += 1
+
+    async def acquire(self, tenant: Hashable) -> None:
+        if tenant not in self._weights:
+            self.register(tenant)
+        waiting = any(self._waiters.values())
+        if self.in_use < self.capacity and not waiting:
+            self._grant(tenant)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[tenant].append((next(self._order), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # granted just as we were cancelled: hand the slot back
+                self.release(tenant)
+            else:
+                self._waiters[tenant] = [
+                    w for w in self._waiters[tenant] if w[1] is not future
+                ]
+            raise
+
+    def release(self, tenant: Hashable) -> None:
+        self.in_use -= 1
+        self._held[tenant] -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self.in_use < self.capacity:
+            candidates = [t for t, waiters in self._waiters.items() if waiters]
+            if not candidates:
+                return
+            # fewest held slots per unit of weight first; FIFO among equals
+            tenant = min(
+                candidates,
+                key=lambda t: (
+                    self._held[t] / self._weights[t],
+                    self._waiters[t][0][0],
+                ),
+            )
+            _, future = self._waiters[tenant].pop(0)
+            if future.cancelled():
+                continue
+            self._grant(tenant)
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, tenant: Hashable):
+        await self.acquire(tenant)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            str(tenant): {
+                "weight": self._weights[tenant],
+                "in_use": self._held[tenant],
+                "waiting": len(self._waiters[tenant]),
+                "granted": self._granted[tenant],
+            }
+            for tenant in self._weights
+        }
@@ -1,11 +1,36 @@
+import argparse
 import asyncio
+import hashlib
+import json
+import os
+import socket
 import time
 import random
 from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.exc import OperationalError
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 
-from empowered.utils.helpers import get_sql_client
+from empowered.api.cache import get_response_cache
+from empowered.api.rate_limit import get_rate_limiter, key_id
+from empowered.api.transport import (
+    close_async_transport,
+    configure_async_transport,
+    get_async_transport,
+)
+from empowered.utils.helpers import get_census_api_key, get_sql_client
 from empowered.utils.logger_setup import set_logger, get_logger
 from empowered.repositories.census.datasets_repo import DatasetRepository
 from empowered.repositories.census.estimates_repo import CensusEstimateRepository
@@ -14,34 +39,187 @@ from empowered.repositories.census.groups_repo import GroupsRepository
 from empowered.repositories.census.variables_repo import VariablesRepository
 from empowered.repositories.census.years_available_repo import YearsAvailableRepository
 from empowered.repositories.census.checkpoint_repository import CheckpointRepository
-from empowered.services.census_service import (
+from empowered.repositories.census.dead_letters_repo import DeadLetterRepository
+from empowered.repositories.census.fingerprints_repo import FingerprintRepository
+from empowered.repositories.census.work_units_repo import WorkUnitRepository
+from empowered.api.cache import normalize_url
+from empowered.api.census import (
+    REQUEST_FLIGHT,
+    WILDCARD,
+    CensusRateLimitError,
+    estimate_url,
+)
+from empowered.api.census_async import set_fetch_slot
+from empowered.ingest.adaptive import AdaptiveLimiter
+from empowered.ingest.batch_writer import BatchWriter
+from empowered.ingest.budget import FairShareLimiter
+from empowered.ingest.stages import Channel, StageGraph
+from empowered.ingest.worker_pool import WorkerPool
+from empowered.services.census_service import InvalidGroupError
+from empowered.services.census_service_async import (
+    get_block_groups,
     get_counties,
     get_estimates,
     get_groups,
     get_places,
     get_states,
-    get_variables,
+    get_tracts,
+    get_variables_by_group,
 )
 
 # ---- CONFIG ----
 # ACS API allows up to ~50 variables per request
 VARS_PER_REQUEST = 50
+# Request each estimate's _M margin of error in the same request (it takes
+# one of the VARS_PER_REQUEST slots); group() requests always carry them
+FETCH_MARGINS = True
 
-NETWORK_CONCURRENCY = 40  # concurrent Census API calls
-GROUPS_CONCURRENCY = 8  # concurrent group variable loads
+NETWORK_CONCURRENCY = 100  # ceiling on in-flight Census API calls (asyncio)
 GEOGRAPHY_CONCURRENCY = 20  # concurrent state-level geo fetchers
+STATE_STREAM_SIZE = GEOGRAPHY_CONCURRENCY  # stored states waiting for estimate planning
 DB_CONCURRENCY = 10  # concurrent DB writer workers
-
-# Thread pools
-NETWORK_EXECUTOR = ThreadPoolExecutor(max_workers=NETWORK_CONCURRENCY)
+HTTP_TIMEOUT = (5.0, 60.0)  # (connect, read) seconds per Census request
+ESTIMATE_QUEUE_SIZE = NETWORK_CONCURRENCY * 2  # jobs generated ahead of workers
+POOL_REPORT_SECONDS = 10.0  # how often worker pools log utilization
+DB_WRITERS = 8  # writer tasks draining fetched rows into bulk inserts (ceiling)
+WRITE_BATCH_ROWS = 20000  # rows per bulk insert
+WRITE_FLUSH_SECONDS = 2.0  # flush a partial batch after this long
+WRITE_QUEUE_SIZE = NETWORK_CONCURRENCY * 2  # fetched responses waiting for the DB
+# (dataset, year) ingests run at once; they share NETWORK_CONCURRENCY request
+# slots, DB_WRITERS write slots and the daily request quota
+MAX_CONCURRENT_INGESTS = 4
+# Fair-share weight of each dataset's ingests for the shared slots (default 1)
+DATASET_WEIGHTS = {"acs5": 2.0, "acs1": 1.0}
+
+# AIMD control: the in-flight Census requests and bulk writes actually
+# allowed start at *_START, grow by one per ADAPT_WINDOW healthy calls and
+# halve on 429s, timeouts, > ADAPT_MAX_ERROR_RATE errors or a p95 latency
+# ADAPT_P95_TOLERANCE x its baseline, within [*_MIN, NETWORK_CONCURRENCY or
+# DB_WRITERS]
+FETCH_START = 20
+FETCH_MIN = 2
+WRITE_START = 4
+WRITE_MIN = 1
+ADAPT_WINDOW = 50
+ADAPT_MAX_ERROR_RATE = 0.05
+ADAPT_P95_TOLERANCE = 2.0
+
+# --dry-run projections: mean Census request latency, and the states and
+# counties (with DC and Puerto Rico) assumed before a year's geography is
+# stored
+ESTIMATED_REQUEST_SECONDS = 1.0
+ESTIMATED_STATES = 52
+ESTIMATED_COUNTIES = 3222
+
+# "wildcard": one request per (state, variable batch) returning every place/county
+# in the state; "per_geography": one request per (place or county, variable batch)
+ESTIMATE_FETCH_MODE = "wildcard"
+# Neighbourhood levels ingested besides places: "tract" and/or "block_group",
+# for 5-year datasets only (ACS1 publishes neither). Tracts take one
+# state-scoped wildcard request per (state, batch), block groups one
+# county-scoped request per (county, batch), as the API requires a county;
+# rows go to CensusTractEstimate / CensusBlockGroupEstimate
+SMALL_AREA_LEVELS: Tuple[str, ...] = ()
+# Fetch a whole table with get=group(TABLE) when that saves round trips over
+# explicit VARS_PER_REQUEST-sized variable lists
+USE_GROUP_REQUESTS = True
+# Delta mode plans estimate jobs from what CensusEstimate is still missing
+# instead of every (place, batch). A state's gaps in a batch are fetched per
+# place when at most DELTA_PER_PLACE_MAX_GAPS places miss it, else by wildcard
+DELTA_INGEST = True
+DELTA_PER_PLACE_MAX_GAPS = 3
+# Change detection across vintages: each group (with its variables) and
+# each state (with its counties, places and small areas) is hashed as the
+# API returns it and compared with the nearest earlier ingested vintage.
+# Unchanged entities are linked by copying their stored rows to the new
+# year inside the database; only changed ones are written from the response
+CHANGE_DETECTION = True
+
+# Estimate work units are a job queue shared by this process and any number
+# of `--worker` processes (other hosts included) on the same database. Each
+# claims QUEUE_CLAIM_SIZE units at a time under a QUEUE_LEASE_SECONDS lease,
+# renewed every QUEUE_HEARTBEAT_SECONDS; a dead process's units are claimed
+# again once their lease expires
+QUEUE_CLAIM_SIZE = NETWORK_CONCURRENCY
+QUEUE_LEASE_SECONDS = 120.0
+QUEUE_HEARTBEAT_SECONDS = 30.0
+QUEUE_POLL_SECONDS = 5.0
+WORKER_ID = f"{socket.gethostname()[:32]}:{os.getpid()}"
+# Units are claimed highest priority first, so the most queried places are
+# stored first and a partial ingest is already useful. A place weighs its
+# PRIORITY_VARIABLE (population) in the stored vintage nearest the ingested
+# year, of the same dataset if it has one (None skips the lookup), plus its
+# PRIORITY_PLACES weight keyed by state+place FIPS: {"3651000": 1e9} puts
+# New York City first. A wildcard unit weighs all of its state's places
+PRIORITY_VARIABLE: Optional[str] = "B01003_001E"
+PRIORITY_PLACES: Dict[str, float] = {}
+
+# Thread pool for blocking DB calls; Census calls are awaited on the loop
 DB_EXECUTOR = ThreadPoolExecutor(max_workers=DB_CONCURRENCY)
 
+# Keep-alive pool sized so every in-flight request can hold its own connection
+configure_async_transport(pool_size=NETWORK_CONCURRENCY, timeout=HTTP_TIMEOUT)
+
 # Backoff / retry settings
 MAX_RETRIES = 4
 INITIAL_BACKOFF = 0.5  # seconds
+# errors a retry cannot fix: raised at once instead of backing off
+NON_RETRYABLE_ERRORS = (InvalidGroupError,)
+
+
+def is_census_congestion(error: BaseException) -> bool:
+    """429s, 503s and timeouts anywhere in the chain the services wrap."""
+    while error is not None:
+        if isinstance(error, (CensusRateLimitError, TimeoutError, asyncio.TimeoutError)):
+            return True
+        if getattr(error, "status_code", None) in (429, 503):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def is_db_congestion(error: BaseException) -> bool:
+    """Lock timeouts, deadlocks and dropped connections (OperationalError)."""
+    while error is not None:
+        if isinstance(error, (OperationalError, TimeoutError)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+# One controller per stage for the whole process: throttling and DB load
+# are shared by every concurrent ingest
+FETCH_CONTROL = AdaptiveLimiter(
+    "FETCH",
+    initial=FETCH_START,
+    minimum=FETCH_MIN,
+    maximum=NETWORK_CONCURRENCY,
+    window=ADAPT_WINDOW,
+    max_error_rate=ADAPT_MAX_ERROR_RATE,
+    tolerance=ADAPT_P95_TOLERANCE,
+    congestion=is_census_congestion,
+)
+# a fetch holds its slot only for the transport call, after the rate
+# limiter and daily quota have let it through: throttling waits are not
+# latency the controller should react to
+set_fetch_slot(FETCH_CONTROL.slot)
+WRITE_CONTROL = AdaptiveLimiter(
+    "WRITE",
+    initial=WRITE_START,
+    minimum=WRITE_MIN,
+    maximum=DB_WRITERS,
+    window=max(ADAPT_WINDOW // 10, 1),
+    max_error_rate=ADAPT_MAX_ERROR_RATE,
+    tolerance=ADAPT_P95_TOLERANCE,
+    latency_floor=2.0,
+    congestion=is_db_congestion,
+)
 
+# Both publish the same group and variable codes; CensusGroup and
+# CensusVariable are keyed per dataset and year so their metadata coexists
 ACS_DATASETS = [
     {"code": "acs", "frequency": 5, "id": "acs5"},
+    {"code": "acs", "frequency": 1, "id": "acs1"},
 ]
 ACS_VARIABLES = [
     # Population & Households
@@ -52,7 +230,6 @@ ACS_VARIABLES = [
     # Income
     "B19013_001E",
     "B19301_001E",
-    "B19001_001E",
     # B19001 – Household Income Distribution
     "B19001_001E",
     "B19001_002E",
@@ -184,27 +361,92 @@ def chunk_list(xs: List, size: int) -> Iterable[List]:
         yield xs[i : i + size]
 
 
+def pack_variables(groups: List[List[str]], size: int) -> List[List[str]]:
+    """
+    Pack groups of variable ids into the fewest requests of at most `size`.
+    Groups are kept whole (first-fit decreasing) when that reaches the
+    minimum, ceil(total / size); otherwise they are laid end to end and cut
+    every `size` variables, splitting some groups across two requests.
+    """
+    total = sum(map(len, groups))
+    if not total:
+        return []
+    minimum = -(-total // size)
+    bins: List[List[str]] = []
+    for variables in sorted(groups, key=lambda g: (-len(g), g)):
+        target = next((b for b in bins if len(b) + len(variables) <= size), None)
+        if target is None:
+            bins.append([])
+            target = bins[-1]
+        target.extend(variables)
+    if len(bins) == minimum:
+        return [sorted(b) for b in bins]
+    flat = [v for variables in sorted(groups) for v in variables]
+    return [list(chunk) for chunk in chunk_list(flat, size)]
+
+
+def plan_variable_requests(
+    variables_by_group: Dict[str, List[Dict]],
+    use_groups: bool = USE_GROUP_REQUESTS,
+    margins: bool = FETCH_MARGINS,
+) -> List[Dict]:
+    """
+    Turn {group_id: [variable dicts]} into the list of requests needed per
+    geography: [{"group": "B17001" | None, "variables": [...]}, ...].
+
+    Variable ids are deduplicated. A group whose variables need more than
+    one explicit request is fetched in one get=group(TABLE) request; the
+    smaller groups are packed together into the fewest VARS_PER_REQUEST
+    requests (see pack_variables), so a 13-variable table no longer costs a
+    request of its own. With `margins` every estimate takes two slots, its
+    own and its `_M` margin of error's.
+    """
+    per_request = VARS_PER_REQUEST // 2 if margins else VARS_PER_REQUEST
+    requests_plan: List[Dict] = []
+    seen = set()
+    small_groups: List[List[str]] = []
+    for gid, variables in sorted(variables_by_group.items()):
+        # sorted so the plan (and its ledger keys) match whether variables
+        # came from the API or from the database
+        var_ids = sorted({v["variable_id"] for v in variables} - seen)
+        seen.update(var_ids)
+        if not var_ids:
+            continue
+        if len(var_ids) > per_request and use_groups:
+            requests_plan.append({"group": gid, "variables": var_ids})
+        elif len(var_ids) > per_request:
+            for batch in chunk_list(var_ids, per_request):
+                requests_plan.append({"group": None, "variables": list(batch)})
+        else:
+            small_groups.append(var_ids)
+    for batch in pack_variables(small_groups, per_request):
+        requests_plan.append({"group": None, "variables": batch})
+    return requests_plan
+
+
 async def arun(func: Callable, executor: ThreadPoolExecutor, *args, **kwargs):
     """Run a synchronous function in an executor and return its result."""
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(executor, lambda: func(*args, **kwargs))
 
 
-async def retry_async_call(
+async def retry_async(
     func: Callable,
-    executor: ThreadPoolExecutor,
     *args,
     max_retries: int = MAX_RETRIES,
     initial_backoff: float = INITIAL_BACKOFF,
     **kwargs,
 ):
     """
-    Wrapper: call `func` in executor with retries and exponential backoff.
+    Wrapper: await coroutine function `func` with retries and exponential backoff.
+    NON_RETRYABLE_ERRORS are raised at once.
     """
     attempt = 0
     while True:
         try:
-            return await arun(func, executor, *args, **kwargs)
+            return await func(*args, **kwargs)
+        except NON_RETRYABLE_ERRORS:
+            raise
         except Exception as e:
             attempt += 1
             if attempt > max_retries:
@@ -221,6 +463,124 @@ async def retry_async_call(
             await asyncio.sleep(backoff)
 
 
+async def retry_async_call(
+    func: Callable,
+    executor: ThreadPoolExecutor,
+    *args,
+    max_retries: int = MAX_RETRIES,
+    initial_backoff: float = INITIAL_BACKOFF,
+    **kwargs,
+):
+    """
+    Wrapper: call `func` in executor with retries and exponential backoff.
+    """
+
+    async def call(*a, **kw):
+        return await arun(func, executor, *a, **kw)
+
+    call.__name__ = func.__name__
+    return await retry_async(
+        call,
+        *args,
+        max_retries=max_retries,
+        initial_backoff=initial_backoff,
+        **kwargs,
+    )
+
+
+# -------------------------
+# CHANGE DETECTION
+# -------------------------
+def _canonical(value):
+    """`value` with every list sorted, so records hash in any order."""
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return sorted(
+            (_canonical(v) for v in value),
+            key=lambda v: json.dumps(v, sort_keys=True, default=str),
+        )
+    return value
+
+
+def content_hash(value) -> str:
+    """sha256 of `value` as canonical JSON."""
+    encoded = json.dumps(_canonical(value), sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def group_fingerprints(
+    groups: List[Dict], variables_by_group: Dict[str, List[Dict]]
+) -> Dict[str, Tuple[str, int]]:
+    """{"group:<id>": (hash, rows)} of each group with its variables."""
+    group_rows = {g.get("group_id"): g for g in groups}
+    fingerprints = {}
+    for gid in set(group_rows) | set(variables_by_group):
+        variables = variables_by_group.get(gid, [])
+        fingerprints[f"group:{gid}"] = (
+            content_hash({"group": group_rows.get(gid), "variables": variables}),
+            (gid in group_rows) + len(variables),
+        )
+    return fingerprints
+
+
+def state_entity(state: Dict) -> str:
+    return f"state:{int(state['state_fips']):02d}"
+
+
+def state_fingerprint(state: Dict) -> Tuple[str, int]:
+    """(hash, rows) of a state with its counties, places and small areas."""
+    areas = ("counties", "places", "tracts", "block_groups")
+    return content_hash(state), 1 + sum(len(state.get(key, [])) for key in areas)
+
+
+def unchanged_entities(
+    fingerprints: Dict[str, Tuple[str, int]], previous: Optional[Dict]
+) -> Set[str]:
+    """Entities of `fingerprints` the `previous` vintage has with the same hash."""
+    if not previous:
+        return set()
+    return {
+        entity
+        for entity, (digest, _) in fingerprints.items()
+        if previous["fingerprints"].get(entity) == digest
+    }
+
+
+async def load_previous_vintage(
+    dataset: dict,
+    year: int,
+    fingerprint_repo: FingerprintRepository,
+    year_repo: YearsAvailableRepository,
+) -> Optional[Dict]:
+    """
+    The nearest earlier vintage of `dataset` with recorded fingerprints:
+    {"year", "year_id", "fingerprints": {entity: hash}}, or None.
+    """
+    dataset_id = dataset["id"]
+    previous_year = await arun(
+        fingerprint_repo.latest_year_before, DB_EXECUTOR, dataset_id, year
+    )
+    if previous_year is None:
+        return None
+    years = await arun(
+        year_repo.get_years, DB_EXECUTOR, dataset_id=dataset_id, year=previous_year
+    )
+    if not years:
+        return None
+    fingerprints = await arun(
+        fingerprint_repo.get_fingerprints, DB_EXECUTOR, dataset_id, previous_year
+    )
+    logger.info(
+        f"[DIFF] Comparing {dataset_id}/{year} with vintage {previous_year} ({len(fingerprints)} fingerprints)"
+    )
+    return {
+        "year": previous_year,
+        "year_id": years[0]["id"],
+        "fingerprints": fingerprints,
+    }
+
+
 # -------------------------
 # HIGH-LEVEL INGEST WORKFLOW
 # -------------------------
@@ -229,7 +589,8 @@ async def load_groups_and_variables(
     year: int,
 ) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
     """
-    Loads groups once and variables for each group once.
+    Loads groups once (groups.json) and every group's variables from the
+    dataset's single variables.json, instead of one request per group.
     Returns dict: {group_id: [variable_ids...]} (note: full variable dicts kept if desired)
     """
     acs_id = dataset["frequency"]
@@ -237,9 +598,7 @@ async def load_groups_and_variables(
     logger.info(
         f"[LOAD] Loading groups for dataset={dataset_id} year={year} (ACS{acs_id})"
     )
-    groups_resp = await retry_async_call(
-        get_groups, NETWORK_EXECUTOR, acs_id=acs_id, year=year
-    )
+    groups_resp = await retry_async(get_groups, acs_id=acs_id, year=year)
     if not isinstance(groups_resp, list):
         # support both list or dict depending on your API wrapper
         groups = groups_resp.get("groups", groups_resp)
@@ -253,26 +612,15 @@ async def load_groups_and_variables(
         groups = [g for g in groups if g.get("group_id") in ACS_GROUPS]
         logger.info(f"[FILTER] Will use {len(groups)} groups based on ACS_GROUPS.")
 
-    # Load variables for groups concurrently but limited
-    sem = asyncio.Semaphore(GROUPS_CONCURRENCY)
-    variables_by_group: Dict[str, List[str]] = {}
-
-    async def load_group_vars(gid: str):
-        async with sem:
-            logger.debug(f"[LOAD] Loading variables for group {gid} ...")
-            vars_resp = await retry_async_call(
-                get_variables, NETWORK_EXECUTOR, acs_id, year, gid
-            )
-            if isinstance(vars_resp, dict):
-                vs = vars_resp.get("variables") or vars_resp
-            else:
-                vs = vars_resp
-            variables_by_group[gid] = vs
-            logger.info(f"[LOAD] Group {gid}: {len(vs)} variables loaded.")
-
-    await asyncio.gather(*(load_group_vars(gid) for gid in group_ids))
+    variables_by_group = await retry_async(
+        get_variables_by_group, acs_id, year, group_ids
+    )
+    for gid, vs in variables_by_group.items():
+        logger.debug(f"[LOAD] Group {gid}: {len(vs)} variables loaded.")
 
-    logger.info("[LOAD] All groups and variables loaded.")
+    logger.info(
+        f"[LOAD] All groups and variables loaded ({sum(map(len, variables_by_group.values()))} variables)."
+    )
     return variables_by_group, groups
 
 
@@ -284,13 +632,41 @@ async def ingest_groups_and_variables_to_db(
     groups_repo: GroupsRepository,
     variables_repo: VariablesRepository,
     year_repo: YearsAvailableRepository,
+    previous: Optional[Dict] = None,
+    fingerprint_repo: Optional[FingerprintRepository] = None,
 ):
     """
     Insert groups and variables as batches into DB. Uses DB_EXECUTOR.
+    Groups a `previous` vintage (see load_previous_vintage) has unchanged
+    are copied from its rows instead; the fingerprints of all groups go to
+    `fingerprint_repo` once stored.
     """
     dataset_id = dataset["id"]
     year_id = year_repo.get_years(dataset_id=dataset_id, year=year)[0]["id"]
 
+    fingerprints = group_fingerprints(groups, variables_by_group)
+    unchanged = unchanged_entities(fingerprints, previous)
+    if unchanged:
+        linked = sorted(entity.split(":", 1)[1] for entity in unchanged)
+        logger.info(
+            f"[DIFF] Linking {len(linked)} of {len(fingerprints)} groups unchanged since {previous['year']} (dataset={dataset_id} year_id={year_id})"
+        )
+        for copy in (groups_repo.copy_groups, variables_repo.copy_variables):
+            await arun(
+                copy,
+                DB_EXECUTOR,
+                group_ids=linked,
+                dataset_id=dataset_id,
+                from_year_id=previous["year_id"],
+                to_year_id=year_id,
+            )
+        groups = [g for g in groups if f"group:{g.get('group_id')}" not in unchanged]
+        variables_by_group = {
+            gid: vs
+            for gid, vs in variables_by_group.items()
+            if f"group:{gid}" not in unchanged
+        }
+
     logger.info(
         f"[DB] Inserting {len(groups)} groups into DB for dataset={dataset_id} year_id={year_id}"
     )
@@ -321,21 +697,31 @@ async def ingest_groups_and_variables_to_db(
         dataset_id=dataset_id,
         year_id=year_id,
     )
+    if fingerprint_repo is not None:
+        await arun(
+            fingerprint_repo.record, DB_EXECUTOR, dataset_id, year, fingerprints
+        )
     logger.info("[DB] Groups and variables inserted.")
 
 
-async def load_geography_all(dataset: dict, year: int) -> List[Dict]:
+def small_area_levels(dataset: dict) -> Tuple[str, ...]:
+    """SMALL_AREA_LEVELS that `dataset` publishes (tracts need ACS5)."""
+    return SMALL_AREA_LEVELS if int(dataset["frequency"]) == 5 else ()
+
+
+async def iter_geography(
+    dataset: dict, year: int, levels: Tuple[str, ...] = ()
+) -> AsyncIterator[Dict]:
     """
-    Load states, and for each state, counties and places concurrently (bounded).
-    Returns list of state dicts:
-    [
-      {"state_fips": "...", "state_name": "...", "counties": [...], "places": [...]},
-      ...
-    ]
+    Load states, and for each state, counties and places concurrently
+    (bounded), yielding each state as soon as it is loaded:
+    {"state_fips": "...", "state_name": "...", "counties": [...], "places": [...]}
+    With "tract" in `levels` a state also carries "tracts" (one request),
+    with "block_group" its "block_groups" (one request per county).
     """
     acs_id = dataset["frequency"]
     logger.info(f"[LOAD] Loading states for ACS{acs_id} year={year}")
-    states = await retry_async_call(get_states, NETWORK_EXECUTOR, acs_id, year)
+    states = await retry_async(get_states, acs_id, year)
 
     sem = asyncio.Semaphore(GEOGRAPHY_CONCURRENCY)
 
@@ -346,31 +732,60 @@ async def load_geography_all(dataset: dict, year: int) -> List[Dict]:
             logger.debug(
                 f"[LOAD] Fetching counties+places for state {state_name} ({state_fips})"
             )
-            counties_task = retry_async_call(
-                get_counties, NETWORK_EXECUTOR, acs_id, year, state_fips
+            counties_task = retry_async(
+                get_counties, acs_id, year, state_fips
             )
-            places_task = retry_async_call(
-                get_places, NETWORK_EXECUTOR, acs_id, year, state_fips
+            places_task = retry_async(
+                get_places, acs_id, year, state_fips
             )
             counties, places = await asyncio.gather(counties_task, places_task)
-            logger.info(
-                f"[LOAD] State {state_name} ({state_fips}): {len(counties)} counties, {len(places)} places"
-            )
-            return {
+            state = {
                 "state_fips": state_fips,
                 "state_name": state_name,
                 "counties": counties,
                 "places": places,
             }
+            if "tract" in levels:
+                state["tracts"] = await retry_async(
+                    get_tracts, acs_id, year, state_fips
+                )
+            if "block_group" in levels:
+                per_county = await asyncio.gather(
+                    *(
+                        retry_async(
+                            get_block_groups,
+                            acs_id,
+                            year,
+                            state_fips,
+                            c["county_fips"],
+                        )
+                        for c in counties
+                    )
+                )
+                state["block_groups"] = [b for bgs in per_county for b in bgs]
+            logger.info(
+                f"[LOAD] State {state_name} ({state_fips}): {len(counties)} counties, {len(places)} places"
+                + "".join(
+                    f", {len(state[key])} {key.replace('_', ' ')}"
+                    for key in ("tracts", "block_groups")
+                    if key in state
+                )
+            )
+            return state
 
     states_list = (
         states
         if isinstance(states, list)
         else list(states.values()) if isinstance(states, dict) else states
     )
-    results = await asyncio.gather(*(fetch_state(s) for s in states_list))
+    tasks = [asyncio.ensure_future(fetch_state(s)) for s in states_list]
+    try:
+        for next_state in asyncio.as_completed(tasks):
+            yield await next_state
+    finally:
+        for task in tasks:
+            task.cancel()
     logger.info("[LOAD] Completed geography load for all states.")
-    return results
 
 
 async def ingest_geography_to_db(
@@ -379,13 +794,51 @@ async def ingest_geography_to_db(
     geography: List[Dict],
     geo_repo: GeographyRepository,
     year_repo: YearsAvailableRepository,
+    previous: Optional[Dict] = None,
+    fingerprint_repo: Optional[FingerprintRepository] = None,
 ):
     """
-    Batch insert states, counties, places. Uses DB executor.
+    Store states with their counties, places and small areas. States a
+    `previous` vintage (see load_previous_vintage) has unchanged are copied
+    from its rows; the rest are inserted from the response. The states'
+    fingerprints go to `fingerprint_repo` once stored.
     """
     dataset_id = dataset["id"]
     year_id = year_repo.get_years(dataset_id=dataset_id, year=year)[0]["id"]
 
+    fingerprints = {state_entity(s): state_fingerprint(s) for s in geography}
+    unchanged = unchanged_entities(fingerprints, previous)
+    if unchanged:
+        linked = [s for s in geography if state_entity(s) in unchanged]
+        copied = await arun(
+            geo_repo.copy_states,
+            DB_EXECUTOR,
+            state_fips=[int(s["state_fips"]) for s in linked],
+            dataset_id=dataset_id,
+            from_year_id=previous["year_id"],
+            to_year_id=year_id,
+        )
+        logger.info(
+            f"[DIFF] Linked {len(linked)} states unchanged since {previous['year']} ({copied} rows, FIPS {', '.join(str(s['state_fips']) for s in linked)})"
+        )
+        geography = [s for s in geography if state_entity(s) not in unchanged]
+    if geography:
+        await insert_geography(dataset_id, year_id, geography, geo_repo)
+    if fingerprint_repo is not None:
+        await arun(
+            fingerprint_repo.record, DB_EXECUTOR, dataset_id, year, fingerprints
+        )
+
+
+async def insert_geography(
+    dataset_id: str,
+    year_id: int,
+    geography: List[Dict],
+    geo_repo: GeographyRepository,
+):
+    """
+    Batch insert states, counties, places. Uses DB executor.
+    """
     # Batch states
     states_batch = [
         {"state_fips": s["state_fips"], "state_name": s["state_name"]}
@@ -406,6 +859,9 @@ async def ingest_geography_to_db(
     counties_flat = []
     places_flat = []
 
+    tracts_flat = []
+    block_groups_flat = []
+
     for s in geography:
         for c in s["counties"]:
             c_record = {**c, "state_fips": s["state_fips"]}
@@ -413,6 +869,8 @@ async def ingest_geography_to_db(
         for p in s["places"]:
             p_record = {**p, "state_fips": s["state_fips"]}
             places_flat.append(p_record)
+        tracts_flat.extend(s.get("tracts", []))
+        block_groups_flat.extend(s.get("block_groups", []))
 
     logger.info(
         f"[DB] Inserting {len(counties_flat)} counties and {len(places_flat)} places"
@@ -435,6 +893,24 @@ async def ingest_geography_to_db(
             dataset_id=dataset_id,
             year_id=year_id,
         )
+    if tracts_flat or block_groups_flat:
+        logger.info(
+            f"[DB] Inserting {len(tracts_flat)} tracts and {len(block_groups_flat)} block groups"
+        )
+    await arun(
+        geo_repo.insert_tracts,
+        DB_EXECUTOR,
+        tracts=tracts_flat,
+        dataset_id=dataset_id,
+        year_id=year_id,
+    )
+    await arun(
+        geo_repo.insert_block_groups,
+        DB_EXECUTOR,
+        block_groups=block_groups_flat,
+        dataset_id=dataset_id,
+        year_id=year_id,
+    )
 
     logger.info("[DB] Geography inserted.")
 
@@ -442,6 +918,272 @@ async def ingest_geography_to_db(
 # -----------------------
 # ESTIMATE INGESTION (streaming + batching)
 # -----------------------
+def batch_key(variable_batch: Dict) -> str:
+    """Stable ledger id of a planned request: its group, or a hash of its variables."""
+    if variable_batch["group"]:
+        return f"group:{variable_batch['group']}"
+    digest = hashlib.sha1(",".join(variable_batch["variables"]).encode()).hexdigest()
+    return f"vars:{digest[:16]}"
+
+
+def job_level(job: Dict) -> str:
+    """Geography level of a job: "place", "county", "tract" or "block_group"."""
+    return job.get("level") or ("county" if job["county_fips"] is not None else "place")
+
+
+def job_unit(job: Dict) -> Dict:
+    """
+    Work-unit key of an estimate job (see WorkUnitRepository). Tract jobs
+    cover a whole state (geo_code WILDCARD), block group jobs a county.
+    """
+    level = job_level(job)
+    if level == "place":
+        geo_code = job["place_fips"]
+    elif level == "tract":
+        geo_code = WILDCARD
+    else:
+        geo_code = job["county_fips"]
+    return {
+        "state_fips": job["state_fips"],
+        "geo_level": level,
+        "geo_code": geo_code,
+        "batch_key": batch_key(job["batch"]),
+    }
+
+
+UNIT_ID_FIELDS = ("state_fips", "geo_level", "geo_code", "batch_key")
+
+
+def unit_id(unit: Dict) -> Tuple[str, str, str, str]:
+    return tuple(unit[field] for field in UNIT_ID_FIELDS)
+
+
+def rows_of_units(rows: List[Dict], units: List[Dict], keep: List[Dict]) -> List[Dict]:
+    """
+    The rows of the `keep` units of a flushed batch. A batch's rows arrive
+    in the order of its units' puts, each unit bringing its "rows" count.
+    """
+    kept = {unit_id(u) for u in keep}
+    selected, start = [], 0
+    for unit in units:
+        count = unit.get("rows") or 0
+        if unit_id(unit) in kept:
+            selected.extend(rows[start : start + count])
+        start += count
+    if start != len(rows):
+        raise ValueError(
+            f"Batch of {len(rows)} rows does not match its units' {start} rows"
+        )
+    return selected
+
+
+def iter_estimate_jobs(
+    geography: List[Dict],
+    variable_batches: List[Dict],
+    place_only: bool = True,
+    fetch_mode: str = ESTIMATE_FETCH_MODE,
+) -> Iterator[Dict]:
+    """
+    Lazily yield estimate jobs: {"batch", "state_fips", "county_fips",
+    "place_fips"}. With fetch_mode="wildcard" each job covers every place (or
+    county) of a state, so the job count is states x batches instead of
+    places x batches.
+    """
+    for s in geography:
+        state_fips = s["state_fips"]
+        if fetch_mode == "wildcard":
+            counties = [] if place_only else [{"county_fips": WILDCARD}]
+            places = [{"place_fips": WILDCARD}] if s["places"] else []
+        else:
+            counties = [] if place_only else s["counties"]
+            places = s["places"]
+        for c in counties:
+            for variable_batch in variable_batches:
+                yield {
+                    "batch": variable_batch,
+                    "state_fips": state_fips,
+                    "county_fips": c["county_fips"],
+                    "place_fips": None,
+                }
+        for p in places:
+            for variable_batch in variable_batches:
+                yield {
+                    "batch": variable_batch,
+                    "state_fips": state_fips,
+                    "county_fips": None,
+                    "place_fips": p["place_fips"],
+                }
+
+
+def iter_small_area_jobs(
+    geography: List[Dict],
+    variable_batches: List[Dict],
+    levels: Tuple[str, ...] = (),
+) -> Iterator[Dict]:
+    """
+    Lazily yield the tract and block group jobs of `levels`: one wildcard
+    job per (state, batch) for tracts and per (county, batch) for block
+    groups. Jobs carry their "level".
+    """
+    for s in geography:
+        state_fips = s["state_fips"]
+        if "tract" in levels:
+            for variable_batch in variable_batches:
+                yield {
+                    "batch": variable_batch,
+                    "state_fips": state_fips,
+                    "county_fips": None,
+                    "place_fips": None,
+                    "level": "tract",
+                }
+        if "block_group" in levels:
+            for c in s["counties"]:
+                for variable_batch in variable_batches:
+                    yield {
+                        "batch": variable_batch,
+                        "state_fips": state_fips,
+                        "county_fips": c["county_fips"],
+                        "place_fips": None,
+                        "level": "block_group",
+                    }
+
+
+def load_estimate_coverage(
+    estimates_repo: CensusEstimateRepository, dataset_id: str, year_id: int
+) -> Dict[int, Dict[int, Set[str]]]:
+    """
+    Stored estimates of a dataset year as {state_fips: {place_fips:
+    {variable_id, ...}}}, keyed by integer FIPS, in one streamed query.
+    """
+    coverage: Dict[int, Dict[int, Set[str]]] = {}
+    names: Dict[str, str] = {}  # share one string per variable id
+    for state_fips, place_fips, variable_id in estimates_repo.iter_place_coverage(
+        dataset_id, year_id
+    ):
+        variable_id = names.setdefault(variable_id, variable_id)
+        coverage.setdefault(int(state_fips), {}).setdefault(
+            int(place_fips), set()
+        ).add(variable_id)
+    return coverage
+
+
+def load_place_weights(
+    estimates_repo: CensusEstimateRepository,
+    year_repo: YearsAvailableRepository,
+    dataset_id: str,
+    year: int,
+) -> Dict[Tuple[int, int], float]:
+    """
+    Claim weight of every place as {(state_fips, place_fips): weight}, keyed
+    by integer FIPS (see PRIORITY_VARIABLE and PRIORITY_PLACES).
+    """
+    weights: Dict[Tuple[int, int], float] = {}
+    if PRIORITY_VARIABLE:
+        years = {
+            y["id"]: y["year"]
+            for d in ACS_DATASETS
+            for y in year_repo.get_years(dataset_id=d["id"])
+        }
+        ranks: Dict[Tuple[int, int], Tuple[bool, int]] = {}
+        for other, year_id, state_fips, place_fips, value in (
+            estimates_repo.iter_variable_values(PRIORITY_VARIABLE)
+        ):
+            key = (int(state_fips), int(place_fips))
+            rank = (other != dataset_id, abs(years.get(year_id, year) - year))
+            if key not in ranks or rank < ranks[key]:
+                ranks[key] = rank
+                # the API encodes missing values as large negatives
+                weights[key] = max(value, 0.0)
+    for geoid, weight in PRIORITY_PLACES.items():
+        key = (int(geoid[:2]), int(geoid[2:]))
+        weights[key] = weights.get(key, 0.0) + weight
+    return weights
+
+
+def prioritized_units(
+    jobs: List[Dict], state: Dict, weights: Dict[Tuple[int, int], float]
+) -> List[Dict]:
+    """
+    Work units of one state's jobs, each with its claim "priority": the
+    place's weight, the state's total for a wildcard or tract unit, and
+    that total shared out per county for county and block group units.
+    """
+    state_fips = int(state["state_fips"])
+    places = {
+        p["place_fips"]: weights.get((state_fips, int(p["place_fips"])), 0.0)
+        for p in state["places"]
+    }
+    total = sum(places.values())
+    per_county = total / max(len(state["counties"]), 1)
+    units = []
+    for job in jobs:
+        level = job_level(job)
+        if level in ("county", "block_group"):
+            priority = total if job["county_fips"] == WILDCARD else per_county
+        elif level == "tract" or job["place_fips"] == WILDCARD:
+            priority = total
+        else:
+            priority = places.get(job["place_fips"], 0.0)
+        units.append({**job_unit(job), "priority": priority})
+    return units
+
+
+def iter_delta_jobs(
+    geography: List[Dict],
+    variable_batches: List[Dict],
+    coverage: Dict[int, Dict[int, Set[str]]],
+    done: Set[Tuple[str, str, str, str]],
+    place_only: bool = True,
+    fetch_mode: str = ESTIMATE_FETCH_MODE,
+) -> Iterator[Dict]:
+    """
+    Yield only the estimate jobs needed to fill the gaps in `coverage`.
+
+    A place is a gap in a batch when some of the batch's variables are not
+    stored and no done work unit (its own or its state's wildcard) already
+    fetched it; a done unit with missing rows means the API had no value.
+    Each (state, batch) with gaps becomes one wildcard job, or one job per
+    gap place when there are at most DELTA_PER_PLACE_MAX_GAPS of them (always
+    per place with fetch_mode="per_geography"). Jobs carry "stored", the
+    state's coverage, so rows already in the database are dropped before
+    they are written. County jobs are not tracked by coverage and are
+    planned as in `iter_estimate_jobs`.
+    """
+    for s in geography:
+        state_fips = s["state_fips"]
+        if not place_only:
+            yield from iter_estimate_jobs(
+                [{**s, "places": []}],
+                variable_batches,
+                place_only=False,
+                fetch_mode=fetch_mode,
+            )
+        stored = coverage.get(int(state_fips), {})
+        for variable_batch in variable_batches:
+            key = batch_key(variable_batch)
+            if (state_fips, "place", WILDCARD, key) in done:
+                continue
+            wanted = variable_batch["variables"]
+            gaps = [
+                p["place_fips"]
+                for p in s["places"]
+                if (state_fips, "place", p["place_fips"], key) not in done
+                and not stored.get(int(p["place_fips"]), set()).issuperset(wanted)
+            ]
+            if not gaps:
+                continue
+            if fetch_mode == "wildcard" and len(gaps) > DELTA_PER_PLACE_MAX_GAPS:
+                gaps = [WILDCARD]
+            for place_fips in gaps:
+                yield {
+                    "batch": variable_batch,
+                    "state_fips": state_fips,
+                    "county_fips": None,
+                    "place_fips": place_fips,
+                    "stored": stored,
+                }
+
+
 async def estimate_worker(
     dataset: dict,
     year: int,
@@ -449,153 +1191,1127 @@ async def estimate_worker(
     place_fips: Optional[str],
     county_fips: Optional[str],
     state_fips: Optional[str],
-    estimates_repo: CensusEstimateRepository,
-    year_repo: YearsAvailableRepository,
-    semaphore: asyncio.Semaphore,
+    writer: BatchWriter,
+    year_id: int,
+    group: Optional[str] = None,
+    unit: Optional[Dict] = None,
+    stored: Optional[Dict[int, Set[str]]] = None,
+    parts: Optional[List[Dict]] = None,
+    level: str = "place",
 ):
     """
-    Fetch estimate for a given geography and variable batch, then insert into DB.
-    This function is safe to call many times concurrently; concurrency is controlled by `semaphore`.
+    Fetch estimate for a given geography and variable batch and hand the rows
+    to the writer stage, keyed by (dataset_id, year_id, level) so each level
+    is written to its own table. Concurrency is bounded by the WorkerPool that calls
+    it; `writer.put` blocks while the DB is behind. Failures are logged here
+    and re-raised so the pool can count them.
+
+    `stored` ({place_fips: {variable_id}}) drops rows already in the
+    database, so delta jobs never insert duplicates. `parts` fetches the
+    batch as several smaller requests ({"group", "variables"} each) whose
+    rows are written together, as one unit.
     """
-    async with semaphore:
-        try:
-            estimates_resp = await retry_async_call(
+    parts = parts or [{"group": group, "variables": variable_batch}]
+    try:
+        estimates = []
+        for part in parts:
+            estimates_resp = await retry_async(
                 get_estimates,
-                NETWORK_EXECUTOR,
                 dataset["frequency"],
                 year,
-                variable_batch,
+                part["variables"],
                 state_fips=state_fips,
                 place_fips=place_fips,
                 county_fips=county_fips,
+                group=part["group"],
+                margins=FETCH_MARGINS,
+                tract=WILDCARD if level == "tract" else None,
+                block_group=WILDCARD if level == "block_group" else None,
             )
-            estimates = estimates_resp.get("estimates", estimates_resp)
+            estimates.extend(estimates_resp.get("estimates", estimates_resp))
+        # Entries carry the FIPS of their own row (wildcard responses span
+        # many geographies); the job's FIPS only fill in what is missing.
+        estimates = [
+            {
+                **e,
+                "place_fips": e.get("place_fips") or place_fips,
+                "state_fips": e.get("state_fips") or state_fips,
+                "county_fips": e.get("county_fips") or county_fips,
+            }
+            for e in estimates
+        ]
+        if stored:
             estimates = [
-                {
-                    **e,
-                    "place_fips": place_fips,
-                    "state_fips": state_fips,
-                    "county_fips": county_fips,
-                }
+                e
                 for e in estimates
+                if e["place_fips"] is None
+                or e["variable"] not in stored.get(int(e["place_fips"]), ())
             ]
-            dataset_id = dataset["id"]
-            year_id = year_repo.get_years(dataset_id=dataset_id, year=year)[0]["id"]
+        token = None if unit is None else {**unit, "rows": len(estimates)}
+        await writer.put((dataset["id"], year_id, level), estimates, token)
+        logger.debug(
+            f"[EST] Queued {len(estimates)} estimates for place={place_fips} county={county_fips} state={state_fips} var_count={len(variable_batch)}"
+        )
+    except Exception as e:
+        logger.exception(
+            f"[EST][ERROR] Failed {level} estimate for place={place_fips} county={county_fips} state={state_fips} vars={len(variable_batch)}: {e}"
+        )
+        raise
+
+
+def error_class(error: BaseException) -> str:
+    """Name of the innermost exception (the services wrap Census errors)."""
+    while (error.__cause__ or error.__context__) is not None:
+        error = error.__cause__ or error.__context__
+    return type(error).__name__
+
+
+def request_url(dataset: dict, year: int, job: Dict) -> str:
+    """The job's Census request as the response cache keys it (no API key)."""
+    return normalize_url(
+        estimate_url(
+            dataset["frequency"],
+            year,
+            job["batch"]["variables"],
+            state_fips=job["state_fips"],
+            place_fips=job["place_fips"],
+            county_fips=job["county_fips"],
+            api_key="",
+            group=job["batch"]["group"],
+            margins=FETCH_MARGINS,
+            tract=WILDCARD if job_level(job) == "tract" else None,
+            block_group=WILDCARD if job_level(job) == "block_group" else None,
+        )
+    )
+
+
+def batch_groups(variable_batch: Dict) -> List[str]:
+    """Tables a variable batch covers (packed batches may span several)."""
+    if variable_batch["group"]:
+        return [variable_batch["group"]]
+    return sorted({v.split("_")[0] for v in variable_batch["variables"]})
+
+
+def split_batch(variable_batch: Dict, size: int) -> List[Dict]:
+    """
+    Explicit variable requests of at most `size` estimates (each with its
+    margin of error under FETCH_MARGINS) covering a batch.
+    """
+    return [
+        {"group": None, "variables": list(chunk)}
+        for chunk in chunk_list(variable_batch["variables"], size)
+    ]
+
+
+def summarize_failures(
+    units: List[Dict], batches: Dict[str, Dict]
+) -> Dict[str, Dict[str, Dict]]:
+    """
+    Failure rates of work units per state and per group:
+    {"state": {fips: {"units", "failed", "rate"}}, "group": {...}}.
+    """
+    summary: Dict[str, Dict[str, Dict]] = {"state": {}, "group": {}}
+    for unit in units:
+        variable_batch = batches.get(unit["batch_key"])
+        groups = batch_groups(variable_batch) if variable_batch else ["unknown"]
+        keys = [("state", unit["state_fips"])] + [("group", g) for g in groups]
+        for kind, key in keys:
+            counts = summary[kind].setdefault(key, {"units": 0, "failed": 0})
+            counts["units"] += 1
+            counts["failed"] += unit["status"] == "failed"
+    for by_key in summary.values():
+        for counts in by_key.values():
+            counts["rate"] = round(counts["failed"] / counts["units"], 4)
+    return summary
+
+
+def log_failure_summary(summary: Dict[str, Dict[str, Dict]]) -> None:
+    for kind, by_key in summary.items():
+        failing = sorted(
+            ((k, c) for k, c in by_key.items() if c["failed"]),
+            key=lambda kc: -kc[1]["rate"],
+        )
+        for key, counts in failing:
+            logger.warning(
+                f"[EST] Failures {kind}={key}: {counts['failed']}/{counts['units']} units ({counts['rate']:.1%})"
+            )
+
+
+def unit_job(unit: Dict, batches: Dict[str, Dict]) -> Optional[Dict]:
+    """
+    Rebuild the estimate job of a claimed work unit from the variable
+    batches by batch_key; None if the batch is not in this plan.
+    """
+    variable_batch = batches.get(unit["batch_key"])
+    if variable_batch is None:
+        return None
+    level = unit["geo_level"]
+    job = {
+        "batch": variable_batch,
+        "state_fips": unit["state_fips"],
+        "county_fips": None,
+        "place_fips": None,
+    }
+    if level == "place":
+        job["place_fips"] = unit["geo_code"]
+    elif level != "tract":
+        job["county_fips"] = unit["geo_code"]
+    if level in ("tract", "block_group"):
+        job["level"] = level
+    return job
+
+
+async def consume_estimate_units(
+    dataset: dict,
+    year: int,
+    year_id: int,
+    variable_batches: List[Dict],
+    estimates_repo: CensusEstimateRepository,
+    work_unit_repo: WorkUnitRepository,
+    coverage: Optional[Dict[int, Dict[int, Set[str]]]] = None,
+    network_budget: Optional[FairShareLimiter] = None,
+    db_budget: Optional[FairShareLimiter] = None,
+    worker_id: str = WORKER_ID,
+    dead_letter_repo: Optional[DeadLetterRepository] = None,
+    units: Optional[List[Dict]] = None,
+    split: Optional[int] = None,
+    queued: Optional[asyncio.Event] = None,
+    planned: Optional[asyncio.Event] = None,
+) -> Dict:
+    """
+    Work the shared queue of pending units of a dataset year until none is
+    left: claim QUEUE_CLAIM_SIZE units at a time, run them through a
+    WorkerPool of NETWORK_CONCURRENCY workers and a BatchWriter, and keep
+    their leases alive with a heartbeat. Any number of processes can do
+    this at once; each unit is claimed by one of them. When nothing is
+    claimable but units are still pending (leased by this or another
+    process), it polls every QUEUE_POLL_SECONDS. Returns the pool stats.
+
+    `coverage` (delta mode) drops rows already stored from place jobs.
+    Failed units are marked failed in the ledger and, with a
+    `dead_letter_repo`, recorded with their error class and request URL.
+    Given `units`, runs exactly those instead of claiming (the retry pass),
+    each batch split into requests of at most `split` variables if set.
+
+    While units are still being planned, an empty queue does not end the
+    run: it stops only once `planned` is set. The planner sets `queued`
+    whenever it adds units, which wakes an idle claim loop at once instead
+    of after QUEUE_POLL_SECONDS.
+    """
+    dataset_id = dataset["id"]
+    batches = {batch_key(b): b for b in variable_batches}
+    held: Dict[str, int] = {}  # lease token -> units not finished yet
+    lease_of: Dict[Tuple[str, str, str, str], str] = {}
+    lost: Set[Tuple[str, str, str, str]] = set()  # leases taken by others
+
+    def finish(units: List[Dict]):
+        for unit in units:
+            token = lease_of.pop(unit_id(unit), None)
+            if token is None:
+                continue
+            held[token] -= 1
+            if not held[token]:
+                del held[token]
+
+    async def fail(
+        units: List[Dict],
+        stage: str,
+        error: Exception,
+        tries: int,
+        url: Optional[str] = None,
+    ):
+        try:
             await arun(
-                estimates_repo.insert_estimates,
+                work_unit_repo.mark_failed,
                 DB_EXECUTOR,
-                estimates=estimates,
-                dataset_id=dataset_id,
-                year_id=year_id,
+                dataset_id,
+                year,
+                units,
+                str(error),
             )
-            logger.debug(
-                f"[EST] Inserted {len(estimates)} estimates for place={place_fips} county={county_fips} state={state_fips} var_count={len(variable_batch)}"
+            if dead_letter_repo is not None:
+                await arun(
+                    dead_letter_repo.record,
+                    DB_EXECUTOR,
+                    dataset_id,
+                    year,
+                    [
+                        {
+                            **u,
+                            "group_id": (
+                                ",".join(batch_groups(batches[u["batch_key"]]))[
+                                    :255
+                                ]
+                                if u["batch_key"] in batches
+                                else None
+                            ),
+                        }
+                        for u in units
+                    ],
+                    stage,
+                    error_class(error),
+                    str(error),
+                    tries=tries,
+                    url=url,
+                )
+        except Exception as e:
+            logger.exception(f"[EST] Could not record {len(units)} failed units: {e}")
+        finally:
+            finish(units)
+
+    def write_estimates(
+        rows: List[Dict], units: List[Dict], batch_year_id: int, level: str
+    ):
+        # rows and their units' "done" mark commit together. Units whose
+        # lease another process has taken over are its to write: their rows
+        # are dropped here instead of failing the whole batch on duplicates
+        units = [{**u, "lease_owner": lease_of.get(unit_id(u))} for u in units]
+        with estimates_repo.db_client.session_scope() as session:
+            held = work_unit_repo.held_units(dataset_id, year, units, session=session)
+            if len(held) < len(units):
+                rows = rows_of_units(rows, units, held)
+                logger.warning(
+                    f"[QUEUE] Dropping {len(units) - len(held)} units no longer leased to {worker_id} from a {level} batch"
+                )
+                units = held
+            if level in ("tract", "block_group"):
+                estimates_repo.insert_small_area_estimates(
+                    level=level,
+                    estimates=rows,
+                    dataset_id=dataset_id,
+                    year_id=batch_year_id,
+                    session=session,
+                )
+            else:
+                estimates_repo.insert_estimates(
+                    estimates=rows,
+                    dataset_id=dataset_id,
+                    year_id=batch_year_id,
+                    session=session,
+                )
+            marked = work_unit_repo.mark_done(dataset_id, year, units, session=session)
+            if marked < len(units):
+                # a lease was taken between the check and the mark: roll
+                # back; the retry drops that unit
+                raise RuntimeError(
+                    f"{len(units) - marked} of {len(units)} units lost their lease while writing"
+                )
+
+    async def write_limited(
+        rows: List[Dict], units: List[Dict], batch_year_id: int, level: str
+    ):
+        async with WRITE_CONTROL.slot():
+            await arun(write_estimates, DB_EXECUTOR, rows, units, batch_year_id, level)
+
+    async def write_batch(
+        key: Tuple[str, int, str], rows: List[Dict], units: List[Dict]
+    ):
+        try:
+            await retry_async(write_limited, rows, units, key[1], key[2])
+        except Exception as e:
+            await fail(units, "write", e, tries=MAX_RETRIES + 1)
+            raise
+        finish(units)
+
+    writer = BatchWriter(
+        write_batch,
+        batch_rows=WRITE_BATCH_ROWS,
+        max_delay=WRITE_FLUSH_SECONDS,
+        queue_size=WRITE_QUEUE_SIZE,
+        writers=DB_WRITERS,
+        name=f"DB {dataset_id}/{year}",
+        budget=db_budget,
+        tenant=(dataset_id, year),
+    ).start()
+
+    async def run_job(job: Dict):
+        unit = job_unit(job)
+        if unit_id(unit) in lost:
+            return
+        try:
+            await estimate_worker(
+                dataset=dataset,
+                year=year,
+                variable_batch=job["batch"]["variables"],
+                group=job["batch"]["group"],
+                place_fips=job["place_fips"],
+                county_fips=job["county_fips"],
+                state_fips=job["state_fips"],
+                writer=writer,
+                year_id=year_id,
+                unit=unit,
+                stored=job.get("stored"),
+                parts=job.get("parts"),
+                level=job_level(job),
             )
         except Exception as e:
-            logger.exception(
-                f"[EST][ERROR] Failed estimate for place={place_fips} county={county_fips} state={state_fips} vars={len(variable_batch)}: {e}"
+            tries = (MAX_RETRIES + 1) * len(job.get("parts") or [None])
+            await fail([unit], "fetch", e, tries=tries, url=request_url(dataset, year, job))
+            raise
+
+    async def unit_jobs(units: List[Dict]) -> List[Dict]:
+        jobs, unknown = [], []
+        for unit in units:
+            job = unit_job(unit, batches)
+            if job is None:
+                unknown.append(unit)
+                continue
+            if coverage is not None and job_level(job) == "place":
+                job["stored"] = coverage.get(int(job["state_fips"]), {})
+            if split:
+                job["parts"] = split_batch(job["batch"], split)
+            jobs.append(job)
+        if unknown:
+            await fail(
+                unknown,
+                "plan",
+                LookupError("variable batch not in this process's plan"),
+                tries=0,
             )
+        return jobs
+
+    async def claimed_jobs():
+        if units is not None:
+            for job in await unit_jobs(units):
+                yield job
+            return
+        while True:
+            # read before claiming: once planning is over, an empty claim
+            # and no pending units really mean the queue is drained
+            final = planned is None or planned.is_set()
+            if queued is not None:
+                queued.clear()
+            claimed = await arun(
+                work_unit_repo.claim,
+                DB_EXECUTOR,
+                dataset_id,
+                year,
+                worker_id,
+                QUEUE_CLAIM_SIZE,
+                QUEUE_LEASE_SECONDS,
+            )
+            if not claimed:
+                pending = await arun(
+                    work_unit_repo.count_units, DB_EXECUTOR, dataset_id, year, "pending"
+                )
+                if not pending and final:
+                    return
+                if queued is None:
+                    await asyncio.sleep(QUEUE_POLL_SECONDS)
+                else:
+                    try:
+                        await asyncio.wait_for(queued.wait(), QUEUE_POLL_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                continue
+            held[claimed[0]["lease_owner"]] = len(claimed)
+            for unit in claimed:
+                lease_of[unit_id(unit)] = unit["lease_owner"]
+            for job in await unit_jobs(claimed):
+                yield job
+
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(QUEUE_HEARTBEAT_SECONDS)
+            if not held:
+                continue
+            try:
+                extended = await arun(
+                    work_unit_repo.heartbeat,
+                    DB_EXECUTOR,
+                    list(held),
+                    QUEUE_LEASE_SECONDS,
+                )
+                if extended < sum(held.values()):
+                    await drop_lost_leases()
+            except Exception as e:
+                logger.warning(f"[QUEUE] Lease heartbeat failed: {e}")
+
+    async def drop_lost_leases():
+        # fewer leases extended than held: some expired and were claimed by
+        # another process, which now runs them; stop fetching them here
+        leased = [
+            {**dict(zip(UNIT_ID_FIELDS, uid)), "lease_owner": token}
+            for uid, token in lease_of.items()
+        ]
+        taken = await arun(
+            work_unit_repo.lost_units, DB_EXECUTOR, dataset_id, year, leased
+        )
+        if taken:
+            logger.warning(
+                f"[QUEUE] {worker_id} lost the lease of {len(taken)} units to another process"
+            )
+            lost.update(unit_id(u) for u in taken)
+            finish(taken)
+
+    pool = WorkerPool(
+        run_job,
+        concurrency=NETWORK_CONCURRENCY,
+        queue_size=ESTIMATE_QUEUE_SIZE,
+        name=f"EST {dataset_id}/{year}",
+        report_every=POOL_REPORT_SECONDS,
+        budget=network_budget,
+        tenant=(dataset_id, year),
+    )
+    start = time.perf_counter()
+    beat = asyncio.create_task(heartbeat())
+    try:
+        try:
+            stats = await pool.run(claimed_jobs())
+        finally:
+            write_stats = await writer.close()
+    finally:
+        beat.cancel()
+        if held:
+            # interrupted: let other processes take what we still hold
+            await arun(work_unit_repo.release, DB_EXECUTOR, list(held))
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"[EST] {worker_id} completed {stats['completed']}/{stats['submitted']} estimate jobs ({stats['failed']} failed) in {elapsed:.2f}s, pool utilization {stats['utilization']:.0%}"
+    )
+    logger.info(f"[DB] Estimate writer stats: {write_stats}")
+    return stats
+
+
+async def load_plan_inputs(
+    dataset_id: str,
+    year: int,
+    year_id: int,
+    estimates_repo: CensusEstimateRepository,
+    work_unit_repo: WorkUnitRepository,
+    delta: bool = DELTA_INGEST,
+) -> Tuple[Set[Tuple[str, str, str, str]], Optional[Dict[int, Dict[int, Set[str]]]]]:
+    """
+    What estimate planning reads from the database, once per dataset year:
+    the ids of done work units and, with `delta`, the stored coverage.
+    """
+    done_units = await arun(
+        work_unit_repo.get_units, DB_EXECUTOR, dataset_id, year, "done"
+    )
+    coverage = None
+    if delta:
+        coverage = await arun(
+            load_estimate_coverage, DB_EXECUTOR, estimates_repo, dataset_id, year_id
+        )
+    return {unit_id(u) for u in done_units}, coverage
+
+
+def plan_jobs(
+    geography: List[Dict],
+    variable_batches: List[Dict],
+    done: Set[Tuple[str, str, str, str]],
+    coverage: Optional[Dict[int, Dict[int, Set[str]]]] = None,
+    place_only: bool = True,
+    fetch_mode: str = ESTIMATE_FETCH_MODE,
+    levels: Tuple[str, ...] = (),
+) -> List[Dict]:
+    """
+    The estimate jobs of `geography` still to run: every (geography, batch)
+    whose unit is not done, or given `coverage` only the gaps in the stored
+    estimates (see `iter_delta_jobs`). Tract and block group jobs of
+    `levels` are planned from the done units alone.
+    """
+    if coverage is None:
+        jobs = iter_estimate_jobs(
+            geography,
+            variable_batches,
+            place_only=place_only,
+            fetch_mode=fetch_mode,
+        )
+    else:
+        jobs = iter_delta_jobs(
+            geography,
+            variable_batches,
+            coverage,
+            done,
+            place_only=place_only,
+            fetch_mode=fetch_mode,
+        )
+    small_area_jobs = (
+        job
+        for job in iter_small_area_jobs(geography, variable_batches, levels)
+        if unit_id(job_unit(job)) not in done
+    )
+    if coverage is None:
+        jobs = (job for job in jobs if unit_id(job_unit(job)) not in done)
+    return [*jobs, *small_area_jobs]
+
+
+async def plan_estimate_jobs(
+    dataset_id: str,
+    year: int,
+    year_id: int,
+    variable_batches: List[Dict],
+    geography: List[Dict],
+    estimates_repo: CensusEstimateRepository,
+    work_unit_repo: WorkUnitRepository,
+    place_only: bool = True,
+    fetch_mode: str = ESTIMATE_FETCH_MODE,
+    delta: bool = DELTA_INGEST,
+    levels: Tuple[str, ...] = (),
+) -> Tuple[List[Dict], Optional[Dict[int, Dict[int, Set[str]]]]]:
+    """
+    The estimate jobs still to run for a dataset year, without network
+    calls (see `plan_jobs`). Returns the jobs and, in delta mode, the
+    coverage they were planned from.
+    """
+    done, coverage = await load_plan_inputs(
+        dataset_id, year, year_id, estimates_repo, work_unit_repo, delta=delta
+    )
+    jobs = plan_jobs(
+        geography,
+        variable_batches,
+        done,
+        coverage,
+        place_only=place_only,
+        fetch_mode=fetch_mode,
+        levels=levels,
+    )
+    if coverage is not None:
+        wildcard_jobs = sum(1 for j in jobs if j["place_fips"] == WILDCARD)
+        full = sum(
+            1
+            for _ in iter_estimate_jobs(
+                geography,
+                variable_batches,
+                place_only=place_only,
+                fetch_mode=fetch_mode,
+            )
+        )
+        logger.info(
+            f"[EST] Delta plan: {sum(map(len, coverage.values()))} places already have estimates; {len(jobs)} jobs ({wildcard_jobs} wildcard, {len(jobs) - wildcard_jobs} other) instead of {full}"
+        )
+    return jobs, coverage
 
 
 async def stream_and_run_estimates(
     dataset: dict,
     year: int,
     variables_by_group: Dict[str, List[str]],
-    geography: List[Dict],
+    geography: Union[List[Dict], AsyncIterable[Dict]],
     estimates_repo: CensusEstimateRepository,
     year_repo: YearsAvailableRepository,
+    work_unit_repo: WorkUnitRepository,
     place_only: bool = True,
-):
+    fetch_mode: str = ESTIMATE_FETCH_MODE,
+    network_budget: Optional[FairShareLimiter] = None,
+    db_budget: Optional[FairShareLimiter] = None,
+    delta: bool = DELTA_INGEST,
+    dead_letter_repo: Optional[DeadLetterRepository] = None,
+) -> int:
     """
-    Stream jobs (place or county) and run them with limited concurrency.
-    Each job is a (variable_batch, place_fips, county_fips, state_fips) triple.
+    Plan the estimate jobs (place or county) of a dataset year, register
+    them as work units, then work the queue (see consume_estimate_units)
+    alongside any `--worker` processes. Workers hold at most a bounded
+    queue of jobs each and pick up the next as soon as they are free, so
+    one slow or retrying request never idles the other slots.
+
+    `geography` may be an async iterable of states (e.g. a Channel fed by
+    the geography stage): each state's units are planned and queued as it
+    arrives, and the queue is worked meanwhile, so the first estimates are
+    fetched while later states are still loading and no more than the
+    stream's buffer of states is held at once. Queued units are claimed by
+    priority, largest places first (see load_place_weights).
+
+    Fetchers only decode; rows go to a BatchWriter that inserts them in
+    batches of WRITE_BATCH_ROWS (or every WRITE_FLUSH_SECONDS).
+
+    Units already done are never claimed, failed ones are retried, and a
+    unit is marked done in the same transaction as its rows, so an
+    interrupted run resumes with exactly the outstanding units. Failures
+    go to `dead_letter_repo` and are summarized per state and group.
+    Returns the number of units still not done.
+
+    When several ingests run at once, `network_budget` and `db_budget` cap
+    their combined in-flight requests and DB writes (see FairShareLimiter).
+
+    With `delta`, the stored estimates are read first and only their gaps
+    are planned (see `iter_delta_jobs`).
     """
-    # prepare all variable batches across all groups (flat list of lists)
-    all_variable_batches: List[List[str]] = []
-    for gid, variables in variables_by_group.items():
-        var_ids = [v["variable_id"] for v in variables]
-        for batch in chunk_list(var_ids, VARS_PER_REQUEST):
-            all_variable_batches.append(list(batch))
+    if fetch_mode not in ("wildcard", "per_geography"):
+        raise ValueError(f"Unknown estimate fetch mode: {fetch_mode}")
+    # prepare all variable requests across all groups (explicit batches or group())
+    all_variable_batches = plan_variable_requests(variables_by_group)
+    group_requests = sum(1 for b in all_variable_batches if b["group"])
 
     logger.info(
-        f"[EST] Prepared {len(all_variable_batches)} variable batches across groups (VARS_PER_REQUEST={VARS_PER_REQUEST})"
-    )
-
-    # prepare semaphore for network calls
-    sem = asyncio.Semaphore(NETWORK_CONCURRENCY)
-
-    # streaming: create worker tasks in limited windows to avoid out of memory error
-    # create batches of jobs and await them;
-    window_size = NETWORK_CONCURRENCY * 2  # at most double concurrent
-    pending_tasks: List[asyncio.Task] = []
-
-    async def schedule_job(variable_batch, place_fips, county_fips, state_fips):
-        return await estimate_worker(
-            dataset=dataset,
-            year=year,
-            variable_batch=variable_batch,
-            place_fips=place_fips,
-            county_fips=county_fips,
-            state_fips=state_fips,
-            estimates_repo=estimates_repo,
-            year_repo=year_repo,
-            semaphore=sem,
-        )
-
-    def enqueue_and_maybe_wait(task_coro):
-        t = asyncio.create_task(task_coro)
-        pending_tasks.append(t)
-        # throttle: if pending grows, wait for some to finish
-        if len(pending_tasks) >= window_size:
-            return asyncio.gather(*pending_tasks)
-        return None
+        f"[EST] Prepared {len(all_variable_batches)} variable batches across groups ({group_requests} group() requests, VARS_PER_REQUEST={VARS_PER_REQUEST}, mode={fetch_mode})"
+    )
 
-    # iterate geography and schedule jobs
-    submitted = 0
-    start = time.perf_counter()
-    for s in geography:
-        state_fips = s["state_fips"]
-        # counties
-        if not place_only:
-            for c in s["counties"]:
-                county_fips = c["county_fips"]
-                for variable_batch in all_variable_batches:
-                    coro = schedule_job(
-                        variable_batch=variable_batch,
-                        place_fips=None,
-                        county_fips=county_fips,
-                        state_fips=state_fips,
-                    )
-                    maybe = enqueue_and_maybe_wait(coro)
-                    submitted += 1
-                    if maybe is not None:
-                        # wait for window to finish
-                        await maybe
-                        pending_tasks.clear()
-        # places
-        for p in s["places"]:
-            place_fips = p["place_fips"]
-            for variable_batch in all_variable_batches:
-                coro = schedule_job(
-                    variable_batch=variable_batch,
-                    place_fips=place_fips,
-                    county_fips=None,
-                    state_fips=state_fips,
+    dataset_id = dataset["id"]
+    year_id = year_repo.get_years(dataset_id=dataset_id, year=year)[0]["id"]
+    levels = small_area_levels(dataset)
+
+    done, coverage = await load_plan_inputs(
+        dataset_id, year, year_id, estimates_repo, work_unit_repo, delta=delta
+    )
+    weights = await arun(
+        load_place_weights, DB_EXECUTOR, estimates_repo, year_repo, dataset_id, year
+    )
+    logger.info(f"[EST] Claim priority: {len(weights)} places weighted")
+    requeued = await arun(work_unit_repo.requeue_failed, DB_EXECUTOR, dataset_id, year)
+    # pending units of an older plan (other batches, or gaps since filled)
+    # would fetch the same rows twice; they are dropped state by state
+    stale_by_state: Dict[str, List[Dict]] = {}
+    for u in await arun(
+        work_unit_repo.get_units, DB_EXECUTOR, dataset_id, year, "pending"
+    ):
+        stale_by_state.setdefault(u["state_fips"], []).append(u)
+
+    planned_ids: Set[Tuple[str, str, str, str]] = set()
+    queued = asyncio.Event()
+    planned = asyncio.Event()
+    counts = {"states": 0, "added": 0, "wildcard": 0}
+
+    async def states() -> AsyncIterator[Dict]:
+        if hasattr(geography, "__aiter__"):
+            async for state in geography:
+                yield state
+        else:
+            for state in geography:
+                yield state
+
+    async def plan_states():
+        try:
+            async for state in states():
+                jobs = plan_jobs(
+                    [state],
+                    all_variable_batches,
+                    done,
+                    coverage,
+                    place_only=place_only,
+                    fetch_mode=fetch_mode,
+                    levels=levels,
+                )
+                units = prioritized_units(jobs, state, weights)
+                ids = {unit_id(u) for u in units}
+                planned_ids.update(ids)
+                stale = [
+                    u
+                    for u in stale_by_state.pop(state["state_fips"], [])
+                    if unit_id(u) not in ids
+                ]
+                await arun(
+                    work_unit_repo.drop_pending, DB_EXECUTOR, dataset_id, year, stale
+                )
+                counts["added"] += await arun(
+                    work_unit_repo.add_units, DB_EXECUTOR, dataset_id, year, units
                 )
-                maybe = enqueue_and_maybe_wait(coro)
-                submitted += 1
-                if maybe is not None:
-                    await maybe
-                    pending_tasks.clear()
+                counts["states"] += 1
+                counts["wildcard"] += sum(
+                    1 for j in jobs if j["place_fips"] == WILDCARD
+                )
+                queued.set()
+            # states the geography no longer has
+            leftover = [u for units in stale_by_state.values() for u in units]
+            await arun(
+                work_unit_repo.drop_pending, DB_EXECUTOR, dataset_id, year, leftover
+            )
+        finally:
+            planned.set()
+            queued.set()
+        pending = await arun(
+            work_unit_repo.count_units, DB_EXECUTOR, dataset_id, year, "pending"
+        )
+        logger.info(
+            f"[EST] Work units: {len(planned_ids)} planned over {counts['states']} states ({counts['added']} new, {counts['wildcard']} wildcard, {requeued} failed requeued), {pending} pending in the queue"
+            + (
+                f"; {sum(map(len, coverage.values()))} places already had estimates"
+                if coverage is not None
+                else ""
+            )
+        )
+
+    planner = asyncio.create_task(plan_states())
+    consumer = asyncio.create_task(
+        consume_estimate_units(
+            dataset,
+            year,
+            year_id,
+            all_variable_batches,
+            estimates_repo,
+            work_unit_repo,
+            coverage=coverage,
+            network_budget=network_budget,
+            db_budget=db_budget,
+            dead_letter_repo=dead_letter_repo,
+            queued=queued,
+            planned=planned,
+        )
+    )
+    try:
+        await planner
+    except BaseException:
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        raise
+    await consumer
+
+    all_units = await arun(work_unit_repo.get_units, DB_EXECUTOR, dataset_id, year)
+    finished = {unit_id(u) for u in all_units if u["status"] == "done"}
+    remaining = len(planned_ids - finished)
+    if remaining:
+        log_failure_summary(
+            summarize_failures(
+                all_units, {batch_key(b): b for b in all_variable_batches}
+            )
+        )
+        logger.warning(
+            f"[EST] {remaining} work units outstanding for dataset={dataset_id} year={year}; rerun to resume or retry failed units with --retry-failed"
+        )
+    return remaining
 
-    # wait for any leftover tasks
-    if pending_tasks:
-        await asyncio.gather(*pending_tasks)
 
-    elapsed = time.perf_counter() - start
+async def run_queue_worker(
+    dataset: dict,
+    year: int,
+    *,
+    variables_repo: VariablesRepository,
+    geo_repo: GeographyRepository,
+    estimates_repo: CensusEstimateRepository,
+    year_repo: YearsAvailableRepository,
+    checkpoint_repo: CheckpointRepository,
+    work_unit_repo: WorkUnitRepository,
+    network_budget: Optional[FairShareLimiter] = None,
+    db_budget: Optional[FairShareLimiter] = None,
+    delta: bool = DELTA_INGEST,
+    dead_letter_repo: Optional[DeadLetterRepository] = None,
+):
+    """
+    Extra worker process for a dataset year (`--worker`): waits until the
+    main ingest has stored the variables and queued estimate units (it
+    queues them state by state while geography still loads), then claims
+    and runs units from the shared queue. It never runs the metadata stages
+    or plans units itself.
+    """
+    dataset_id = dataset["id"]
+    year_id = None
+    variable_batches: List[Dict] = []
+    while True:
+        checkpoint = await arun(
+            checkpoint_repo.get_or_create, DB_EXECUTOR, dataset_id, year
+        )
+        if checkpoint["estimates_ingested"]:
+            logger.info(f"[QUEUE] dataset={dataset_id} year={year} already ingested")
+            return
+        if not checkpoint["variables_ingested"]:
+            await asyncio.sleep(QUEUE_POLL_SECONDS)
+            continue
+        pending = await arun(
+            work_unit_repo.count_units, DB_EXECUTOR, dataset_id, year, "pending"
+        )
+        if not pending:
+            total = await arun(
+                work_unit_repo.count_units, DB_EXECUTOR, dataset_id, year
+            )
+            if total and checkpoint["geography_ingested"]:
+                logger.info(f"[QUEUE] No pending units for {dataset_id}/{year}")
+                return
+            # more states may still be queued by the main ingest
+            await asyncio.sleep(QUEUE_POLL_SECONDS)
+            continue
+
+        if year_id is None:
+            year_id = year_repo.get_years(dataset_id=dataset_id, year=year)[0]["id"]
+            variables_by_group = await arun(
+                variables_repo.get_variables_by_group,
+                DB_EXECUTOR,
+                dataset_id,
+                year_id,
+            )
+            variable_batches = plan_variable_requests(variables_by_group)
+        coverage = None
+        if delta:
+            coverage = await arun(
+                load_estimate_coverage,
+                DB_EXECUTOR,
+                estimates_repo,
+                dataset_id,
+                year_id,
+            )
+        await consume_estimate_units(
+            dataset,
+            year,
+            year_id,
+            variable_batches,
+            estimates_repo,
+            work_unit_repo,
+            coverage=coverage,
+            network_budget=network_budget,
+            db_budget=db_budget,
+            dead_letter_repo=dead_letter_repo,
+        )
+
+
+async def retry_failed_estimates(
+    dataset: dict,
+    year: int,
+    *,
+    variables_repo: VariablesRepository,
+    estimates_repo: CensusEstimateRepository,
+    year_repo: YearsAvailableRepository,
+    checkpoint_repo: CheckpointRepository,
+    work_unit_repo: WorkUnitRepository,
+    dead_letter_repo: Optional[DeadLetterRepository] = None,
+    split: Optional[int] = None,
+    network_budget: Optional[FairShareLimiter] = None,
+    db_budget: Optional[FairShareLimiter] = None,
+) -> int:
+    """
+    Retry pass (`--retry-failed`): run only the units the ledger holds as
+    failed, once each, optionally as explicit requests of at most `split`
+    variables (e.g. when a whole-table request keeps timing out). Rows
+    already stored are skipped. Marks estimates ingested once nothing is
+    outstanding and returns the number of units still failed.
+    """
+    dataset_id = dataset["id"]
+    failed = await arun(
+        work_unit_repo.get_units, DB_EXECUTOR, dataset_id, year, "failed"
+    )
+    if not failed:
+        logger.info(f"[RETRY] No failed units for dataset={dataset_id} year={year}")
+        return 0
+    year_id = year_repo.get_years(dataset_id=dataset_id, year=year)[0]["id"]
+    variables_by_group = await arun(
+        variables_repo.get_variables_by_group, DB_EXECUTOR, dataset_id, year_id
+    )
+    variable_batches = plan_variable_requests(variables_by_group)
+    coverage = await arun(
+        load_estimate_coverage, DB_EXECUTOR, estimates_repo, dataset_id, year_id
+    )
+    logger.info(
+        f"[RETRY] Retrying {len(failed)} failed units for dataset={dataset_id} year={year}"
+        + (f" in requests of at most {split} variables" if split else "")
+    )
+    await consume_estimate_units(
+        dataset,
+        year,
+        year_id,
+        variable_batches,
+        estimates_repo,
+        work_unit_repo,
+        coverage=coverage,
+        network_budget=network_budget,
+        db_budget=db_budget,
+        dead_letter_repo=dead_letter_repo,
+        units=failed,
+        split=split,
+    )
+
+    all_units = await arun(work_unit_repo.get_units, DB_EXECUTOR, dataset_id, year)
+    summary = summarize_failures(
+        all_units, {batch_key(b): b for b in variable_batches}
+    )
+    log_failure_summary(summary)
+    still_failed = sum(1 for u in all_units if u["status"] == "failed")
+    logger.info(
+        f"[RETRY] {len(failed) - still_failed}/{len(failed)} failed units recovered for dataset={dataset_id} year={year}"
+    )
+    if all(u["status"] == "done" for u in all_units):
+        checkpoint_repo.mark_completed(dataset_id, year, "estimates_ingested")
+    return still_failed
+
+
+async def hydrate_variables(
+    dataset: dict,
+    year: int,
+    variables_repo: VariablesRepository,
+    year_repo: YearsAvailableRepository,
+) -> Dict[str, List[Dict]]:
+    """variables_by_group of a dataset year, read from CensusVariable."""
+    dataset_id = dataset["id"]
+    year_id = year_repo.get_years(dataset_id=dataset_id, year=year)[0]["id"]
+    variables_by_group = await arun(
+        variables_repo.get_variables_by_group, DB_EXECUTOR, dataset_id, year_id
+    )
+    if ACS_GROUPS:
+        variables_by_group = {
+            gid: vs for gid, vs in variables_by_group.items() if gid in ACS_GROUPS
+        }
+    return variables_by_group
+
+
+async def hydrate_geography(
+    dataset: dict,
+    year: int,
+    geo_repo: GeographyRepository,
+    year_repo: YearsAvailableRepository,
+) -> List[Dict]:
+    """The stored geography tree of a dataset year (see get_geography)."""
+    dataset_id = dataset["id"]
+    year_id = year_repo.get_years(dataset_id=dataset_id, year=year)[0]["id"]
+    return await arun(geo_repo.get_geography, DB_EXECUTOR, dataset_id, year_id)
+
+
+async def hydrate_from_db(
+    dataset: dict,
+    year: int,
+    variables_repo: VariablesRepository,
+    geo_repo: GeographyRepository,
+    year_repo: YearsAvailableRepository,
+) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+    """
+    Rebuild variables_by_group and the geography tree of an already ingested
+    dataset year from CensusVariable/CensusState/CensusCounty/CensusPlace,
+    so a resumed run makes no metadata requests.
+    """
+    variables_by_group = await hydrate_variables(
+        dataset, year, variables_repo, year_repo
+    )
+    geography = await hydrate_geography(dataset, year, geo_repo, year_repo)
     logger.info(
-        f"[EST] Submitted and completed {submitted} estimate jobs in {elapsed:.2f}s"
+        f"[LOAD] Hydrated {sum(map(len, variables_by_group.values()))} variables and {len(geography)} states ({sum(len(s['places']) for s in geography)} places) from the database"
     )
+    return variables_by_group, geography
+
+
+async def estimate_ingest_cost(
+    dataset: dict,
+    year: int,
+    *,
+    variables_repo: VariablesRepository,
+    geo_repo: GeographyRepository,
+    estimates_repo: CensusEstimateRepository,
+    year_repo: YearsAvailableRepository,
+    checkpoint_repo: CheckpointRepository,
+    work_unit_repo: WorkUnitRepository,
+    place_only: bool = True,
+    delta: bool = DELTA_INGEST,
+) -> Dict:
+    """
+    Census requests an ingest of this dataset year would make, worked out
+    from the database alone (`--dry-run`). Metadata stages not yet
+    checkpointed (or with no checkpoint) count as their API calls; estimates
+    are planned exactly as a run would, and nothing is written. If the
+    year's variables or geography are not stored, the nearest stored year
+    of the dataset stands in ("estimated_from"); with none,
+    "estimate_requests" is None.
+    """
+    dataset_id = dataset["id"]
+    # read only: a dry run must not create the checkpoint row
+    checkpoint = await arun(checkpoint_repo.get, DB_EXECUTOR, dataset_id, year) or {
+        "groups_ingested": False,
+        "variables_ingested": False,
+        "geography_ingested": False,
+        "estimates_ingested": False,
+    }
+    report = {
+        "dataset_id": dataset_id,
+        "year": year,
+        "metadata_requests": 0,
+        "variable_batches": None,
+        "estimate_requests": None,
+        "estimated_from": None,
+    }
+    if checkpoint["estimates_ingested"]:
+        report["estimate_requests"] = 0
+        return report
+
+    year_ids = {y["year"]: y["id"] for y in year_repo.get_years(dataset_id=dataset_id)}
+    variables_by_group: Dict[str, List[Dict]] = {}
+    geography: List[Dict] = []
+    if year in year_ids:
+        variables_by_group, geography = await hydrate_from_db(
+            dataset, year, variables_repo, geo_repo, year_repo
+        )
+    if not checkpoint["groups_ingested"] or not checkpoint["variables_ingested"]:
+        report["metadata_requests"] += 2  # groups.json + variables.json
+    levels = small_area_levels(dataset)
+    if not checkpoint["geography_ingested"]:
+        # states, then counties and places (and tracts) per state, and block
+        # groups per county
+        states = len(geography) or ESTIMATED_STATES
+        counties = sum(len(s["counties"]) for s in geography) or ESTIMATED_COUNTIES
+        report["metadata_requests"] += 1 + (2 + ("tract" in levels)) * states
+        if "block_group" in levels:
+            report["metadata_requests"] += counties
+
+    if not variables_by_group or not geography:
+        for other in sorted(year_ids, key=lambda y: abs(y - year)):
+            if other == year:
+                continue
+            variables_by_group, geography = await hydrate_from_db(
+                dataset, other, variables_repo, geo_repo, year_repo
+            )
+            if variables_by_group and geography:
+                report["estimated_from"] = other
+                break
+        else:
+            return report
+
+    variable_batches = plan_variable_requests(variables_by_group)
+    if report["estimated_from"] is not None:
+        jobs = list(iter_estimate_jobs(geography, variable_batches, place_only=place_only))
+        jobs += iter_small_area_jobs(geography, variable_batches, levels)
+    else:
+        jobs, _ = await plan_estimate_jobs(
+            dataset_id,
+            year,
+            year_ids[year],
+            variable_batches,
+            geography,
+            estimates_repo,
+            work_unit_repo,
+            place_only=place_only,
+            delta=delta,
+            levels=levels,
+        )
+    report["variable_batches"] = len(variable_batches)
+    report["estimate_requests"] = len(jobs)
+    return report
+
+
+def print_cost_report(reports: List[Dict]) -> Dict:
+    """
+    Print per dataset year and total request counts, the daily-quota days
+    they need and the projected network time; returns the totals.
+    """
+    limiter = get_rate_limiter()
+    daily_limit = limiter.ledger.daily_limit
+    used_today = limiter.ledger.used(key_id(f"?key={get_census_api_key() or ''}"))
+
+    print(f"{'dataset':<8} {'year':>5} {'batches':>8} {'metadata':>9} {'estimates':>10}")
+    for r in reports:
+        batches = "?" if r["variable_batches"] is None else r["variable_batches"]
+        estimates = "?" if r["estimate_requests"] is None else r["estimate_requests"]
+        note = f"  (estimated from {r['estimated_from']})" if r["estimated_from"] else ""
+        print(
+            f"{r['dataset_id']:<8} {r['year']:>5} {batches:>8} {r['metadata_requests']:>9} {estimates:>10}{note}"
+        )
+
+    total = sum(r["metadata_requests"] + (r["estimate_requests"] or 0) for r in reports)
+    if daily_limit:
+        remaining_today = max(daily_limit - used_today, 0)
+        over = max(total - remaining_today, 0)
+        quota_days = (1 if total else 0) + -(-over // daily_limit)
+    else:
+        quota_days = 0
+    throughput = min(limiter.rate, FETCH_START / ESTIMATED_REQUEST_SECONDS)
+    network_seconds = total / throughput if throughput else 0.0
+    totals = {
+        "requests": total,
+        "quota_days": quota_days,
+        "network_seconds": round(network_seconds, 1),
+        "unknown": sum(1 for r in reports if r["estimate_requests"] is None),
+    }
+
+    print(f"Total Census requests: {total}")
+    if totals["unknown"]:
+        print(
+            f"  plus estimates of {totals['unknown']} dataset years with no stored metadata to plan from"
+        )
+    if daily_limit:
+        print(
+            f"Daily quota: {daily_limit} ({used_today} used today) -> {quota_days} quota day(s)"
+        )
+    else:
+        print("Daily quota: disabled")
+    runtime = f"{network_seconds / 60:.1f} min of requests at {throughput:.1f} req/s"
+    if quota_days > 1:
+        runtime += f", spread over {quota_days} days by the quota"
+    print(f"Projected runtime: {runtime}")
+    return totals
 
 
 async def run_ingest(
@@ -608,8 +2324,34 @@ async def run_ingest(
     estimates_repo: CensusEstimateRepository,
     year_repo: YearsAvailableRepository,
     checkpoint_repo: CheckpointRepository,
+    work_unit_repo: WorkUnitRepository,
     place_only: bool = True,
+    network_budget: Optional[FairShareLimiter] = None,
+    db_budget: Optional[FairShareLimiter] = None,
+    delta: bool = DELTA_INGEST,
+    dead_letter_repo: Optional[DeadLetterRepository] = None,
+    fingerprint_repo: Optional[FingerprintRepository] = None,
 ):
+    """
+    Ingest a dataset year as a StageGraph of three stages:
+
+    - "variables": groups and variables (from the API, or the database once
+      checkpointed)
+    - "geography": states with their counties and places (and the tracts
+      and block groups of SMALL_AREA_LEVELS), stored one state at a time
+      and streamed to the estimates stage through a Channel of
+      STATE_STREAM_SIZE states
+    - "estimates": after "variables", plans and works each state's units as
+      it comes off the stream
+
+    Variables and geography do not depend on each other and run at once;
+    estimates for a state start as soon as that state is stored, not after
+    the whole country's geography.
+
+    With a `fingerprint_repo` and CHANGE_DETECTION, groups and states that
+    are unchanged since the nearest earlier ingested vintage are linked to
+    this one by copying their rows instead of being written again.
+    """
     dataset_id = dataset["id"]
     logger.info(f"=== START INGEST dataset={dataset_id} year={year} ===")
     t0 = time.perf_counter()
@@ -618,8 +2360,41 @@ async def run_ingest(
     checkpoint = checkpoint_repo.get_or_create(dataset_id, year)
     logger.info(f"Checkpoint state=\n{checkpoint}")
 
+    run_estimates = not checkpoint["estimates_ingested"]
+    levels = small_area_levels(dataset)
+    states = (
+        Channel(STATE_STREAM_SIZE, name=f"STATES {dataset_id}/{year}")
+        if run_estimates
+        else None
+    )
+
+    previous = None
+    if (
+        CHANGE_DETECTION
+        and fingerprint_repo is not None
+        and not (checkpoint["variables_ingested"] and checkpoint["geography_ingested"])
+    ):
+        previous = await load_previous_vintage(
+            dataset, year, fingerprint_repo, year_repo
+        )
+
     # 1) Groups & Variables
-    if not checkpoint["groups_ingested"] or not checkpoint["variables_ingested"]:
+    async def variables_stage() -> Optional[Dict[str, List[Dict]]]:
+        if checkpoint["groups_ingested"] and checkpoint["variables_ingested"]:
+            logger.info("→ Skipping groups & variables ingestion (already completed)")
+            if not run_estimates:
+                return None
+            # rebuild the stage's output from the database instead of
+            # asking the Census API again
+            variables_by_group = await hydrate_variables(
+                dataset, year, variables_repo, year_repo
+            )
+            if variables_by_group:
+                return variables_by_group
+            logger.warning("[LOAD] No variables stored; loading them from the API")
+            variables_by_group, _ = await load_groups_and_variables(dataset, year)
+            return variables_by_group
+
         variables_by_group, groups = await load_groups_and_variables(dataset, year)
 
         # Insert groups & variables to DB (batch)
@@ -631,41 +2406,75 @@ async def run_ingest(
             groups_repo,
             variables_repo,
             year_repo,
+            previous=previous,
+            fingerprint_repo=fingerprint_repo,
         )
 
         # Update checkpoint flags
         checkpoint_repo.mark_completed(dataset_id, year, "groups_ingested")
         checkpoint_repo.mark_completed(dataset_id, year, "variables_ingested")
-    else:
-        logger.info("→ Skipping groups & variables ingestion (already completed)")
+        return variables_by_group
 
     # 2) Geography
-    if not checkpoint["geography_ingested"]:
-        geography = await load_geography_all(dataset, year)
-        await ingest_geography_to_db(dataset, year, geography, geo_repo, year_repo)
+    async def geography_stage():
+        if checkpoint["geography_ingested"]:
+            logger.info("→ Skipping geography ingestion (already completed)")
+            if states is None:
+                return
+            geography = await hydrate_geography(dataset, year, geo_repo, year_repo)
+            if geography:
+                for state in geography:
+                    await states.put(state)
+            else:
+                logger.warning("[LOAD] No geography stored; loading it from the API")
+                async for state in iter_geography(dataset, year, levels):
+                    await states.put(state)
+            await states.close()
+            return
+
+        async for state in iter_geography(dataset, year, levels):
+            await ingest_geography_to_db(
+                dataset,
+                year,
+                [state],
+                geo_repo,
+                year_repo,
+                previous=previous,
+                fingerprint_repo=fingerprint_repo,
+            )
+            if states is not None:
+                await states.put(state)
         checkpoint_repo.mark_completed(dataset_id, year, "geography_ingested")
-    else:
-        logger.info("→ Skipping geography ingestion (already completed)")
+        if states is not None:
+            await states.close()
 
     # 3) Estimates
-    if not checkpoint["estimates_ingested"]:
-        # Make sure variables_by_group and geography are loaded if previous stage skipped
-        if "variables_by_group" not in locals() or "geography" not in locals():
-            variables_by_group, _ = await load_groups_and_variables(dataset, year)
-            geography = await load_geography_all(dataset, year)
-
-        await stream_and_run_estimates(
+    async def estimates_stage(variables: Dict[str, List[Dict]]):
+        remaining = await stream_and_run_estimates(
             dataset,
             year,
-            variables_by_group,
-            geography,
+            variables,
+            states,
             estimates_repo,
             year_repo,
+            work_unit_repo,
             place_only=place_only,
+            network_budget=network_budget,
+            db_budget=db_budget,
+            delta=delta,
+            dead_letter_repo=dead_letter_repo,
         )
-        checkpoint_repo.mark_completed(dataset_id, year, "estimates_ingested")
+        if not remaining:
+            checkpoint_repo.mark_completed(dataset_id, year, "estimates_ingested")
+
+    graph = StageGraph(f"INGEST {dataset_id}/{year}")
+    graph.add("variables", variables_stage)
+    graph.add("geography", geography_stage)
+    if run_estimates:
+        graph.add("estimates", estimates_stage, after=["variables"])
     else:
         logger.info("→ Skipping estimates ingestion (already completed)")
+    await graph.run()
 
     total = time.perf_counter() - t0
     logger.info(
@@ -674,60 +2483,212 @@ async def run_ingest(
 
 
 # -----------------------
-# main entrypoint
+# scheduler
 # -----------------------
-async def main():
-    start_total = time.perf_counter()
-
-    client = get_sql_client()
-    dataset_repo = DatasetRepository(client)
-    groups_repo = GroupsRepository(client)
-    variables_repo = VariablesRepository(client)
-    geo_repo = GeographyRepository(client)
-    estimates_repo = CensusEstimateRepository(client)
-    year_repo = YearsAvailableRepository(client)
-    checkpoint_repo = CheckpointRepository(client)
-
-    for dataset in ACS_DATASETS:
-        logger.info(f"===== START dataset {dataset['id']} =====")
-        try:
-            await arun(
-                dataset_repo.insert_code,
-                DB_EXECUTOR,
-                dataset["code"],
-                dataset["frequency"],
+async def run_scheduled(
+    jobs: List[Tuple[dict, int]],
+    repos: Dict,
+    max_concurrent: int = MAX_CONCURRENT_INGESTS,
+    place_only: bool = True,
+    mode: str = "ingest",
+    split: Optional[int] = None,
+) -> Dict[Tuple[str, int], Optional[BaseException]]:
+    """
+    Run several (dataset, year) ingests at once. At most `max_concurrent`
+    run together; all of them draw from one network budget of
+    NETWORK_CONCURRENCY slots and one DB budget of DB_WRITERS slots, shared
+    by DATASET_WEIGHTS. The daily request quota is already global (one rate
+    limiter per process). A failing ingest is logged and does not stop the
+    others. Returns {(dataset_id, year): exception or None}.
+
+    `mode` "worker" only helps work each pair's estimate queue (see
+    run_queue_worker); "retry" only reruns its failed units, split into
+    requests of at most `split` variables (see retry_failed_estimates).
+    "dry_run" makes no Census request: it prints what an ingest would cost
+    (see estimate_ingest_cost) and returns {(dataset_id, year): report}.
+    """
+    if mode not in ("ingest", "worker", "retry", "dry_run"):
+        raise ValueError(f"Unknown ingest mode: {mode}")
+    if mode == "dry_run":
+        reports = {}
+        for dataset, year in jobs:
+            reports[(dataset["id"], year)] = await estimate_ingest_cost(
+                dataset,
+                year,
+                variables_repo=repos["variable"],
+                geo_repo=repos["geography"],
+                estimates_repo=repos["estimate"],
+                year_repo=repos["year"],
+                checkpoint_repo=repos["checkpoint"],
+                work_unit_repo=repos["work_units"],
+                place_only=place_only,
             )
-        except:
-            pass
-
-        for year in YEARS:
-            logger.info(f"--- START year {year} ---")
+        print_cost_report(list(reports.values()))
+        return reports
+
+    network_budget = FairShareLimiter(NETWORK_CONCURRENCY, name="NET")
+    db_budget = FairShareLimiter(DB_WRITERS, name="DB")
+    for dataset, year in jobs:
+        weight = DATASET_WEIGHTS.get(dataset["id"], 1.0)
+        network_budget.register((dataset["id"], year), weight)
+        db_budget.register((dataset["id"], year), weight)
+
+    running = asyncio.Semaphore(max_concurrent)
+
+    async def run_one(dataset: dict, year: int):
+        async with running:
+            logger.info(f"--- START {dataset['id']} year {year} ---")
+            if mode == "worker":
+                await run_queue_worker(
+                    dataset=dataset,
+                    year=year,
+                    variables_repo=repos["variable"],
+                    geo_repo=repos["geography"],
+                    estimates_repo=repos["estimate"],
+                    year_repo=repos["year"],
+                    checkpoint_repo=repos["checkpoint"],
+                    work_unit_repo=repos["work_units"],
+                    network_budget=network_budget,
+                    db_budget=db_budget,
+                    dead_letter_repo=repos["dead_letters"],
+                )
+                logger.info(f"--- FINISH {dataset['id']} year {year} ---")
+                return
+            if mode == "retry":
+                await retry_failed_estimates(
+                    dataset=dataset,
+                    year=year,
+                    variables_repo=repos["variable"],
+                    estimates_repo=repos["estimate"],
+                    year_repo=repos["year"],
+                    checkpoint_repo=repos["checkpoint"],
+                    work_unit_repo=repos["work_units"],
+                    dead_letter_repo=repos["dead_letters"],
+                    split=split,
+                    network_budget=network_budget,
+                    db_budget=db_budget,
+                )
+                logger.info(f"--- FINISH {dataset['id']} year {year} ---")
+                return
             try:
                 await arun(
-                    year_repo.insert_year,
+                    repos["year"].insert_year,
                     DB_EXECUTOR,
                     dataset_id=dataset["id"],
                     year=year,
                 )
             except:
                 pass
-
             await run_ingest(
                 dataset=dataset,
                 year=year,
-                groups_repo=groups_repo,
-                variables_repo=variables_repo,
-                geo_repo=geo_repo,
-                estimates_repo=estimates_repo,
-                year_repo=year_repo,
-                checkpoint_repo=checkpoint_repo,
-                place_only=True,
+                groups_repo=repos["group"],
+                variables_repo=repos["variable"],
+                geo_repo=repos["geography"],
+                estimates_repo=repos["estimate"],
+                year_repo=repos["year"],
+                checkpoint_repo=repos["checkpoint"],
+                work_unit_repo=repos["work_units"],
+                place_only=place_only,
+                network_budget=network_budget,
+                db_budget=db_budget,
+                dead_letter_repo=repos["dead_letters"],
+                fingerprint_repo=repos["fingerprints"],
+            )
+            logger.info(f"--- FINISH {dataset['id']} year {year} ---")
+
+    results = await asyncio.gather(
+        *(run_one(dataset, year) for dataset, year in jobs), return_exceptions=True
+    )
+    outcome = {}
+    for (dataset, year), result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                f"[SCHED] Ingest dataset={dataset['id']} year={year} failed: {result!r}"
             )
-            logger.info(f"--- FINISH year {year} ---")
+        outcome[(dataset["id"], year)] = result
+    logger.info(f"[SCHED] Network slots granted: {network_budget.stats()}")
+    logger.info(f"[SCHED] DB write slots granted: {db_budget.stats()}")
+    return outcome
+
+
+# -----------------------
+# main entrypoint
+# -----------------------
+async def main(mode: str = "ingest", split: Optional[int] = None):
+    start_total = time.perf_counter()
+
+    client = get_sql_client()
+    dataset_repo = DatasetRepository(client)
+    repos = {
+        "group": GroupsRepository(client),
+        "variable": VariablesRepository(client),
+        "geography": GeographyRepository(client),
+        "estimate": CensusEstimateRepository(client),
+        "year": YearsAvailableRepository(client),
+        "checkpoint": CheckpointRepository(client),
+        "work_units": WorkUnitRepository(client),
+        "dead_letters": DeadLetterRepository(client),
+        "fingerprints": FingerprintRepository(client),
+    }
+
+    if mode != "dry_run":  # a dry run writes nothing
+        for dataset in ACS_DATASETS:
+            try:
+                await arun(
+                    dataset_repo.insert_code,
+                    DB_EXECUTOR,
+                    dataset["code"],
+                    dataset["frequency"],
+                )
+            except:
+                pass
+
+    jobs = [(dataset, year) for dataset in ACS_DATASETS for year in YEARS]
+    await run_scheduled(jobs, repos, place_only=True, mode=mode, split=split)
 
     total_elapsed = time.perf_counter() - start_total
     logger.info(f"[TIMER] Total ingestion runtime: {total_elapsed:.2f} seconds")
+    logger.info(f"[HTTP] Connection stats: {get_async_transport().stats()}")
+    cache = get_response_cache()
+    if cache:
+        logger.info(f"[HTTP] Response cache stats: {cache.stats()}")
+    logger.info(f"[HTTP] Coalesced request stats: {REQUEST_FLIGHT.stats()}")
+    logger.info(f"[AIMD] Fetch control: {FETCH_CONTROL.stats()}")
+    logger.info(f"[AIMD] Write control: {WRITE_CONTROL.stats()}")
+    ledger = get_rate_limiter().ledger
+    logger.info(f"[HTTP] Census requests used today: {ledger.used_today()}")
+    await close_async_transport()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Ingest ACS data into SQL.")
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument(
+        "--worker",
+        action="store_true",
+        help="only claim and run queued estimate units of another ingest run",
+    )
+    modes.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="only rerun estimate units that failed, once each",
+    )
+    modes.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print the Census requests, quota days and runtime an ingest would take",
+    )
+    parser.add_argument(
+        "--split",
+        type=int,
+        default=None,
+        help="with --retry-failed, request at most this many variables at a time",
+    )
+    args = parser.parse_args()
+    mode = (
+        "worker"
+        if args.worker
+        else "retry" if args.retry_failed else "dry_run" if args.dry_run else "ingest"
+    )
+    asyncio.run(main(mode=mode, split=args.split))
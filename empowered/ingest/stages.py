@@ -0,0 +1,134 @@
+import asyncio
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+from empowered.utils.logger_setup import get_logger
+
+logger = get_logger(name=__name__)
+
+_CLOSED = object()
+
+
+class Channel:
+    """
+    Bounded stream of items from one stage to another.
+
+    `put` blocks while `maxsize` items are waiting, so a fast producer is
+    paced by its consumer and never holds more than that in memory. The
+    consumer iterates with `async for` until the producer calls `close`.
+    """
+
+    def __init__(self, maxsize: int = 1, name: str = "CHANNEL") -> None:
+        self.name = name
+        self.sent = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    async def put(self, item: Any) -> None:
+        await self._queue.put(item)
+        self.sent += 1
+
+    async def close(self) -> None:
+        await self._queue.put(_CLOSED)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        while True:
+            item = await self._queue.get()
+            if item is _CLOSED:
+                return
+            yield item
+
+
+class StageGraph:
+    """
+    Run the stages of a pipeline as a DAG: each stage starts as soon as the
+    stages it comes `after` have finished, so independent stages overlap.
+
+    A stage is a coroutine function called with its dependencies' results
+    as keyword arguments (by stage name). Stages that stream data to each
+    other while both run share a Channel instead of a dependency. The first
+    stage to fail cancels every other stage and its error is raised from
+    `run`, so a consumer never waits on a producer that is gone.
+    """
+
+    def __init__(self, name: str = "STAGES") -> None:
+        self.name = name
+        self._stages: Dict[str, Callable[..., Awaitable[Any]]] = {}
+        self._after: Dict[str, List[str]] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        after: Sequence[str] = (),
+    ) -> "StageGraph":
+        """Add a stage; its dependencies must already be added (no cycles)."""
+        if name in self._stages:
+            raise ValueError(f"Stage {name!r} already added")
+        unknown = [dep for dep in after if dep not in self._stages]
+        if unknown:
+            raise ValueError(f"Stage {name!r} depends on unknown stages {unknown}")
+        self._stages[name] = func
+        self._after[name] = list(after)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every stage; return {stage name: result}."""
+        start = time.perf_counter()
+        done: Dict[str, asyncio.Future] = {
+            name: asyncio.get_running_loop().create_future() for name in self._stages
+        }
+
+        async def run_stage(name: str) -> Any:
+            inputs = {dep: await done[dep] for dep in self._after[name]}
+            began = time.perf_counter()
+            logger.info(f"[{self.name}] Stage {name} started at +{began - start:.2f}s")
+            result = await self._stages[name](**inputs)
+            finished = time.perf_counter()
+            self.timings[name] = {
+                "started": round(began - start, 3),
+                "seconds": round(finished - began, 3),
+            }
+            logger.info(
+                f"[{self.name}] Stage {name} finished in {finished - began:.2f}s (+{finished - start:.2f}s)"
+            )
+            done[name].set_result(result)
+            return result
+
+        tasks = {name: asyncio.create_task(run_stage(name)) for name in self._stages}
+        failed: Optional[str] = None
+        try:
+            pending = set(tasks.values())
+            while pending and failed is None:
+                _, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_EXCEPTION
+                )
+                failed = next(
+                    (
+                        name
+                        for name, task in tasks.items()
+                        if task.done() and not task.cancelled() and task.exception()
+                    ),
+                    None,
+                )
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            for future in done.values():
+                if not future.done():
+                    future.cancel()
+        if failed is not None:
+            error = tasks[failed].exception()
+            logger.error(f"[{self.name}] Stage {failed} failed: {error!r}")
+            raise error
+        return {name: task.result() for name, task in tasks.items()}
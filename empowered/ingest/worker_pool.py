@@ -0,0 +1,145 @@
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, Optional, Union
+
+from empowered.ingest.budget import FairShareLimiter
+from empowered.utils.logger_setup import get_logger
+
+logger = get_logger(name=__name__)
+
+_DONE = object()
+
+
+class WorkerPool:
+    """
+    Fixed set of long-lived asyncio workers fed from a bounded queue.
+
+    A producer drains `jobs` lazily into a queue of `queue_size` slots, so
+    only that many jobs are materialized ahead of the workers. Each worker
+    takes the next job as soon as its previous one finishes; a slow or
+    retrying job occupies one slot instead of holding up a whole window.
+
+    Utilization is the share of worker time spent inside `handler`; it is
+    logged every `report_every` seconds and returned by `stats()`.
+
+    With a `budget`, each job also holds one of its slots under `tenant`
+    while it runs, so several pools can share one global concurrency limit.
+
+    `jobs` may also be an async iterable, e.g. one that claims work from a
+    shared queue as the pool drains it.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[Any]],
+        concurrency: int,
+        queue_size: Optional[int] = None,
+        name: str = "POOL",
+        report_every: float = 10.0,
+        budget: Optional[FairShareLimiter] = None,
+        tenant: Any = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.handler = handler
+        self.concurrency = concurrency
+        self.queue_size = queue_size or concurrency * 2
+        self.name = name
+        self.report_every = report_every
+        self.budget = budget
+        self.tenant = tenant
+        self.busy = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._busy_seconds = 0.0
+        self._busy_since = 0.0
+        self._started = 0.0
+
+    def _account(self, delta: int) -> None:
+        now = time.perf_counter()
+        self._busy_seconds += self.busy * (now - self._busy_since)
+        self._busy_since = now
+        self.busy += delta
+
+    def utilization(self) -> float:
+        """Average share of worker slots busy since the pool started."""
+        now = time.perf_counter()
+        elapsed = now - self._started
+        if elapsed <= 0:
+            return 0.0
+        busy_seconds = self._busy_seconds + self.busy * (now - self._busy_since)
+        return busy_seconds / (elapsed * self.concurrency)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "busy": self.busy,
+            "concurrency": self.concurrency,
+            "utilization": round(self.utilization(), 3),
+        }
+
+    async def _produce(
+        self, jobs: Union[Iterable, AsyncIterable], queue: asyncio.Queue
+    ) -> None:
+        try:
+            if hasattr(jobs, "__aiter__"):
+                async for job in jobs:
+                    await queue.put(job)
+                    self.submitted += 1
+            else:
+                for job in jobs:
+                    await queue.put(job)
+                    self.submitted += 1
+        finally:
+            for _ in range(self.concurrency):
+                await queue.put(_DONE)
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            job = await queue.get()
+            if job is _DONE:
+                return
+            slot = self.budget.slot(self.tenant) if self.budget else nullcontext()
+            async with slot:
+                self._account(+1)
+                try:
+                    await self.handler(job)
+                    self.completed += 1
+                except Exception as e:
+                    # the handler logs its own context; just count it here
+                    self.failed += 1
+                    logger.debug(f"[{self.name}] Job failed: {e}")
+                finally:
+                    self._account(-1)
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_every)
+            logger.info(
+                f"[{self.name}] busy={self.busy}/{self.concurrency} "
+                f"done={self.completed} failed={self.failed} "
+                f"queued={self.submitted - self.completed - self.failed - self.busy} "
+                f"utilization={self.utilization():.0%}"
+            )
+
+    async def run(self, jobs: Union[Iterable, AsyncIterable]) -> Dict[str, Any]:
+        """Run every job in `jobs` through the handler; return the final stats."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._started = self._busy_since = time.perf_counter()
+        producer = asyncio.create_task(self._produce(jobs, queue))
+        workers = [
+            asyncio.create_task(self._work(queue)) for _ in range(self.concurrency)
+        ]
+        reporter = asyncio.create_task(self._report())
+        try:
+            await asyncio.gather(producer, *workers)
+        finally:
+            reporter.cancel()
+            producer.cancel()
+            for worker in workers:
+                worker.cancel()
+        return self.stats()
@@ -5,10 +5,16 @@ from empowered.models.sql.sql_client import SQLClient
 
 load_dotenv()
 
-db_client: SQLClient = SQLClient(
-    server=os.getenv("SQL_SERVER"),
-    database=os.getenv("SQL_DATABASE"),
-    username=os.getenv("SQL_USERNAME"),
-    driver=os.getenv("SQL_DRIVER").replace(" ", "+"),
-    password=os.getenv("SQL_PASSWORD"),
+# SQL_URL (e.g. sqlite:///ingest.db) points at a local database instead of
+# SQL Server, for running and testing the ingest on one box
+db_client: SQLClient = (
+    SQLClient(url=os.getenv("SQL_URL"))
+    if os.getenv("SQL_URL")
+    else SQLClient(
+        server=os.getenv("SQL_SERVER"),
+        database=os.getenv("SQL_DATABASE"),
+        username=os.getenv("SQL_USERNAME"),
+        driver=os.getenv("SQL_DRIVER").replace(" ", "+"),
+        password=os.getenv("SQL_PASSWORD"),
+    )
 )
@@ -0,0 +1,109 @@
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import AddConstraint, ForeignKeyConstraint
+
+from empowered.models.sql.schemas import CensusEstimate, CensusGroup, CensusVariable
+from empowered.utils.logger_setup import get_logger
+
+logger = get_logger(__name__)
+
+# keyed on `id` alone before ACS-1 and ACS-5 were ingested side by side
+VINTAGE_KEYED = (CensusGroup.__table__, CensusVariable.__table__)
+# tables whose foreign keys reference them, rebuilt along with them
+REFERENCING = (CensusVariable.__table__, CensusEstimate.__table__)
+
+
+def _stale_tables(engine) -> List[str]:
+    inspector = inspect(engine)
+    return [
+        table.name
+        for table in VINTAGE_KEYED
+        if inspector.has_table(table.name)
+        and inspector.get_pk_constraint(table.name)["constrained_columns"] == ["id"]
+    ]
+
+
+def migrate_vintage_keys(engine) -> bool:
+    """
+    Re-key CensusGroup and CensusVariable tables created while `id` alone
+    was their primary key to the per-vintage keys declared in schemas.py,
+    keeping their rows. Returns True if anything was migrated.
+    """
+    stale = _stale_tables(engine)
+    if not stale:
+        return False
+    logger.warning(
+        f"Migrating {', '.join(stale)} to per-vintage primary keys; "
+        "this runs once per database"
+    )
+    if engine.dialect.name == "sqlite":
+        _rebuild_sqlite(engine)
+    else:
+        _alter_keys(engine)
+    logger.info("Per-vintage key migration complete.")
+    return True
+
+
+def _rebuild_sqlite(engine) -> None:
+    # SQLite cannot alter constraints: move the old tables aside, create
+    # the declared ones and copy the rows across
+    tables = [CensusGroup.__table__, *REFERENCING]
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA foreign_keys=OFF"))
+        for table in tables:
+            for index in inspector.get_indexes(table.name):
+                conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+            conn.execute(
+                text(f'ALTER TABLE "{table.name}" RENAME TO "{table.name}__old"')
+            )
+        for table in tables:
+            table.create(conn)
+            columns = ", ".join(f'"{c.name}"' for c in table.columns)
+            conn.execute(
+                text(
+                    f'INSERT INTO "{table.name}" ({columns}) '
+                    f'SELECT {columns} FROM "{table.name}__old"'
+                )
+            )
+        for table in reversed(tables):
+            conn.execute(text(f'DROP TABLE "{table.name}__old"'))
+
+
+def _alter_keys(engine) -> None:
+    inspector = inspect(engine)
+    names = {table.name for table in VINTAGE_KEYED}
+    with engine.begin() as conn:
+        # foreign keys first, since they hold on to the old primary keys
+        for table in REFERENCING:
+            for fk in inspector.get_foreign_keys(table.name):
+                if fk["referred_table"] in names and fk["name"]:
+                    conn.execute(
+                        text(
+                            f'ALTER TABLE "{table.name}" '
+                            f'DROP CONSTRAINT "{fk["name"]}"'
+                        )
+                    )
+        for table in VINTAGE_KEYED:
+            for unique in inspector.get_unique_constraints(table.name):
+                if unique["name"] in ("uq_group", "uq_variable"):
+                    conn.execute(
+                        text(
+                            f'ALTER TABLE "{table.name}" '
+                            f'DROP CONSTRAINT "{unique["name"]}"'
+                        )
+                    )
+            old_key = inspector.get_pk_constraint(table.name)["name"]
+            if old_key:
+                conn.execute(
+                    text(f'ALTER TABLE "{table.name}" DROP CONSTRAINT "{old_key}"')
+                )
+            conn.execute(AddConstraint(table.primary_key))
+        for table in REFERENCING:
+            for constraint in table.constraints:
+                if (
+                    isinstance(constraint, ForeignKeyConstraint)
+                    and constraint.referred_table.name in names
+                ):
+                    conn.execute(AddConstraint(constraint))
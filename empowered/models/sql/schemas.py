@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from sqlmodel import (
     Field,
     ForeignKeyConstraint,
@@ -31,35 +33,40 @@ class CensusAvailableYear(SQLModel, table=True):
 
 
 class CensusGroup(SQLModel, table=True):
+    """
+    A group (table) of a dataset vintage. Every vintage of every dataset
+    publishes the same group codes, so the key includes the vintage.
+
+    Tables created while `id` alone was the key are re-keyed on startup
+    by migrations.migrate_vintage_keys.
+    """
+
     __tablename__ = "CensusGroup"
-    id: str = Field(
-        default=None, primary_key=True, max_length=255, description="Group code"
-    )
+    id: str = Field(max_length=255, description="Group code")
     description: str = Field(max_length=255)
     dataset_id: str = Field(foreign_key="CensusDataset.id", index=True, max_length=255)
     year_id: int = Field(foreign_key="CensusAvailableYear.id", index=True)
     variables_count: int
 
-    __table_args__ = (UniqueConstraint("dataset_id", "year_id", "id", name="uq_group"),)
+    __table_args__ = (PrimaryKeyConstraint("dataset_id", "year_id", "id"),)
 
 
 class CensusVariable(SQLModel, table=True):
+    """A variable of a dataset vintage's group; keyed like CensusGroup."""
+
     __tablename__ = "CensusVariable"
-    id: str = Field(
-        default=None,
-        primary_key=True,
-        max_length=255,
-        description="Variable code {group}_{id}",
-    )
+    id: str = Field(max_length=255, description="Variable code {group}_{id}")
     description: str = Field(max_length=255)
-    group_id: str = Field(
-        default=None, foreign_key="CensusGroup.id", index=True, max_length=255
-    )
+    group_id: str = Field(index=True, max_length=255)
     dataset_id: str = Field(foreign_key="CensusDataset.id", index=True, max_length=255)
     year_id: int = Field(foreign_key="CensusAvailableYear.id", index=True)
 
     __table_args__ = (
-        UniqueConstraint("dataset_id", "year_id", "group_id", "id", name="uq_variable"),
+        PrimaryKeyConstraint("dataset_id", "year_id", "group_id", "id"),
+        ForeignKeyConstraint(
+            ["dataset_id", "year_id", "group_id"],
+            ["CensusGroup.dataset_id", "CensusGroup.year_id", "CensusGroup.id"],
+        ),
     )
 
 
@@ -99,6 +106,44 @@ class CensusPlace(SQLModel, table=True):
     )
 
 
+class CensusTract(SQLModel, table=True):
+    __tablename__ = "CensusTract"
+    tract_code: int = Field()
+    tract_name: str = Field(max_length=255)
+    county_fips: int = Field()
+    state_fips: int = Field()
+    year_id: int = Field(foreign_key="CensusAvailableYear.id", index=True)
+    dataset_id: str = Field(foreign_key="CensusDataset.id", index=True, max_length=255)
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "state_fips", "county_fips", "tract_code", "dataset_id", "year_id"
+        ),
+    )
+
+
+class CensusBlockGroup(SQLModel, table=True):
+    __tablename__ = "CensusBlockGroup"
+    block_group: int = Field()
+    block_group_name: str = Field(max_length=255)
+    tract_code: int = Field()
+    county_fips: int = Field()
+    state_fips: int = Field()
+    year_id: int = Field(foreign_key="CensusAvailableYear.id", index=True)
+    dataset_id: str = Field(foreign_key="CensusDataset.id", index=True, max_length=255)
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "state_fips",
+            "county_fips",
+            "tract_code",
+            "block_group",
+            "dataset_id",
+            "year_id",
+        ),
+    )
+
+
 class CensusEstimate(SQLModel, table=True):
     __tablename__ = "CensusEstimate"
     place_fips: int
@@ -139,8 +184,77 @@ class CensusEstimate(SQLModel, table=True):
             ["CensusAvailableYear.id"],
         ),
         ForeignKeyConstraint(["dataset_id"], ["CensusDataset.id"]),
-        ForeignKeyConstraint(["variable_id"], ["CensusVariable.id"]),
-        ForeignKeyConstraint(["group_id"], ["CensusGroup.id"]),
+        ForeignKeyConstraint(
+            ["dataset_id", "year_id", "group_id", "variable_id"],
+            [
+                "CensusVariable.dataset_id",
+                "CensusVariable.year_id",
+                "CensusVariable.group_id",
+                "CensusVariable.id",
+            ],
+        ),
+        ForeignKeyConstraint(
+            ["dataset_id", "year_id", "group_id"],
+            ["CensusGroup.dataset_id", "CensusGroup.year_id", "CensusGroup.id"],
+        ),
+    )
+
+
+class CensusTractEstimate(SQLModel, table=True):
+    """
+    Tract estimates, about 50x the rows of CensusEstimate at full scale.
+    The key leads with the vintage and then the geography, so one dataset
+    year, state or county is a contiguous range; group_id is the variable
+    prefix and not stored, and rows carry no foreign keys so bulk inserts
+    stay cheap.
+    """
+
+    __tablename__ = "CensusTractEstimate"
+    dataset_id: str = Field(max_length=16)
+    year_id: int
+    state_fips: int
+    county_fips: int
+    tract_code: int
+    variable_id: str = Field(max_length=32)
+    estimate: float
+    margin_of_error: float | None = Field(default=None)
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "dataset_id",
+            "year_id",
+            "state_fips",
+            "county_fips",
+            "tract_code",
+            "variable_id",
+        ),
+    )
+
+
+class CensusBlockGroupEstimate(SQLModel, table=True):
+    """Block group estimates, laid out like CensusTractEstimate."""
+
+    __tablename__ = "CensusBlockGroupEstimate"
+    dataset_id: str = Field(max_length=16)
+    year_id: int
+    state_fips: int
+    county_fips: int
+    tract_code: int
+    block_group: int
+    variable_id: str = Field(max_length=32)
+    estimate: float
+    margin_of_error: float | None = Field(default=None)
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "dataset_id",
+            "year_id",
+            "state_fips",
+            "county_fips",
+            "tract_code",
+            "block_group",
+            "variable_id",
+        ),
     )
 
 
@@ -152,3 +266,84 @@ class IngestionCheckpoint(SQLModel, table=True):
     variables_ingested: bool = False
     geography_ingested: bool = False
     estimates_ingested: bool = False
+
+
+class EstimateWorkUnit(SQLModel, table=True):
+    """
+    One estimate request of an ingest: a (state, geography, variable batch)
+    for a dataset and year. status is "pending", "done" or "failed";
+    attempts counts finished tries. A pending unit claimed by an ingest
+    process carries that claim in lease_owner until lease_expires_at.
+    Pending units are claimed highest priority first.
+    """
+
+    __tablename__ = "EstimateWorkUnit"
+    dataset_id: str = Field(max_length=255)
+    year: int
+    state_fips: str = Field(max_length=2)
+    geo_level: str = Field(max_length=16)
+    geo_code: str = Field(max_length=16)
+    batch_key: str = Field(max_length=64)
+    status: str = Field(default="pending", max_length=16, index=True)
+    attempts: int = 0
+    rows: int | None = Field(default=None)
+    last_error: str | None = Field(default=None, max_length=1024)
+    updated_at: datetime | None = Field(default=None)
+    lease_owner: str | None = Field(default=None, max_length=64, index=True)
+    lease_expires_at: datetime | None = Field(default=None)
+    priority: float = Field(default=0, index=True)
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "dataset_id",
+            "year",
+            "state_fips",
+            "geo_level",
+            "geo_code",
+            "batch_key",
+        ),
+    )
+
+
+class EstimateDeadLetter(SQLModel, table=True):
+    """
+    One failure of an estimate work unit, kept after the unit is retried so
+    its attempt history survives. stage is "fetch", "write" or "plan";
+    tries counts the requests or writes made before giving up.
+    """
+
+    __tablename__ = "EstimateDeadLetter"
+    id: int = Field(default=None, primary_key=True)
+    dataset_id: str = Field(max_length=255)
+    year: int
+    state_fips: str = Field(max_length=2)
+    geo_level: str = Field(max_length=16)
+    geo_code: str = Field(max_length=16)
+    batch_key: str = Field(max_length=64)
+    group_id: str | None = Field(default=None, max_length=255)
+    stage: str = Field(max_length=16)
+    error_class: str = Field(max_length=255)
+    error: str = Field(max_length=1024)
+    url: str | None = Field(default=None)
+    tries: int = 1
+    failed_at: datetime | None = Field(default=None, index=True)
+
+
+class IngestFingerprint(SQLModel, table=True):
+    """
+    Content hash of one metadata or geography entity of a dataset vintage,
+    as the Census API returned it: "group:<id>" is a group with its
+    variables, "state:<fips>" a state with its counties, places, tracts and
+    block groups. rows counts the table rows the entity was stored as. The
+    next vintage compares against these to find what changed.
+    """
+
+    __tablename__ = "IngestFingerprint"
+    dataset_id: str = Field(max_length=255)
+    year: int
+    entity: str = Field(max_length=64)
+    content_hash: str = Field(max_length=64)
+    rows: int = 0
+    updated_at: datetime | None = Field(default=None)
+
+    __table_args__ = (PrimaryKeyConstraint("dataset_id", "year", "entity"),)
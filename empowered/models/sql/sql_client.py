@@ -1,7 +1,10 @@
 from contextlib import contextmanager
 from typing import Any, Dict, List, Type, Optional
+from sqlalchemy import bindparam, event, insert, literal, update
+from sqlalchemy import select as sql_select
 from sqlmodel import SQLModel, Session, create_engine, select, text
 from empowered.utils.logger_setup import get_logger
+from empowered.models.sql.migrations import migrate_vintage_keys
 from empowered.models.sql import (
     CensusDataset,
     CensusAvailableYear,
@@ -19,6 +22,7 @@ logger = get_logger(__name__)
 
 def _create(engine) -> None:
     SQLModel.metadata.create_all(engine)
+    migrate_vintage_keys(engine)
     # SQLModel.metadata.create_all(engine, tables=[CensusMock.__table__])
     # SQLModel.metadata.create_all(engine, tables=[CensusDataset.__table__])
     # SQLModel.metadata.create_all(engine, tables=[CensusAvailableYear.__table__])
@@ -30,27 +34,56 @@ def _create(engine) -> None:
     # SQLModel.metadata.create_all(engine, tables=[CensusEstimate.__table__])
 
 
+def _sqlite_wal(dbapi_connection, _record) -> None:
+    # readers don't block the writer, so several processes can share the file
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
 class SQLClient:
     def __init__(
         self,
-        server: str,
-        database: str,
-        username: str,
-        password: str,
-        driver: str,
+        server: Optional[str] = None,
+        database: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        driver: Optional[str] = None,
         echo: bool = False,
+        url: Optional[str] = None,
     ) -> None:
-        """Initialize the SQL client and create all defined tables."""
+        """
+        Initialize the SQL client and create all defined tables.
+
+        `url` (e.g. "sqlite:///ingest.db") replaces the SQL Server connection,
+        so the ingest and its job queue can run against a local file on one box.
+        """
         self.server = server
         self.database = database
         self.username = username
         self.password = password
         self.driver = driver
 
-        connection_string = f"mssql+pyodbc://{username}:{password}@{server}/{database}?driver={driver}&TrustServerCertificate=yes"
+        connection_string = (
+            url
+            or f"mssql+pyodbc://{username}:{password}@{server}/{database}?driver={driver}&TrustServerCertificate=yes"
+        )
         try:
             logger.info("Creating engine through sqlmodel...")
-            self.engine = create_engine(connection_string, echo=echo)
+            if connection_string.startswith("sqlite"):
+                # shared by executor threads and, through the file, by other
+                # ingest processes: wait on locks instead of failing
+                self.engine = create_engine(
+                    connection_string,
+                    echo=echo,
+                    connect_args={"check_same_thread": False, "timeout": 30},
+                )
+                event.listen(self.engine, "connect", _sqlite_wal)
+            else:
+                # fast_executemany sends bulk inserts as one parameter array
+                self.engine = create_engine(
+                    connection_string, echo=echo, fast_executemany=True
+                )
             logger.info(f"Engine created.")
             logger.info("Connecting to SQL server...")
             logger.info("Creating tables defined in project...")
@@ -97,6 +130,116 @@ class SQLClient:
             for instance in instances:
                 session.refresh(instance)
 
+    # Insert many rows in one executemany round trip (no per-row refresh)
+    def bulk_insert(
+        self,
+        model: Type[SQLModel],
+        rows: List[Dict[str, Any]],
+        chunk_size: int = 5000,
+        session: Optional[Session] = None,
+    ) -> int:
+        """
+        Insert plain dict rows into `model`'s table; returns rows inserted.
+        Pass `session` to make the insert part of a caller's transaction.
+        """
+        if not rows:
+            return 0
+        if session is None:
+            with self.session_scope() as session:
+                return self.bulk_insert(model, rows, chunk_size, session=session)
+        for start in range(0, len(rows), chunk_size):
+            session.execute(insert(model.__table__), rows[start : start + chunk_size])
+        return len(rows)
+
+    # Copy rows within a table in one INSERT ... SELECT (rows stay server-side)
+    def copy_rows(
+        self,
+        model: Type[SQLModel],
+        filters: Dict[str, Any],
+        values: Dict[str, Any],
+        session: Optional[Session] = None,
+    ) -> int:
+        """
+        Insert a copy of every row of `model` matching `filters` with the
+        columns in `values` replaced, e.g. {"year_id": new_year_id}; returns
+        rows copied. A filter value that is a list matches any of its items.
+        """
+        if session is None:
+            with self.session_scope() as session:
+                return self.copy_rows(model, filters, values, session=session)
+        table = model.__table__
+        columns = [column.name for column in table.columns]
+        source = sql_select(
+            *(
+                literal(values[name]).label(name) if name in values else table.c[name]
+                for name in columns
+            )
+        )
+        for column, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                source = source.where(table.c[column].in_(list(value)))
+            else:
+                source = source.where(table.c[column] == value)
+        result = session.execute(insert(table).from_select(columns, source))
+        return result.rowcount
+
+    # Update many rows by key in one executemany round trip
+    def bulk_update(
+        self,
+        model: Type[SQLModel],
+        keys: List[str],
+        rows: List[Dict[str, Any]],
+        values: Optional[Dict[str, Any]] = None,
+        session: Optional[Session] = None,
+        where: Optional[List[Any]] = None,
+        match: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Update one row per dict in `rows`, matched on the `keys` columns.
+        The remaining columns of each dict are set per row; `values` sets
+        columns shared by every row (may be SQL expressions such as
+        `table.c.attempts + 1`). `where` adds conditions every matched row
+        must also meet, and the `match` columns of each dict are compared
+        (NULL equal to NULL) instead of set, e.g. for compare-and-set
+        updates. Returns the number of rows actually updated.
+        """
+        if not rows:
+            return 0
+        if session is None:
+            with self.session_scope() as session:
+                return self.bulk_update(
+                    model,
+                    keys,
+                    rows,
+                    values,
+                    session=session,
+                    where=where,
+                    match=match,
+                )
+        table = model.__table__
+        stmt = update(table)
+        for key in keys:
+            stmt = stmt.where(table.c[key] == bindparam(f"b_{key}"))
+        for column in match or []:
+            stmt = stmt.where(
+                table.c[column].is_not_distinct_from(bindparam(f"b_{column}"))
+            )
+        for clause in where or []:
+            stmt = stmt.where(clause)
+        compared = set(keys) | set(match or [])
+        per_row = [column for column in rows[0] if column not in compared]
+        stmt = stmt.values(
+            {
+                **{column: bindparam(f"b_{column}") for column in per_row},
+                **(values or {}),
+            }
+        )
+        params = [{f"b_{k}": v for k, v in row.items()} for row in rows]
+        if len(params) > 1 and session.get_bind().dialect.supports_sane_multi_rowcount:
+            return session.execute(stmt, params).rowcount
+        # one row, or an executemany without a reliable total (e.g. pyodbc's)
+        return sum(session.execute(stmt, p).rowcount for p in params)
+
     # Update objects using SQLModel (pass a dictionary of changes)
     def update(
         self, model: Type[SQLModel], where: Dict[str, Any], updates: Dict[str, Any]
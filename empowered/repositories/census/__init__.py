@@ -4,3 +4,6 @@ from .geography_repo import *
 from .groups_repo import *
 from .variables_repo import *
 from .years_available_repo import *
+from .work_units_repo import *
+from .dead_letters_repo import *
+from .fingerprints_repo import *
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from sqlmodel import select
 from empowered.models.sql import IngestionCheckpoint
 from empowered.models.sql.sql_client import SQLClient
@@ -8,6 +10,16 @@ class CheckpointRepository:
     def __init__(self, db_client: SQLClient = get_sql_client()):
         self.db_client = db_client
 
+    def get(self, dataset_id: str, year: int) -> Optional[dict]:
+        """The checkpoint of a dataset year, or None if none was stored."""
+        with self.db_client.session_scope() as session:
+            stmt = select(IngestionCheckpoint).where(
+                IngestionCheckpoint.dataset_id == dataset_id,
+                IngestionCheckpoint.year == year,
+            )
+            checkpoint = session.exec(stmt).first()
+            return checkpoint.model_dump() if checkpoint else None
+
     def get_or_create(self, dataset_id: str, year: int) -> dict:
         with self.db_client.session_scope() as session:
             stmt = select(IngestionCheckpoint).where(
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from empowered.models.sql.schemas import EstimateDeadLetter
+from empowered.models.sql.sql_client import SQLClient
+from empowered.utils.helpers import get_sql_client
+
+UNIT_FIELDS = ["state_fips", "geo_level", "geo_code", "batch_key"]
+
+
+class DeadLetterRepository:
+    """
+    Durable record of failed estimate work units (see EstimateDeadLetter).
+    The ledger's status says whether a unit is failed now; this keeps every
+    failure it has had.
+    """
+
+    def __init__(self, db_client: SQLClient = get_sql_client()) -> None:
+        self.db_client = db_client
+
+    def record(
+        self,
+        dataset_id: str,
+        year: int,
+        units: List[Dict],
+        stage: str,
+        error_class: str,
+        error: str,
+        tries: int = 1,
+        url: Optional[str] = None,
+    ) -> int:
+        """
+        Add one failure per unit; a unit may carry "group_id" and "url",
+        which take precedence over `url`.
+        """
+        failed_at = datetime.now(timezone.utc)
+        rows = [
+            {
+                "dataset_id": dataset_id,
+                "year": year,
+                **{k: unit[k] for k in UNIT_FIELDS},
+                "group_id": unit.get("group_id"),
+                "stage": stage,
+                "error_class": error_class[:255],
+                "error": error[:1024],
+                "url": unit.get("url", url),
+                "tries": tries,
+                "failed_at": failed_at,
+            }
+            for unit in units
+        ]
+        return self.db_client.bulk_insert(model=EstimateDeadLetter, rows=rows)
+
+    def get_failures(
+        self, dataset_id: str, year: int, stage: Optional[str] = None
+    ) -> List[Dict]:
+        filters = {"dataset_id": dataset_id, "year": year}
+        if stage is not None:
+            filters["stage"] = stage
+        return self.db_client.select(
+            model=EstimateDeadLetter,
+            filters=filters,
+            order_by=[EstimateDeadLetter.failed_at],
+        )
@@ -1,14 +1,25 @@
-from sqlmodel import SQLModel
+from sqlmodel import Session, SQLModel
 
 from empowered.models.sql.sql_client import SQLClient
-from empowered.models.sql.schemas import CensusEstimate
+from empowered.models.sql.schemas import (
+    CensusBlockGroupEstimate,
+    CensusEstimate,
+    CensusTractEstimate,
+)
 from empowered.utils.helpers import get_sql_client
 from empowered.utils.logger_setup import get_logger
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
 
 
 logger = get_logger(__name__)
 
+SMALL_AREA_MODELS = {
+    "tract": CensusTractEstimate,
+    "block_group": CensusBlockGroupEstimate,
+}
+
 
 class CensusEstimateRepository:
     def __init__(self, db_client: SQLClient = get_sql_client()) -> None:
@@ -39,6 +50,52 @@ class CensusEstimateRepository:
         results = self.db_client.select(model=CensusEstimate, filters=params)
         return [r.model_dump() for r in results]
 
+    def iter_place_coverage(
+        self, dataset_id: str, year_id: int
+    ) -> Iterator[Tuple[int, int, str]]:
+        """
+        Stream (state_fips, place_fips, variable_id) of every stored estimate
+        of a dataset year, without loading whole rows.
+        """
+        stmt = (
+            select(
+                CensusEstimate.state_fips,
+                CensusEstimate.place_fips,
+                CensusEstimate.variable_id,
+            )
+            .where(
+                CensusEstimate.dataset_id == dataset_id,
+                CensusEstimate.year_id == year_id,
+            )
+            .execution_options(yield_per=50000)
+        )
+        with self.db_client.session_scope() as session:
+            for state_fips, place_fips, variable_id in session.execute(stmt):
+                yield state_fips, place_fips, variable_id
+
+    def iter_variable_values(
+        self, variable_id: str
+    ) -> Iterator[Tuple[str, int, int, int, float]]:
+        """
+        Stream (dataset_id, year_id, state_fips, place_fips, estimate) of one
+        variable across every stored dataset year, e.g. B01003_001E for the
+        population of each place.
+        """
+        stmt = (
+            select(
+                CensusEstimate.dataset_id,
+                CensusEstimate.year_id,
+                CensusEstimate.state_fips,
+                CensusEstimate.place_fips,
+                CensusEstimate.estimate,
+            )
+            .where(CensusEstimate.variable_id == variable_id)
+            .execution_options(yield_per=50000)
+        )
+        with self.db_client.session_scope() as session:
+            for row in session.execute(stmt):
+                yield tuple(row)
+
     def insert_estimates(
         self,
         year_id: int,
@@ -46,25 +103,58 @@ class CensusEstimateRepository:
         estimates: List[
             dict
         ],  # each dict: {"variable": str, "value": float, "margin_of_error": Optional[float]}
+        session: Optional[Session] = None,
     ) -> None:
-        instances = []
+        rows = []
         for estimate in estimates:
             try:
-                instances.append(
-                    CensusEstimate(
-                        id=None,
-                        place_fips=estimate["place_fips"],
-                        county_fips=estimate["county_fips"],
-                        state_fips=estimate["state_fips"],
-                        year_id=year_id,
-                        dataset_id=dataset_id,
-                        variable_id=estimate["variable"],
-                        group_id=estimate["variable"].split("_")[0],
-                        estimate=float(estimate["estimate"]),
-                        margin_of_error=estimate.get("margin_of_error"),
-                    )
+                rows.append(
+                    {
+                        "place_fips": estimate["place_fips"],
+                        "county_fips": estimate["county_fips"],
+                        "state_fips": estimate["state_fips"],
+                        "year_id": year_id,
+                        "dataset_id": dataset_id,
+                        "variable_id": estimate["variable"],
+                        "group_id": estimate["variable"].split("_")[0],
+                        "estimate": float(estimate["estimate"]),
+                        "margin_of_error": estimate.get("margin_of_error"),
+                    }
                 )
             except:
                 logger.info(f"Errored estimate: {estimate}")
-        if instances:
-            self.db_client.insert(instances=instances)
+        # the ingest writer hands over batches of tens of thousands of rows
+        self.db_client.bulk_insert(model=CensusEstimate, rows=rows, session=session)
+
+    def insert_small_area_estimates(
+        self,
+        level: str,
+        year_id: int,
+        dataset_id: str,
+        estimates: List[dict],
+        session: Optional[Session] = None,
+    ) -> int:
+        """
+        Insert tract or block group estimates (`level` "tract" or
+        "block_group"), as decoded from a wildcard response.
+        """
+        model = SMALL_AREA_MODELS[level]
+        rows = []
+        for estimate in estimates:
+            try:
+                row = {
+                    "dataset_id": dataset_id,
+                    "year_id": year_id,
+                    "state_fips": int(estimate["state_fips"]),
+                    "county_fips": int(estimate["county_fips"]),
+                    "tract_code": int(estimate["tract_code"]),
+                    "variable_id": estimate["variable"],
+                    "estimate": float(estimate["estimate"]),
+                    "margin_of_error": estimate.get("margin_of_error"),
+                }
+                if level == "block_group":
+                    row["block_group"] = int(estimate["block_group"])
+                rows.append(row)
+            except (KeyError, TypeError, ValueError):
+                logger.info(f"Errored {level} estimate: {estimate}")
+        return self.db_client.bulk_insert(model=model, rows=rows, session=session)
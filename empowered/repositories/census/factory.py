@@ -1,8 +1,11 @@
 from empowered.repositories.census.datasets_repo import DatasetRepository
+from empowered.repositories.census.dead_letters_repo import DeadLetterRepository
 from empowered.repositories.census.estimates_repo import CensusEstimateRepository
+from empowered.repositories.census.fingerprints_repo import FingerprintRepository
 from empowered.repositories.census.geography_repo import GeographyRepository
 from empowered.repositories.census.groups_repo import GroupsRepository
 from empowered.repositories.census.variables_repo import VariablesRepository
+from empowered.repositories.census.work_units_repo import WorkUnitRepository
 from empowered.repositories.census.years_available_repo import YearsAvailableRepository
 
 
@@ -27,3 +30,12 @@ class RepositoryFactory:
 
     def years(self):
         return YearsAvailableRepository(self.client)
+
+    def work_units(self):
+        return WorkUnitRepository(self.client)
+
+    def dead_letters(self):
+        return DeadLetterRepository(self.client)
+
+    def fingerprints(self):
+        return FingerprintRepository(self.client)
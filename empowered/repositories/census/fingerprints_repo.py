@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+
+from empowered.models.sql.schemas import IngestFingerprint
+from empowered.models.sql.sql_client import SQLClient
+from empowered.utils.helpers import get_sql_client
+
+
+class FingerprintRepository:
+    """
+    Content hashes of the metadata and geography entities of each ingested
+    dataset vintage (see IngestFingerprint). A fingerprint is recorded only
+    once its entity's rows are stored, so an entity with a fingerprint can
+    be copied to a later vintage.
+    """
+
+    def __init__(self, db_client: SQLClient = get_sql_client()) -> None:
+        self.db_client = db_client
+
+    def get_fingerprints(self, dataset_id: str, year: int) -> Dict[str, str]:
+        """{entity: content_hash} of a dataset year."""
+        rows = self.db_client.select(
+            model=IngestFingerprint, filters={"dataset_id": dataset_id, "year": year}
+        )
+        return {row["entity"]: row["content_hash"] for row in rows}
+
+    def latest_year_before(self, dataset_id: str, year: int) -> Optional[int]:
+        """The nearest year before `year` with fingerprints, if any."""
+        table = IngestFingerprint.__table__
+        stmt = select(func.max(table.c.year)).where(
+            table.c.dataset_id == dataset_id, table.c.year < year
+        )
+        with self.db_client.session_scope() as session:
+            return session.execute(stmt).scalar_one()
+
+    def record(
+        self,
+        dataset_id: str,
+        year: int,
+        fingerprints: Dict[str, Tuple[str, int]],
+    ) -> int:
+        """
+        Store {entity: (content_hash, rows)} for a dataset year, replacing
+        what those entities had before.
+        """
+        if not fingerprints:
+            return 0
+        table = IngestFingerprint.__table__
+        updated_at = datetime.now(timezone.utc)
+        rows = [
+            {
+                "dataset_id": dataset_id,
+                "year": year,
+                "entity": entity,
+                "content_hash": content_hash,
+                "rows": count,
+                "updated_at": updated_at,
+            }
+            for entity, (content_hash, count) in fingerprints.items()
+        ]
+        entities = list(fingerprints)
+        with self.db_client.session_scope() as session:
+            for start in range(0, len(entities), 500):
+                session.execute(
+                    delete(table).where(
+                        table.c.dataset_id == dataset_id,
+                        table.c.year == year,
+                        table.c.entity.in_(entities[start : start + 500]),
+                    )
+                )
+            return self.db_client.bulk_insert(
+                model=IngestFingerprint, rows=rows, session=session
+            )
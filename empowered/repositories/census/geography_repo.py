@@ -1,7 +1,13 @@
 from sqlmodel import SQLModel
 
 from empowered.models.sql.sql_client import SQLClient
-from empowered.models.sql.schemas import CensusPlace, CensusState, CensusCounty
+from empowered.models.sql.schemas import (
+    CensusBlockGroup,
+    CensusCounty,
+    CensusPlace,
+    CensusState,
+    CensusTract,
+)
 from empowered.utils.helpers import get_sql_client
 
 
@@ -60,6 +66,54 @@ class GeographyRepository:
             parameters["place_name"] = place_name
         return self.db_client.select(model=CensusPlace, filters=parameters)
 
+    def get_geography(self, dataset_id: str, year_id: int) -> list[dict]:
+        """
+        The stored state -> counties/places tree of a dataset year (three
+        queries), shaped like the ingest's API load. FIPS codes come back
+        zero-padded strings as the API returns them.
+        """
+        filters = {"dataset_id": dataset_id, "year_id": year_id}
+        states = self.db_client.select(
+            model=CensusState, filters=filters, order_by=[CensusState.state_fips]
+        )
+        counties = self.db_client.select(
+            model=CensusCounty, filters=filters, order_by=[CensusCounty.county_fips]
+        )
+        places = self.db_client.select(
+            model=CensusPlace, filters=filters, order_by=[CensusPlace.place_fips]
+        )
+
+        tree = {
+            int(s["state_fips"]): {
+                "state_fips": f"{int(s['state_fips']):02d}",
+                "state_name": s["state_name"],
+                "counties": [],
+                "places": [],
+            }
+            for s in states
+        }
+        for c in counties:
+            state = tree.get(int(c["state_fips"]))
+            if state is not None:
+                state["counties"].append(
+                    {
+                        "county_name": c["county_name"],
+                        "county_fips": f"{int(c['county_fips']):03d}",
+                        "state_fips": state["state_fips"],
+                    }
+                )
+        for p in places:
+            state = tree.get(int(p["state_fips"]))
+            if state is not None:
+                state["places"].append(
+                    {
+                        "place_name": p["place_name"],
+                        "place_fips": f"{int(p['place_fips']):05d}",
+                        "state_fips": state["state_fips"],
+                    }
+                )
+        return list(tree.values())
+
     def insert_states(
         self,
         states: list[dict],
@@ -116,3 +170,76 @@ class GeographyRepository:
         ]
 
         return self.db_client.insert(instances=instances)
+
+    def insert_tracts(
+        self,
+        tracts: list[dict],
+        dataset_id: str,
+        year_id: int,
+    ) -> int:
+        rows = [
+            {
+                "tract_code": int(t["tract_code"]),
+                "tract_name": t["tract_name"],
+                "county_fips": int(t["county_fips"]),
+                "state_fips": int(t["state_fips"]),
+                "dataset_id": dataset_id,
+                "year_id": year_id,
+            }
+            for t in tracts
+        ]
+        return self.db_client.bulk_insert(model=CensusTract, rows=rows)
+
+    def insert_block_groups(
+        self,
+        block_groups: list[dict],
+        dataset_id: str,
+        year_id: int,
+    ) -> int:
+        rows = [
+            {
+                "block_group": int(b["block_group"]),
+                "block_group_name": b["block_group_name"],
+                "tract_code": int(b["tract_code"]),
+                "county_fips": int(b["county_fips"]),
+                "state_fips": int(b["state_fips"]),
+                "dataset_id": dataset_id,
+                "year_id": year_id,
+            }
+            for b in block_groups
+        ]
+        return self.db_client.bulk_insert(model=CensusBlockGroup, rows=rows)
+
+    def copy_states(
+        self,
+        state_fips: list[int],
+        dataset_id: str,
+        from_year_id: int,
+        to_year_id: int,
+    ) -> int:
+        """
+        Link states unchanged since an earlier vintage to a new one: copy
+        their state, county, place, tract and block group rows from
+        `from_year_id` inside the database, in one transaction.
+        """
+        filters = {
+            "dataset_id": dataset_id,
+            "year_id": from_year_id,
+            "state_fips": [int(fips) for fips in state_fips],
+        }
+        with self.db_client.session_scope() as session:
+            return sum(
+                self.db_client.copy_rows(
+                    model=model,
+                    filters=filters,
+                    values={"year_id": to_year_id},
+                    session=session,
+                )
+                for model in (
+                    CensusState,
+                    CensusCounty,
+                    CensusPlace,
+                    CensusTract,
+                    CensusBlockGroup,
+                )
+            )
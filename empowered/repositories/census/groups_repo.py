@@ -4,6 +4,9 @@ from empowered.models.sql.sql_client import SQLClient
 from empowered.models.sql.schemas import CensusGroup
 from empowered.utils.helpers import get_sql_client
 
+# ids per IN list; SQL Server allows ~2100 parameters per statement
+COPY_CHUNK = 500
+
 
 class GroupsRepository:
     def __init__(self, db_client: SQLClient = get_sql_client()) -> None:
@@ -45,3 +48,29 @@ class GroupsRepository:
         ]
 
         return self.db_client.insert(instances=instances)
+
+    def copy_groups(
+        self,
+        group_ids: list[str],
+        dataset_id: int,
+        from_year_id: int,
+        to_year_id: int,
+    ) -> int:
+        """
+        Link groups unchanged since an earlier vintage to a new one by
+        copying their rows from `from_year_id` inside the database.
+        """
+        copied = 0
+        with self.db_client.session_scope() as session:
+            for start in range(0, len(group_ids), COPY_CHUNK):
+                copied += self.db_client.copy_rows(
+                    model=CensusGroup,
+                    filters={
+                        "dataset_id": dataset_id,
+                        "year_id": from_year_id,
+                        "id": group_ids[start : start + COPY_CHUNK],
+                    },
+                    values={"year_id": to_year_id},
+                    session=session,
+                )
+        return copied
@@ -2,6 +2,7 @@ from sqlmodel import SQLModel
 
 from empowered.models.sql.sql_client import SQLClient
 from empowered.models.sql.schemas import CensusVariable
+from empowered.repositories.census.groups_repo import COPY_CHUNK
 from empowered.utils.helpers import get_sql_client
 
 
@@ -25,6 +26,25 @@ class VariablesRepository:
             parameters["id"] = variable_id
         return self.db_client.select(model=CensusVariable, filters=parameters)
 
+    def get_variables_by_group(
+        self, dataset_id: int, year_id: int
+    ) -> dict[str, list[dict]]:
+        """
+        Every stored variable of a dataset year in one query, shaped like the
+        ingest's API load: {group_id: [{"variable_id", "description"}, ...]}.
+        """
+        rows = self.db_client.select(
+            model=CensusVariable,
+            filters={"dataset_id": dataset_id, "year_id": year_id},
+            order_by=[CensusVariable.group_id, CensusVariable.id],
+        )
+        variables_by_group: dict[str, list[dict]] = {}
+        for row in rows:
+            variables_by_group.setdefault(row["group_id"], []).append(
+                {"variable_id": row["id"], "description": row["description"]}
+            )
+        return variables_by_group
+
     def insert_variables(
         self,
         variables: list[dict],
@@ -40,15 +60,41 @@ class VariablesRepository:
             "description": str
         }
         """
-        instances = [
-            CensusVariable(
-                id=v["variable_id"],
-                dataset_id=dataset_id,
-                description=v["description"],
-                year_id=year_id,
-                group_id=v["group_id"],
-            )
+        rows = [
+            {
+                "id": v["variable_id"],
+                "dataset_id": dataset_id,
+                "description": v["description"],
+                "year_id": year_id,
+                "group_id": v["group_id"],
+            }
             for v in variables
         ]
+        # one executemany pass; a full catalog is tens of thousands of rows
+        self.db_client.bulk_insert(model=CensusVariable, rows=rows)
 
-        return self.db_client.insert(instances=instances)
+    def copy_variables(
+        self,
+        group_ids: list[str],
+        dataset_id: int,
+        from_year_id: int,
+        to_year_id: int,
+    ) -> int:
+        """
+        Link the variables of groups unchanged since an earlier vintage to a
+        new one by copying their rows from `from_year_id` inside the database.
+        """
+        copied = 0
+        with self.db_client.session_scope() as session:
+            for start in range(0, len(group_ids), COPY_CHUNK):
+                copied += self.db_client.copy_rows(
+                    model=CensusVariable,
+                    filters={
+                        "dataset_id": dataset_id,
+                        "year_id": from_year_id,
+                        "group_id": group_ids[start : start + COPY_CHUNK],
+                    },
+                    values={"year_id": to_year_id},
+                    session=session,
+                )
+        return copied
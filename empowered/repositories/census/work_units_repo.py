@@ -0,0 +1,371 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, delete, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from empowered.models.sql.schemas import EstimateWorkUnit
+from empowered.models.sql.sql_client import SQLClient
+from empowered.utils.helpers import get_sql_client
+
+UNIT_KEYS = ["dataset_id", "year", "state_fips", "geo_level", "geo_code", "batch_key"]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class WorkUnitRepository:
+    """
+    Ledger of estimate work units. Each unit is a dict carrying
+    "state_fips", "geo_level", "geo_code" and "batch_key", and optionally
+    a "priority"; dataset_id and year are passed alongside.
+
+    The ledger doubles as a job queue shared by any number of ingest
+    processes: `claim` leases pending units to one owner for a limited
+    time, `heartbeat` extends live leases, and a unit whose lease expires
+    (its process died) can be claimed again.
+    """
+
+    def __init__(self, db_client: SQLClient = get_sql_client()) -> None:
+        self.db_client = db_client
+
+    def get_units(
+        self, dataset_id: str, year: int, status: Optional[str] = None
+    ) -> List[Dict]:
+        filters = {"dataset_id": dataset_id, "year": year}
+        if status is not None:
+            filters["status"] = status
+        return self.db_client.select(model=EstimateWorkUnit, filters=filters)
+
+    def add_units(self, dataset_id: str, year: int, units: List[Dict]) -> int:
+        """
+        Register units not yet in the ledger as pending; returns how many.
+        Units already pending take the priority they are given now.
+        """
+        try:
+            return self._add_units(dataset_id, year, units)
+        except IntegrityError:
+            # another process registered some of them first; skip those too
+            return self._add_units(dataset_id, year, units)
+
+    def _add_units(self, dataset_id: str, year: int, units: List[Dict]) -> int:
+        if not units:
+            return 0
+        # only the states being added: planning adds one state at a time
+        table = EstimateWorkUnit.__table__
+        stmt = select(
+            *(table.c[k] for k in UNIT_KEYS[2:]), table.c.status, table.c.priority
+        ).where(
+            table.c.dataset_id == dataset_id,
+            table.c.year == year,
+            table.c.state_fips.in_(sorted({u["state_fips"] for u in units})),
+        )
+        with self.db_client.session_scope() as session:
+            known = {
+                tuple(row[k] for k in UNIT_KEYS[2:]): dict(row)
+                for row in (r._mapping for r in session.execute(stmt))
+            }
+        rows, reprioritized = [], []
+        for unit in units:
+            key = tuple(unit[k] for k in UNIT_KEYS[2:])
+            priority = unit.get("priority", 0)
+            existing = known.get(key)
+            if existing is not None:
+                pending = existing["status"] == "pending"
+                if pending and existing["priority"] != priority:
+                    reprioritized.append(
+                        {
+                            "dataset_id": dataset_id,
+                            "year": year,
+                            **{k: unit[k] for k in UNIT_KEYS[2:]},
+                            "priority": priority,
+                        }
+                    )
+                continue
+            known[key] = unit
+            rows.append(
+                {
+                    "dataset_id": dataset_id,
+                    "year": year,
+                    **{k: unit[k] for k in UNIT_KEYS[2:]},
+                    "status": "pending",
+                    "attempts": 0,
+                    "updated_at": _now(),
+                    "priority": priority,
+                }
+            )
+        table = EstimateWorkUnit.__table__
+        self.db_client.bulk_update(
+            model=EstimateWorkUnit,
+            keys=UNIT_KEYS,
+            rows=reprioritized,
+            where=[table.c.status == "pending"],
+        )
+        return self.db_client.bulk_insert(model=EstimateWorkUnit, rows=rows)
+
+    def mark_done(
+        self,
+        dataset_id: str,
+        year: int,
+        units: List[Dict],
+        session: Optional[Session] = None,
+    ) -> int:
+        """
+        Mark units done if they are still leased to their "lease_owner" (a
+        unit without one must be unleased); returns how many were. Pass the
+        session that wrote their estimates so the rows and the ledger commit
+        together. A unit may carry "rows".
+        """
+        table = EstimateWorkUnit.__table__
+        rows = [
+            {
+                "dataset_id": dataset_id,
+                "year": year,
+                **{k: unit[k] for k in UNIT_KEYS[2:]},
+                "lease_owner": unit.get("lease_owner"),
+                "rows": unit.get("rows"),
+            }
+            for unit in units
+        ]
+        return self.db_client.bulk_update(
+            model=EstimateWorkUnit,
+            keys=UNIT_KEYS,
+            rows=rows,
+            match=["lease_owner"],
+            values={
+                "status": "done",
+                "attempts": table.c.attempts + 1,
+                "last_error": None,
+                "updated_at": _now(),
+                "lease_owner": None,
+                "lease_expires_at": None,
+            },
+            session=session,
+        )
+
+    def _ledger_rows(
+        self,
+        dataset_id: str,
+        year: int,
+        units: List[Dict],
+        session: Optional[Session] = None,
+    ) -> Dict[tuple, Dict]:
+        """{unit key: {"status", "lease_owner"}} of the given units."""
+        if not units:
+            return {}
+        if session is None:
+            with self.db_client.session_scope() as session:
+                return self._ledger_rows(dataset_id, year, units, session=session)
+        table = EstimateWorkUnit.__table__
+        stmt = select(
+            *(table.c[k] for k in UNIT_KEYS[2:]),
+            table.c.status,
+            table.c.lease_owner,
+        ).where(
+            table.c.dataset_id == dataset_id,
+            table.c.year == year,
+            table.c.state_fips.in_(sorted({u["state_fips"] for u in units})),
+            table.c.batch_key.in_(sorted({u["batch_key"] for u in units})),
+        )
+        wanted = {tuple(u[k] for k in UNIT_KEYS[2:]) for u in units}
+        current = {}
+        for row in session.execute(stmt):
+            row = dict(row._mapping)
+            key = tuple(row[k] for k in UNIT_KEYS[2:])
+            if key in wanted:
+                current[key] = row
+        return current
+
+    def held_units(
+        self,
+        dataset_id: str,
+        year: int,
+        units: List[Dict],
+        session: Optional[Session] = None,
+    ) -> List[Dict]:
+        """
+        The units not done yet and still leased to their "lease_owner"
+        (unleased, for a unit without one), i.e. the ones `mark_done` would
+        mark now.
+        """
+        current = self._ledger_rows(dataset_id, year, units, session=session)
+        held = []
+        for unit in units:
+            row = current.get(tuple(unit[k] for k in UNIT_KEYS[2:]))
+            if (
+                row is not None
+                and row["status"] != "done"
+                and row["lease_owner"] == unit.get("lease_owner")
+            ):
+                held.append(unit)
+        return held
+
+    def lost_units(self, dataset_id: str, year: int, units: List[Dict]) -> List[Dict]:
+        """
+        The units not done yet whose lease now belongs to someone other than
+        their "lease_owner": it expired and another process claimed them.
+        """
+        current = self._ledger_rows(dataset_id, year, units)
+        lost = []
+        for unit in units:
+            row = current.get(tuple(unit[k] for k in UNIT_KEYS[2:]))
+            if (
+                row is not None
+                and row["status"] != "done"
+                and row["lease_owner"] != unit.get("lease_owner")
+            ):
+                lost.append(unit)
+        return lost
+
+    def mark_failed(
+        self, dataset_id: str, year: int, units: List[Dict], error: str
+    ) -> int:
+        table = EstimateWorkUnit.__table__
+        rows = [
+            {"dataset_id": dataset_id, "year": year, **{k: u[k] for k in UNIT_KEYS[2:]}}
+            for u in units
+        ]
+        return self.db_client.bulk_update(
+            model=EstimateWorkUnit,
+            keys=UNIT_KEYS,
+            rows=rows,
+            values={
+                "status": "failed",
+                "attempts": table.c.attempts + 1,
+                "last_error": error[:1024],
+                "updated_at": _now(),
+                "lease_owner": None,
+                "lease_expires_at": None,
+            },
+        )
+
+    def requeue_failed(self, dataset_id: str, year: int) -> int:
+        """Set failed units back to pending so the next run retries them."""
+        failed = self.get_units(dataset_id, year, "failed")
+        return self.db_client.bulk_update(
+            model=EstimateWorkUnit,
+            keys=UNIT_KEYS,
+            rows=[{k: u[k] for k in UNIT_KEYS} for u in failed],
+            values={"status": "pending", "updated_at": _now()},
+        )
+
+    def claim(
+        self,
+        dataset_id: str,
+        year: int,
+        owner: str,
+        limit: int,
+        lease_seconds: float,
+        attempts: int = 3,
+    ) -> List[Dict]:
+        """
+        Lease up to `limit` claimable pending units (never leased, or lease
+        expired) to `owner`, highest priority first; they are returned in
+        that order. Each unit is taken with a compare-and-set update, so
+        concurrent claimers never get the same unit; the winners are read
+        back by a fresh lease token, stored in "lease_owner". A claimer that
+        loses every unit to another one reads the next candidates and tries
+        again, up to `attempts` times.
+        """
+        table = EstimateWorkUnit.__table__
+        token = f"{owner[:52]}/{uuid.uuid4().hex[:11]}"
+        for _ in range(attempts):
+            now = _now()
+            claimable = [
+                table.c.status == "pending",
+                or_(table.c.lease_owner.is_(None), table.c.lease_expires_at < now),
+            ]
+            stmt = (
+                select(*(table.c[k] for k in UNIT_KEYS))
+                .where(
+                    table.c.dataset_id == dataset_id, table.c.year == year, *claimable
+                )
+                .order_by(
+                    table.c.priority.desc(), *(table.c[k] for k in UNIT_KEYS[2:])
+                )
+                .limit(limit)
+            )
+            with self.db_client.session_scope() as session:
+                candidates = [dict(row._mapping) for row in session.execute(stmt)]
+            if not candidates:
+                return []
+            self.db_client.bulk_update(
+                model=EstimateWorkUnit,
+                keys=UNIT_KEYS,
+                rows=candidates,
+                values={
+                    "lease_owner": token,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                },
+                where=claimable,
+            )
+            claimed = self.db_client.select(
+                model=EstimateWorkUnit, filters={"lease_owner": token}
+            )
+            if claimed:
+                return sorted(claimed, key=lambda u: -(u["priority"] or 0))
+        return []
+
+    def heartbeat(self, tokens: List[str], lease_seconds: float) -> int:
+        """
+        Extend the leases of units still held under `tokens`; returns how
+        many units that was, fewer than were claimed once a lease is lost.
+        """
+        return self.db_client.bulk_update(
+            model=EstimateWorkUnit,
+            keys=["lease_owner"],
+            rows=[{"lease_owner": token} for token in tokens],
+            values={"lease_expires_at": _now() + timedelta(seconds=lease_seconds)},
+        )
+
+    def release(self, tokens: List[str]) -> int:
+        """
+        Give back units still held under `tokens` without finishing them;
+        returns how many were given back.
+        """
+        return self.db_client.bulk_update(
+            model=EstimateWorkUnit,
+            keys=["lease_owner"],
+            rows=[{"lease_owner": token} for token in tokens],
+            values={"lease_owner": None, "lease_expires_at": None},
+        )
+
+    def drop_pending(self, dataset_id: str, year: int, units: List[Dict]) -> int:
+        """
+        Delete pending units no live lease holds, e.g. ones a new plan no
+        longer contains; returns how many were asked for.
+        """
+        if not units:
+            return 0
+        table = EstimateWorkUnit.__table__
+        stmt = delete(table).where(
+            *(table.c[k] == bindparam(f"b_{k}") for k in UNIT_KEYS),
+            table.c.status == "pending",
+            or_(table.c.lease_owner.is_(None), table.c.lease_expires_at < _now()),
+        )
+        params = [
+            {
+                "b_dataset_id": dataset_id,
+                "b_year": year,
+                **{f"b_{k}": u[k] for k in UNIT_KEYS[2:]},
+            }
+            for u in units
+        ]
+        with self.db_client.session_scope() as session:
+            session.execute(stmt, params)
+        return len(units)
+
+    def count_units(
+        self, dataset_id: str, year: int, status: Optional[str] = None
+    ) -> int:
+        table = EstimateWorkUnit.__table__
+        stmt = select(func.count()).where(
+            table.c.dataset_id == dataset_id, table.c.year == year
+        )
+        if status is not None:
+            stmt = stmt.where(table.c.status == status)
+        with self.db_client.session_scope() as session:
+            return session.execute(stmt).scalar_one()
@@ -4,17 +4,38 @@ from typing import List, Dict, Optional
 from empowered.api.census import (
     get_groups as api_get_groups,
     get_variables as api_get_variables,
+    get_variable_catalog as api_get_variable_catalog,
     get_states as api_get_states,
     get_counties as api_get_counties,
     get_places as api_get_places,
+    get_tracts as api_get_tracts,
+    get_block_groups as api_get_block_groups,
     get_estimate as api_get_estimate,
     CensusAPIError,
+    VariableCatalog,
     validate_group_id as api_validate_group_id,
 )
 
+
+class InvalidGroupError(ValueError):
+    """Requested group ids the dataset's catalog does not have; retrying cannot help."""
+
+
 # ------------------ Groups ------------------
 
 
+def transform_groups(raw_groups: List[Dict]) -> List[Dict]:
+    # Transform raw API format into standardized service format
+    return [
+        {
+            "group_id": g.get("id") or g.get("name"),
+            "description": g.get("purpose") or g.get("description"),
+            "variables_count": g.get("variables_count", 0),
+        }
+        for g in raw_groups
+    ]
+
+
 def get_groups(acs_id: int, year: int) -> List[Dict]:
     """
     Transform raw API groups into:
@@ -25,15 +46,7 @@ def get_groups(acs_id: int, year: int) -> List[Dict]:
     """
     try:
         raw_groups = api_get_groups(acs_id, year)
-        # Transform raw API format into standardized service format
-        return [
-            {
-                "group_id": g.get("id") or g.get("name"),
-                "description": g.get("purpose") or g.get("description"),
-                "variables_count": g.get("variables_count", 0),
-            }
-            for g in raw_groups
-        ]
+        return transform_groups(raw_groups)
     except CensusAPIError as e:
         raise RuntimeError(f"Failed to fetch groups for ACS{acs_id} {year}: {e}")
 
@@ -45,6 +58,14 @@ def validate_group_id(acs_id: int, year: int, group_id: str) -> bool:
 # ------------------ Variables ------------------
 
 
+def transform_variables(raw_vars: List[Dict], group_id: str) -> List[Dict]:
+    return [
+        {"variable_id": v.get("id"), "description": v.get("label")}
+        for v in raw_vars
+        if v.get("id", "").startswith(group_id) and v.get("id", "").endswith("E")
+    ]
+
+
 def get_variables(acs_id: int, year: int, group_id: str) -> List[Dict]:
     """
     Transform raw API ariables into:
@@ -57,15 +78,38 @@ def get_variables(acs_id: int, year: int, group_id: str) -> List[Dict]:
         raise ValueError(f"Invalid group_id {group_id} for ACS{acs_id} {year}")
     try:
         raw_vars = api_get_variables(acs_id, year, group_id)
-        return [
-            {"variable_id": v.get("id"), "description": v.get("label")}
-            for v in raw_vars
-            if v.get("id", "").startswith(group_id) and v.get("id", "").endswith("E")
-        ]
+        return transform_variables(raw_vars, group_id)
     except CensusAPIError as e:
         raise RuntimeError(f"Failed to fetch variables for group {group_id}: {e}")
 
 
+def get_variables_by_group(
+    acs_id: int, year: int, group_ids: Optional[List[str]] = None
+) -> Dict[str, List[Dict]]:
+    """
+    Variables for many groups from the dataset's single variables.json:
+    {"B01003": [{"variable_id": "B01003_001E", "description": "..."}], ...}
+    Defaults to every group in the catalog.
+    """
+    try:
+        catalog = api_get_variable_catalog(acs_id, year)
+    except CensusAPIError as e:
+        raise RuntimeError(f"Failed to fetch variables for ACS{acs_id} {year}: {e}")
+    return catalog_variables_by_group(catalog, group_ids)
+
+
+def catalog_variables_by_group(
+    catalog: VariableCatalog, group_ids: Optional[List[str]] = None
+) -> Dict[str, List[Dict]]:
+    group_ids = catalog.group_ids() if group_ids is None else group_ids
+    missing = [gid for gid in group_ids if gid not in catalog]
+    if missing:
+        raise InvalidGroupError(f"Invalid group_id(s) {missing}")
+    return {
+        gid: transform_variables(catalog.variables(gid), gid) for gid in group_ids
+    }
+
+
 # ------------------ Geography ------------------
 
 
@@ -105,9 +149,39 @@ def get_places(
         )
 
 
+def get_tracts(acs_id: int, year: int, state_fips: int) -> List[Dict]:
+    try:
+        raw = api_get_tracts(acs_id, year, state_fips_code=state_fips)
+        return raw.get("tracts", [])
+    except CensusAPIError as e:
+        raise RuntimeError(
+            f"Failed to fetch tracts for ACS{acs_id} {year} state {state_fips}: {e}"
+        )
+
+
+def get_block_groups(
+    acs_id: int, year: int, state_fips: int, county_fips: str
+) -> List[Dict]:
+    try:
+        raw = api_get_block_groups(
+            acs_id, year, state_fips_code=state_fips, county_fips=county_fips
+        )
+        return raw.get("block_groups", [])
+    except CensusAPIError as e:
+        raise RuntimeError(
+            f"Failed to fetch block groups for ACS{acs_id} {year} county {state_fips}{county_fips}: {e}"
+        )
+
+
 # ------------------ Estimates ------------------
 
 
+def transform_estimates(raw: Dict) -> Dict[str, List[Dict]]:
+    # Raw format is already flat and columnar-decoded:
+    # {"estimates": [{"variable", "estimate", "margin_of_error", *_fips}, ...]}
+    return {"estimates": raw.get("estimates", [])}
+
+
 def get_estimates(
     acs_id: int,
     year: int,
@@ -115,13 +189,27 @@ def get_estimates(
     state_fips: Optional[int] = None,
     county_fips: Optional[int] = None,
     place_fips: Optional[int] = None,
+    group: Optional[str] = None,
+    margins: bool = False,
+    tract: Optional[str] = None,
+    block_group: Optional[str] = None,
 ) -> Dict[str, List[Dict]]:
     """
-    Transform raw API estimates into a dict mapping:
+    Fetch estimates as a flat list, one entry per geography and variable:
     {
-        "variable_id": [{"variable": var, "estimate": value}, ...],
-        ...
+        "estimates": [
+            {"variable": var, "estimate": value, "margin_of_error": moe,
+             "state_fips": ..., "county_fips": ..., "place_fips": ...},
+            ...
+        ]
     }
+
+    With `group` set, the whole table is fetched via get=group(TABLE) and
+    `variables` (if non-empty) selects which of its estimates to keep. With
+    `margins`, an explicit list also asks for each estimate's `_M` column,
+    so "margin_of_error" is filled from the same request. `tract` and
+    `block_group` (usually WILDCARD) ask for tracts or block groups instead,
+    whose entries also carry "tract_code" and "block_group".
     """
     try:
         raw = api_get_estimate(
@@ -131,18 +219,11 @@ def get_estimates(
             state_fips=state_fips,
             county_fips=county_fips,
             place_fips=place_fips,
+            group=group,
+            margins=margins,
+            tract=tract,
+            block_group=block_group,
         )
-        # Raw format: {"estimates": [[{"variable": var, "estimate": value}, ...], ...]}
-        estimates_dict = {}
-        for row in raw.get("estimates", []):
-            for entry in row:
-                var = entry["variable"]
-                if var not in estimates_dict:
-                    estimates_dict[var] = []
-                estimates_dict[var].append(entry)
-        flat_list = []
-        for entries in estimates_dict.values():
-            flat_list.extend(entries)
-        return {"estimates": flat_list}
+        return transform_estimates(raw)
     except CensusAPIError as e:
         raise RuntimeError(f"Failed to fetch estimates for ACS{acs_id} {year}: {e}")
@@ -0,0 +1,161 @@
+# empowered/services/census_service_async.py
+
+from typing import List, Dict, Optional
+from empowered.api.census_async import (
+    get_groups as api_get_groups,
+    get_variables as api_get_variables,
+    get_variable_catalog as api_get_variable_catalog,
+    get_states as api_get_states,
+    get_counties as api_get_counties,
+    get_places as api_get_places,
+    get_tracts as api_get_tracts,
+    get_block_groups as api_get_block_groups,
+    get_estimate as api_get_estimate,
+    validate_group_id as api_validate_group_id,
+)
+from empowered.api.census import CensusAPIError
+from empowered.services.census_service import (
+    catalog_variables_by_group,
+    transform_estimates,
+    transform_groups,
+    transform_variables,
+)
+
+# ------------------ Groups ------------------
+
+
+async def get_groups(acs_id: int, year: int) -> List[Dict]:
+    """Async counterpart of `census_service.get_groups`."""
+    try:
+        raw_groups = await api_get_groups(acs_id, year)
+        return transform_groups(raw_groups)
+    except CensusAPIError as e:
+        raise RuntimeError(f"Failed to fetch groups for ACS{acs_id} {year}: {e}")
+
+
+async def validate_group_id(acs_id: int, year: int, group_id: str) -> bool:
+    return await api_validate_group_id(acs_id, year, group_id)
+
+
+# ------------------ Variables ------------------
+
+
+async def get_variables(acs_id: int, year: int, group_id: str) -> List[Dict]:
+    """Async counterpart of `census_service.get_variables`."""
+    if not await validate_group_id(acs_id, year, group_id):
+        raise ValueError(f"Invalid group_id {group_id} for ACS{acs_id} {year}")
+    try:
+        raw_vars = await api_get_variables(acs_id, year, group_id)
+        return transform_variables(raw_vars, group_id)
+    except CensusAPIError as e:
+        raise RuntimeError(f"Failed to fetch variables for group {group_id}: {e}")
+
+
+async def get_variables_by_group(
+    acs_id: int, year: int, group_ids: Optional[List[str]] = None
+) -> Dict[str, List[Dict]]:
+    """Async counterpart of `census_service.get_variables_by_group`."""
+    try:
+        catalog = await api_get_variable_catalog(acs_id, year)
+    except CensusAPIError as e:
+        raise RuntimeError(f"Failed to fetch variables for ACS{acs_id} {year}: {e}")
+    return catalog_variables_by_group(catalog, group_ids)
+
+
+# ------------------ Geography ------------------
+
+
+async def get_states(
+    acs_id: int, year: int, state_name: Optional[str] = None
+) -> List[Dict]:
+    try:
+        raw = await api_get_states(acs_id, year, state_name)
+        return raw.get("states", [])
+    except CensusAPIError as e:
+        raise RuntimeError(f"Failed to fetch states for ACS{acs_id} {year}: {e}")
+
+
+async def get_counties(
+    acs_id: int, year: int, state_fips: int, county_name: Optional[str] = None
+) -> List[Dict]:
+    try:
+        raw = await api_get_counties(
+            acs_id, year, fips_code=state_fips, county_name=county_name
+        )
+        return raw.get("counties", [])
+    except CensusAPIError as e:
+        raise RuntimeError(
+            f"Failed to fetch counties for ACS{acs_id} {year} state {state_fips}: {e}"
+        )
+
+
+async def get_places(
+    acs_id: int, year: int, state_fips: int, place_name: Optional[str] = None
+) -> List[Dict]:
+    try:
+        raw = await api_get_places(
+            acs_id, year, state_fips_code=state_fips, place_name=place_name
+        )
+        return raw.get("places", [])
+    except CensusAPIError as e:
+        raise RuntimeError(
+            f"Failed to fetch places for ACS{acs_id} {year} state {state_fips}: {e}"
+        )
+
+
+async def get_tracts(acs_id: int, year: int, state_fips: int) -> List[Dict]:
+    try:
+        raw = await api_get_tracts(acs_id, year, state_fips_code=state_fips)
+        return raw.get("tracts", [])
+    except CensusAPIError as e:
+        raise RuntimeError(
+            f"Failed to fetch tracts for ACS{acs_id} {year} state {state_fips}: {e}"
+        )
+
+
+async def get_block_groups(
+    acs_id: int, year: int, state_fips: int, county_fips: str
+) -> List[Dict]:
+    try:
+        raw = await api_get_block_groups(
+            acs_id, year, state_fips_code=state_fips, county_fips=county_fips
+        )
+        return raw.get("block_groups", [])
+    except CensusAPIError as e:
+        raise RuntimeError(
+            f"Failed to fetch block groups for ACS{acs_id} {year} county {state_fips}{county_fips}: {e}"
+        )
+
+
+# ------------------ Estimates ------------------
+
+
+async def get_estimates(
+    acs_id: int,
+    year: int,
+    variables: List[str],
+    state_fips: Optional[int] = None,
+    county_fips: Optional[int] = None,
+    place_fips: Optional[int] = None,
+    group: Optional[str] = None,
+    margins: bool = False,
+    tract: Optional[str] = None,
+    block_group: Optional[str] = None,
+) -> Dict[str, List[Dict]]:
+    """Async counterpart of `census_service.get_estimates`."""
+    try:
+        raw = await api_get_estimate(
+            acs_id=acs_id,
+            year=year,
+            variables=variables,
+            state_fips=state_fips,
+            county_fips=county_fips,
+            place_fips=place_fips,
+            group=group,
+            margins=margins,
+            tract=tract,
+            block_group=block_group,
+        )
+        return transform_estimates(raw)
+    except CensusAPIError as e:
+        raise RuntimeError(f"Failed to fetch estimates for ACS{acs_id} {year}: {e}")
@@ -16,6 +16,13 @@ def get_census_api_key(key_name: str = "CENSUS_API_KEY") -> str:
     return os.getenv(key_name)
 
 
+@lru_cache(maxsize=1)
+def get_census_api_base_url(key_name: str = "CENSUS_API_BASE_URL") -> str:
+    """Root of the Census API; point at a local stand-in server for offline runs."""
+    load_dotenv()
+    return os.getenv(key_name, "https://api.census.gov").rstrip("/")
+
+
 def get_sql_client() -> SQLClient:
     """
     Loads SQL server client instance.
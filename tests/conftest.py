@@ -0,0 +1,19 @@
+import os
+import tempfile
+
+# empowered.models.sql.db builds its client at import; point it at a
+# throwaway SQLite file before any test imports the package
+os.environ.setdefault(
+    "SQL_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'empowered.db')}"
+)
+os.environ.setdefault("CENSUS_CACHE_DISABLED", "1")
+
+import pytest
+
+from empowered.models.sql.sql_client import SQLClient
+
+
+@pytest.fixture
+def db_client(tmp_path) -> SQLClient:
+    """A fresh SQLite database with every table created."""
+    return SQLClient(url=f"sqlite:///{tmp_path / 'ingest.db'}")
@@ -0,0 +1,116 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from empowered.api import census_async
+from empowered.api.transport import AsyncResponse
+from empowered.ingest.adaptive import AdaptiveLimiter
+
+
+def limiter(**kwargs) -> AdaptiveLimiter:
+    options = dict(initial=4, maximum=8, window=10, cooldown=0.0, latency_floor=0.0)
+    options.update(kwargs)
+    return AdaptiveLimiter("TEST", **options)
+
+
+def test_healthy_windows_add_one_slot_each():
+    control = limiter()
+    for _ in range(3):
+        for _ in range(10):
+            control.observe(0.1)
+
+    assert control.stats()["limit"] == 7
+    assert control.baseline_p95 == pytest.approx(0.1)
+
+
+def test_limit_stops_at_its_maximum():
+    control = limiter(initial=7)
+    for _ in range(50):
+        control.observe(0.1)
+    assert control.stats()["limit"] == 8
+
+
+def test_congestion_halves_the_limit_at_once():
+    control = limiter(initial=8)
+    control.observe(1.0, asyncio.TimeoutError())
+
+    assert control.stats()["limit"] == 4
+    assert control.stats()["congestion"] == 1
+
+
+def test_cuts_within_the_cooldown_count_once():
+    control = limiter(initial=8, cooldown=60.0)
+    for _ in range(5):
+        control.observe(1.0, TimeoutError())
+    assert control.stats()["limit"] == 4
+    assert control.stats()["decreases"] == 1
+
+
+def test_error_rate_and_slow_windows_decrease():
+    errors = limiter(initial=8)
+    for n in range(10):
+        errors.observe(0.1, ValueError() if n < 2 else None)
+    assert errors.stats()["limit"] == 4
+
+    slow = limiter(initial=8, maximum=16)
+    for _ in range(10):
+        slow.observe(0.1)
+    assert slow.stats()["limit"] == 9
+    for _ in range(10):
+        slow.observe(1.0)
+    assert slow.stats()["limit"] == 4
+
+
+def test_limit_never_goes_below_its_minimum():
+    control = limiter(initial=2, minimum=2)
+    control.observe(1.0, TimeoutError())
+    assert control.stats()["limit"] == 2
+
+
+def test_slots_admit_only_up_to_the_limit():
+    control = limiter(initial=2, maximum=2)
+    running = []
+    peak = []
+
+    async def call():
+        async with control.slot():
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.001)
+            running.pop()
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(10)))
+
+    asyncio.run(main())
+    assert max(peak) == 2
+    assert control.stats()["in_flight"] == 0
+
+
+def test_fetch_slot_is_taken_after_the_rate_limiter(monkeypatch):
+    events = []
+
+    class Limiter:
+        async def acquire_async(self, key):
+            events.append("limiter")
+
+        def observe(self, status, headers):
+            return None
+
+    class Transport:
+        async def get(self, url):
+            events.append("send")
+            return AsyncResponse(url=url, status=200, headers={}, text="[]")
+
+    @asynccontextmanager
+    async def slot():
+        events.append("slot")
+        yield
+
+    monkeypatch.setattr(census_async, "get_rate_limiter", Limiter)
+    monkeypatch.setattr(census_async, "get_async_transport", Transport)
+    monkeypatch.setattr(census_async, "_fetch_slot", slot)
+
+    assert asyncio.run(census_async._fetch_text("https://x/?key=k", "test")) == "[]"
+    assert events == ["limiter", "slot", "send"]
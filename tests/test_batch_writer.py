@@ -0,0 +1,24 @@
+import asyncio
+
+from empowered.ingest.batch_writer import BatchWriter
+
+
+def test_every_put_is_written_while_timeouts_race_gets():
+    written = []
+
+    async def flush(key, rows, tokens):
+        written.extend(rows)
+
+    async def run():
+        writer = BatchWriter(
+            flush, batch_rows=1000, max_delay=0.0005, queue_size=4, writers=3
+        ).start()
+        for i in range(2000):
+            await writer.put("k", [{"n": i}])
+            if i % 7 == 0:
+                await asyncio.sleep(0.0005)
+        return await writer.close()
+
+    stats = asyncio.run(run())
+    assert sorted(row["n"] for row in written) == list(range(2000))
+    assert stats["rows_written"] == 2000
@@ -0,0 +1,12 @@
+from empowered.api import cache
+
+
+def test_disabled_cache_is_remembered(monkeypatch):
+    loads = []
+    monkeypatch.setattr(cache, "_cache", None)
+    monkeypatch.setattr(cache, "load_dotenv", lambda: loads.append(1))
+    monkeypatch.setenv("CENSUS_CACHE_DISABLED", "1")
+
+    assert cache.get_response_cache() is None
+    assert cache.get_response_cache() is None
+    assert len(loads) == 1
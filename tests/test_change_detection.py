@@ -0,0 +1,141 @@
+import asyncio
+
+from empowered.ingest import ingest_census
+from empowered.models.sql.schemas import (
+    CensusCounty,
+    CensusDataset,
+    CensusGroup,
+    CensusPlace,
+    CensusState,
+    CensusVariable,
+)
+from empowered.repositories.census import (
+    FingerprintRepository,
+    GeographyRepository,
+    GroupsRepository,
+    VariablesRepository,
+    YearsAvailableRepository,
+)
+
+DATASET = {"id": "acs5", "frequency": "5"}
+GROUPS = [
+    {"group_id": "B01003", "description": "Total population", "variables_count": 1},
+    {"group_id": "B19013", "description": "Median income", "variables_count": 1},
+]
+VARIABLES = {
+    "B01003": [{"variable_id": "B01003_001E", "description": "Total"}],
+    "B19013": [{"variable_id": "B19013_001E", "description": "Median"}],
+}
+STATE = {
+    "state_fips": "36",
+    "state_name": "New York",
+    "counties": [{"county_fips": "001", "county_name": "Albany County"}],
+    "places": [{"place_fips": "01000", "place_name": "Albany city"}],
+}
+
+
+def make_repos(db_client):
+    db_client.insert([CensusDataset(id="acs5", code="acs5", frequency="5")])
+    repos = {
+        "group": GroupsRepository(db_client),
+        "variable": VariablesRepository(db_client),
+        "geography": GeographyRepository(db_client),
+        "year": YearsAvailableRepository(db_client),
+        "fingerprints": FingerprintRepository(db_client),
+    }
+    for year in (2019, 2024):
+        repos["year"].insert_year(dataset_id="acs5", year=year)
+    return repos
+
+
+async def ingest_vintage(repos, year, groups, variables, state):
+    previous = await ingest_census.load_previous_vintage(
+        DATASET, year, repos["fingerprints"], repos["year"]
+    )
+    await ingest_census.ingest_groups_and_variables_to_db(
+        DATASET,
+        year,
+        groups,
+        variables,
+        repos["group"],
+        repos["variable"],
+        repos["year"],
+        previous=previous,
+        fingerprint_repo=repos["fingerprints"],
+    )
+    await ingest_census.ingest_geography_to_db(
+        DATASET,
+        year,
+        [state],
+        repos["geography"],
+        repos["year"],
+        previous=previous,
+        fingerprint_repo=repos["fingerprints"],
+    )
+    return previous
+
+
+def year_id(repos, year):
+    return repos["year"].get_years(dataset_id="acs5", year=year)[0]["id"]
+
+
+def test_identical_vintage_is_linked(db_client):
+    repos = make_repos(db_client)
+    asyncio.run(ingest_vintage(repos, 2019, GROUPS, VARIABLES, STATE))
+    previous = asyncio.run(ingest_vintage(repos, 2024, GROUPS, VARIABLES, STATE))
+
+    assert previous["year"] == 2019
+    for year in (2019, 2024):
+        filters = {"dataset_id": "acs5", "year_id": year_id(repos, year)}
+        groups = db_client.select(model=CensusGroup, filters=filters)
+        variables = db_client.select(model=CensusVariable, filters=filters)
+        assert sorted(g["id"] for g in groups) == ["B01003", "B19013"]
+        assert sorted(v["id"] for v in variables) == ["B01003_001E", "B19013_001E"]
+        for model in (CensusState, CensusCounty, CensusPlace):
+            assert len(db_client.select(model=model, filters=filters)) == 1
+    assert repos["fingerprints"].get_fingerprints(
+        "acs5", 2024
+    ) == repos["fingerprints"].get_fingerprints("acs5", 2019)
+
+
+def test_changed_group_is_written_from_the_response(db_client):
+    repos = make_repos(db_client)
+    asyncio.run(ingest_vintage(repos, 2019, GROUPS, VARIABLES, STATE))
+    changed = {
+        **VARIABLES,
+        "B19013": [{"variable_id": "B19013_001E", "description": "Median (2024 $)"}],
+    }
+    asyncio.run(ingest_vintage(repos, 2024, GROUPS, changed, STATE))
+
+    variables = db_client.select(
+        model=CensusVariable,
+        filters={"dataset_id": "acs5", "year_id": year_id(repos, 2024)},
+    )
+    assert {v["id"]: v["description"] for v in variables} == {
+        "B01003_001E": "Total",
+        "B19013_001E": "Median (2024 $)",
+    }
+
+
+def test_acs1_and_acs5_store_the_same_group_codes(db_client):
+    repos = make_repos(db_client)
+    db_client.insert([CensusDataset(id="acs1", code="acs1", frequency="1")])
+    repos["year"].insert_year(dataset_id="acs1", year=2024)
+    for dataset in (DATASET, {"id": "acs1", "frequency": "1"}):
+        asyncio.run(
+            ingest_census.ingest_groups_and_variables_to_db(
+                dataset,
+                2024,
+                GROUPS,
+                VARIABLES,
+                repos["group"],
+                repos["variable"],
+                repos["year"],
+            )
+        )
+
+    for dataset_id in ("acs1", "acs5"):
+        groups = db_client.select(
+            model=CensusGroup, filters={"dataset_id": dataset_id}
+        )
+        assert sorted(g["id"] for g in groups) == ["B01003", "B19013"]
@@ -0,0 +1,113 @@
+import json
+import math
+
+import numpy as np
+
+from empowered.api.decode import (
+    GEOGRAPHY_COLUMNS,
+    SENTINELS,
+    decode_estimates,
+    to_numeric,
+)
+
+HEADER = ["NAME", "B01003_001E", "B01003_001M", "B19013_001E", "state", "place"]
+ROWS = [
+    ["Albany city", "99224", "25", "54736", "36", "01000"],
+    ["Amsterdam city", "18219", "-555555555", "-666666666", "36", "02066"],
+    ["Auburn city", None, None, "", "36", "03320"],
+]
+TEXT = json.dumps([HEADER, *ROWS])
+
+
+def rowwise_records(payload):
+    """The row-wise transform the columnar decoder replaced, with its
+    estimate strings converted the way insert_estimates converted them."""
+    header, rows = payload[0], payload[1:]
+    index = {name: i for i, name in enumerate(header)}
+    variables = [n for n in header if n.endswith("E") and "_" in n]
+    by_variable = {}
+    for row in rows:
+        geo = dict.fromkeys(GEOGRAPHY_COLUMNS.values())
+        for name, key in GEOGRAPHY_COLUMNS.items():
+            if name in index:
+                geo[key] = row[index[name]]
+        for var in variables:
+            m = index.get(var[:-1] + "M")
+            by_variable.setdefault(var, []).append(
+                {
+                    "variable": var,
+                    "estimate": row[index[var]],
+                    "margin_of_error": row[m] if m is not None else None,
+                    **geo,
+                }
+            )
+
+    def number(value):
+        if value in (None, ""):
+            return None
+        value = float(value)
+        return None if value in SENTINELS else value
+
+    records = []
+    for entries in by_variable.values():
+        for entry in entries:
+            estimate = number(entry["estimate"])
+            if estimate is not None:
+                records.append(
+                    {
+                        **entry,
+                        "estimate": estimate,
+                        "margin_of_error": number(entry["margin_of_error"]),
+                    }
+                )
+    return records
+
+
+def test_sentinels_and_blanks_become_nan():
+    values = ["12", "-666666666", None, "", "n/a", *map(str, SENTINELS), 3]
+    array = to_numeric(values)
+
+    assert array.dtype == np.float64
+    assert array[0] == 12.0 and array[-1] == 3.0
+    assert np.isnan(array[1:-1]).all()
+
+
+def test_estimates_are_paired_with_their_margins():
+    table = decode_estimates(TEXT)
+
+    assert table.variables == ["B01003_001E", "B19013_001E"]
+    assert len(table) == 3
+    assert list(table.margins) == ["B01003_001E"]
+    assert table.margins["B01003_001E"][0] == 25.0
+    assert math.isnan(table.margins["B01003_001E"][1])
+    assert table.geography == {
+        "state_fips": ["36", "36", "36"],
+        "place_fips": ["01000", "02066", "03320"],
+    }
+
+
+def test_null_estimates_are_skipped_and_null_margins_are_none():
+    records = decode_estimates(TEXT).to_records()
+
+    assert {(r["variable"], r["place_fips"]) for r in records} == {
+        ("B01003_001E", "01000"),
+        ("B01003_001E", "02066"),
+        ("B19013_001E", "01000"),
+    }
+    amsterdam = next(r for r in records if r["place_fips"] == "02066")
+    assert amsterdam["estimate"] == 18219.0
+    assert amsterdam["margin_of_error"] is None
+    assert all(
+        r["margin_of_error"] is None
+        for r in records
+        if r["variable"] == "B19013_001E"
+    )
+
+
+def test_records_match_the_rowwise_transform():
+    assert decode_estimates(TEXT).to_records() == rowwise_records(json.loads(TEXT))
+
+
+def test_explicit_variables_keep_their_order_and_drop_missing_columns():
+    table = decode_estimates(TEXT, ["B19013_001E", "B99999_001E", "B01003_001E"])
+    assert table.variables == ["B19013_001E", "B01003_001E"]
@@ -0,0 +1,32 @@
+import asyncio
+
+from empowered.ingest import ingest_census
+from empowered.models.sql.schemas import IngestionCheckpoint
+from empowered.repositories.census import (
+    CensusEstimateRepository,
+    GeographyRepository,
+    VariablesRepository,
+    WorkUnitRepository,
+    YearsAvailableRepository,
+)
+from empowered.repositories.census.checkpoint_repository import CheckpointRepository
+
+
+def test_dry_run_writes_nothing(db_client):
+    report = asyncio.run(
+        ingest_census.estimate_ingest_cost(
+            {"id": "acs5", "frequency": "5"},
+            2024,
+            variables_repo=VariablesRepository(db_client),
+            geo_repo=GeographyRepository(db_client),
+            estimates_repo=CensusEstimateRepository(db_client),
+            year_repo=YearsAvailableRepository(db_client),
+            checkpoint_repo=CheckpointRepository(db_client),
+            work_unit_repo=WorkUnitRepository(db_client),
+        )
+    )
+
+    # no checkpoint counts as nothing ingested yet
+    assert report["metadata_requests"] > 2
+    assert report["estimate_requests"] is None
+    assert db_client.select(model=IngestionCheckpoint) == []
@@ -0,0 +1,72 @@
+from sqlalchemy import create_engine, inspect, text
+
+from empowered.models.sql.schemas import CensusGroup, CensusVariable
+from empowered.models.sql.sql_client import SQLClient
+
+# CensusGroup and CensusVariable as they were created while `id` alone
+# was their key
+OLD_TABLES = [
+    'CREATE TABLE "CensusDataset" (id VARCHAR(255) PRIMARY KEY, '
+    "code VARCHAR(255) NOT NULL, frequency VARCHAR(255) NOT NULL)",
+    'CREATE TABLE "CensusAvailableYear" (id INTEGER PRIMARY KEY, '
+    "dataset_id VARCHAR(255) NOT NULL, year INTEGER NOT NULL)",
+    'CREATE TABLE "CensusGroup" (id VARCHAR(255) NOT NULL PRIMARY KEY, '
+    "description VARCHAR(255) NOT NULL, dataset_id VARCHAR(255) NOT NULL, "
+    "year_id INTEGER NOT NULL, variables_count INTEGER NOT NULL, "
+    "CONSTRAINT uq_group UNIQUE (dataset_id, year_id, id))",
+    'CREATE INDEX "ix_CensusGroup_dataset_id" ON "CensusGroup" (dataset_id)',
+    'CREATE TABLE "CensusVariable" (id VARCHAR(255) NOT NULL PRIMARY KEY, '
+    "description VARCHAR(255) NOT NULL, group_id VARCHAR(255) NOT NULL "
+    'REFERENCES "CensusGroup" (id), dataset_id VARCHAR(255) NOT NULL, '
+    "year_id INTEGER NOT NULL, "
+    "CONSTRAINT uq_variable UNIQUE (dataset_id, year_id, group_id, id))",
+    'CREATE INDEX "ix_CensusVariable_group_id" ON "CensusVariable" (group_id)',
+    """INSERT INTO "CensusGroup" VALUES ('B01003', 'Total', 'acs5', 1, 1)""",
+    """INSERT INTO "CensusVariable"
+       VALUES ('B01003_001E', 'Total', 'B01003', 'acs5', 1)""",
+]
+
+
+def test_old_single_id_keys_are_migrated_on_startup(tmp_path):
+    url = f"sqlite:///{tmp_path / 'old.db'}"
+    with create_engine(url).begin() as conn:
+        for statement in OLD_TABLES:
+            conn.execute(text(statement))
+
+    client = SQLClient(url=url)
+    inspector = inspect(client.engine)
+    assert inspector.get_pk_constraint("CensusGroup")["constrained_columns"] == [
+        "dataset_id",
+        "year_id",
+        "id",
+    ]
+    assert inspector.get_pk_constraint("CensusVariable")["constrained_columns"] == [
+        "dataset_id",
+        "year_id",
+        "group_id",
+        "id",
+    ]
+    assert [g["id"] for g in client.select(model=CensusGroup)] == ["B01003"]
+
+    # the same codes for another dataset no longer collide
+    client.insert(
+        [
+            CensusGroup(
+                id="B01003",
+                description="Total population",
+                dataset_id="acs1",
+                year_id=2,
+                variables_count=1,
+            ),
+            CensusVariable(
+                id="B01003_001E",
+                description="Total",
+                group_id="B01003",
+                dataset_id="acs1",
+                year_id=2,
+            ),
+        ]
+    )
+    assert len(client.select(model=CensusVariable)) == 2
+    # and a second start finds nothing left to migrate
+    assert SQLClient(url=url).select(model=CensusGroup)
@@ -0,0 +1,60 @@
+import json
+
+from empowered.api import rate_limit
+from empowered.api.rate_limit import QuotaLedger, _utc_today
+
+
+def test_processes_sharing_a_ledger_add_up(tmp_path):
+    path = tmp_path / "quota_ledger.json"
+    first = QuotaLedger(path, daily_limit=0, block_size=5)
+    second = QuotaLedger(path, daily_limit=0, block_size=5)
+    for _ in range(7):
+        assert first.try_consume("k")
+        assert second.try_consume("k")
+    first.flush()
+    second.flush()
+
+    assert json.loads(path.read_text()) == {_utc_today(): {"k": 14}}
+    assert QuotaLedger(path).used("k") == 14
+
+
+def test_shared_budget_is_not_overspent(tmp_path):
+    path = tmp_path / "quota_ledger.json"
+    first = QuotaLedger(path, daily_limit=30, block_size=10)
+    second = QuotaLedger(path, daily_limit=30, block_size=10)
+    granted = 0
+    for _ in range(30):
+        granted += first.try_consume("k")
+        granted += second.try_consume("k")
+
+    assert granted == 30
+    assert QuotaLedger(path).used("k") == 30
+
+
+def test_rolling_over_keeps_the_new_days_reservations(tmp_path, monkeypatch):
+    path = tmp_path / "quota_ledger.json"
+    first = QuotaLedger(path, daily_limit=0, block_size=5)
+    second = QuotaLedger(path, daily_limit=0, block_size=5)
+    assert first.try_consume("k")
+    assert second.try_consume("k")
+
+    monkeypatch.setattr(rate_limit, "_utc_today", lambda: "2099-01-02")
+    assert second.try_consume("k")
+    assert first.try_consume("k")
+    assert json.loads(path.read_text()) == {"2099-01-02": {"k": 10}}
+
+    first.flush()
+    second.flush()
+    assert json.loads(path.read_text()) == {"2099-01-02": {"k": 2}}
+
+
+def test_flush_after_midnight_leaves_the_new_day_alone(tmp_path, monkeypatch):
+    path = tmp_path / "quota_ledger.json"
+    stale = QuotaLedger(path, daily_limit=0, block_size=5)
+    assert stale.try_consume("k")
+
+    monkeypatch.setattr(rate_limit, "_utc_today", lambda: "2099-01-02")
+    fresh = QuotaLedger(path, daily_limit=0, block_size=5)
+    assert fresh.try_consume("k")
+    stale.flush()
+    assert json.loads(path.read_text()) == {"2099-01-02": {"k": 5}}
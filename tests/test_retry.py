@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from empowered.ingest.ingest_census import retry_async
+from empowered.services.census_service import (
+    InvalidGroupError,
+    catalog_variables_by_group,
+)
+
+
+def test_invalid_group_is_not_retried():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return catalog_variables_by_group({}, ["B99999"])
+
+    with pytest.raises(InvalidGroupError):
+        asyncio.run(retry_async(load, initial_backoff=0))
+    assert len(calls) == 1
+
+
+def test_transient_errors_are_retried():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("reset")
+        return "ok"
+
+    assert asyncio.run(retry_async(flaky, initial_backoff=0)) == "ok"
+    assert len(calls) == 3
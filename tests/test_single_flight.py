@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from empowered.api.single_flight import SingleFlight
+
+
+def test_concurrent_async_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch(url):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {"url": url}
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do_async("a", fetch, "a") for _ in range(5)),
+            flight.do_async("b", fetch, "b"),
+        )
+
+    results = asyncio.run(main())
+    assert calls == ["a", "b"]
+    assert results[:5] == [{"url": "a"}] * 5
+    assert flight.stats() == {"executed": 2, "coalesced": 4}
+
+
+def test_async_exception_reaches_every_waiter():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("reset")
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do_async("k", fail) for _ in range(3)), return_exceptions=True
+        )
+
+    errors = asyncio.run(main())
+    assert all(isinstance(e, ConnectionError) for e in errors)
+    assert flight.stats()["executed"] == 1
+
+
+def test_finished_calls_are_not_cached():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        return [await flight.do_async("k", fetch) for _ in range(2)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_threads_share_one_execution_and_its_exception():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    outcomes = []
+
+    def fail():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        raise ValueError("bad group")
+
+    def call():
+        try:
+            flight.do("k", fail)
+        except ValueError as e:
+            outcomes.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=call) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while flight.stats()["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(outcomes) == 4 and len({id(e) for e in outcomes}) == 1
+    with pytest.raises(ValueError):
+        flight.do("k", fail)
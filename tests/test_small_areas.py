@@ -0,0 +1,96 @@
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+from empowered.api.census import (
+    block_groups_url,
+    estimate_url,
+    parse_block_groups,
+    parse_tracts,
+    tracts_url,
+)
+from empowered.api.decode import decode_estimates
+from empowered.api.standin import SyntheticCensus
+from empowered.models.sql.schemas import (
+    CensusBlockGroup,
+    CensusBlockGroupEstimate,
+    CensusTract,
+    CensusTractEstimate,
+)
+from empowered.repositories.census import (
+    CensusEstimateRepository,
+    GeographyRepository,
+)
+
+CENSUS = SyntheticCensus(
+    counties_per_state=2, tracts_per_county=3, block_groups_per_tract=2
+)
+
+
+def fetch(url: str):
+    """Answer a client-built URL from the synthetic stand-in."""
+    parts = urlsplit(url)
+    query = {}
+    for k, v in parse_qsl(parts.query, keep_blank_values=True):
+        query.setdefault(k, []).append(v)
+    status, body = CENSUS.respond(parts.path, query)
+    assert status == 200
+    return body
+
+
+def test_standin_serves_tracts_and_block_groups(db_client):
+    geo_repo = GeographyRepository(db_client)
+    tracts = parse_tracts(json.loads(fetch(tracts_url(5, 2024, "36", "k"))), "36")
+    block_groups = parse_block_groups(
+        json.loads(fetch(block_groups_url(5, 2024, "36", "001", "k"))), "36", "001"
+    )
+
+    assert geo_repo.insert_tracts(tracts["tracts"], "acs5", 1) == 6
+    assert geo_repo.insert_block_groups(block_groups["block_groups"], "acs5", 1) == 6
+    assert {t["county_fips"] for t in db_client.select(model=CensusTract)} == {1, 3}
+    assert {
+        (b["tract_code"], b["block_group"])
+        for b in db_client.select(model=CensusBlockGroup)
+    } == {(t, b) for t in (100, 200, 300) for b in (1, 2)}
+
+
+def test_small_area_estimates_round_trip(db_client):
+    estimates_repo = CensusEstimateRepository(db_client)
+    levels = {
+        "tract": estimate_url(
+            5,
+            2024,
+            ["B01003_001E"],
+            state_fips="36",
+            tract="*",
+            margins=True,
+            api_key="k",
+        ),
+        "block_group": estimate_url(
+            5,
+            2024,
+            ["B01003_001E"],
+            state_fips="36",
+            county_fips="003",
+            block_group="*",
+            margins=True,
+            api_key="k",
+        ),
+    }
+    for level, url in levels.items():
+        records = decode_estimates(fetch(url)).to_records()
+        with db_client.session_scope() as session:
+            inserted = estimates_repo.insert_small_area_estimates(
+                level=level,
+                year_id=1,
+                dataset_id="acs5",
+                estimates=records,
+                session=session,
+            )
+        assert inserted == len(records) > 0
+
+    tract_rows = db_client.select(model=CensusTractEstimate)
+    assert {r["county_fips"] for r in tract_rows} <= {1, 3}
+    assert any(r["margin_of_error"] is not None for r in tract_rows)
+    block_group_rows = db_client.select(model=CensusBlockGroupEstimate)
+    assert {r["county_fips"] for r in block_group_rows} == {3}
+    assert {r["block_group"] for r in block_group_rows} == {1, 2}
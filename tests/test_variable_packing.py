@@ -0,0 +1,65 @@
+from empowered.ingest.ingest_census import (
+    VARS_PER_REQUEST,
+    pack_variables,
+    plan_variable_requests,
+)
+
+
+def group(gid: str, count: int) -> list:
+    return [{"variable_id": f"{gid}_{i:03d}E"} for i in range(1, count + 1)]
+
+
+def test_requests_never_exceed_fifty_variables():
+    groups = {f"B{n:05d}": group(f"B{n:05d}", 13) for n in range(10)}
+    plan = plan_variable_requests(groups, margins=False)
+
+    assert VARS_PER_REQUEST == 50
+    assert all(len(r["variables"]) <= 50 for r in plan)
+    # 130 variables fit in the minimum of three requests
+    assert len(plan) == 3
+    assert sorted(v for r in plan for v in r["variables"]) == sorted(
+        v["variable_id"] for variables in groups.values() for v in variables
+    )
+
+
+def test_margins_halve_the_variables_per_request():
+    groups = {"B01001": group("B01001", 20), "B01002": group("B01002", 20)}
+    assert len(plan_variable_requests(groups, margins=False)) == 1
+    assert len(plan_variable_requests(groups, margins=True)) == 2
+
+    # 30 variables no longer fit a request of 25 with their margins
+    wide = {"B01001": group("B01001", 30)}
+    assert plan_variable_requests(wide, margins=False)[0]["group"] is None
+    assert plan_variable_requests(wide, margins=True)[0]["group"] == "B01001"
+    explicit = plan_variable_requests(wide, use_groups=False, margins=True)
+    assert [len(r["variables"]) for r in explicit] == [25, 5]
+
+
+def test_large_tables_fall_back_to_group_requests():
+    groups = {"B17001": group("B17001", 59), "B01003": group("B01003", 1)}
+
+    plan = plan_variable_requests(groups, margins=False)
+    b17001 = [v["variable_id"] for v in groups["B17001"]]
+    assert {"group": "B17001", "variables": b17001} in plan
+    assert {"group": None, "variables": ["B01003_001E"]} in plan
+
+    explicit = plan_variable_requests(groups, use_groups=False, margins=False)
+    assert all(r["group"] is None for r in explicit)
+    assert [len(r["variables"]) for r in explicit] == [50, 9, 1]
+
+
+def test_variables_shared_by_groups_are_requested_once():
+    shared = {"variable_id": "B01003_001E"}
+    groups = {"B01003": [shared], "B01004": [shared, {"variable_id": "B01004_001E"}]}
+
+    plan = plan_variable_requests(groups, margins=False)
+    assert plan == [{"group": None, "variables": ["B01003_001E", "B01004_001E"]}]
+
+
+def test_pack_splits_groups_only_when_that_saves_a_request():
+    whole = pack_variables([["a"] * 30, ["b"] * 20, ["c"] * 20], 50)
+    assert sorted(map(len, whole)) == [20, 50]
+
+    # three groups of 30 fit two requests only if one is split
+    split = pack_variables([[f"{g}{i}" for i in range(30)] for g in "abc"], 50)
+    assert [len(b) for b in split] == [50, 40]
@@ -0,0 +1,69 @@
+from empowered.ingest.ingest_census import rows_of_units
+from empowered.repositories.census import WorkUnitRepository
+
+
+def unit(place: str, batch: str = "group:B01003") -> dict:
+    return {
+        "state_fips": "36",
+        "geo_level": "place",
+        "geo_code": place,
+        "batch_key": batch,
+    }
+
+
+def expire_leases(repo: WorkUnitRepository, tokens):
+    repo.heartbeat(tokens, lease_seconds=-1)
+
+
+def test_mark_done_skips_units_whose_lease_was_taken(db_client):
+    repo = WorkUnitRepository(db_client)
+    repo.add_units("acs5", 2024, [unit("01000"), unit("02000")])
+    first = repo.claim("acs5", 2024, "a", limit=2, lease_seconds=60)
+    token = first[0]["lease_owner"]
+    expire_leases(repo, [token])
+    second = repo.claim("acs5", 2024, "b", limit=1, lease_seconds=60)
+    assert len(second) == 1
+
+    stale = [{**u, "lease_owner": token} for u in first]
+    assert repo.heartbeat([token], lease_seconds=60) == 1
+    assert repo.held_units("acs5", 2024, stale) == [
+        u for u in stale if u["geo_code"] != second[0]["geo_code"]
+    ]
+    assert [u["geo_code"] for u in repo.lost_units("acs5", 2024, stale)] == [
+        second[0]["geo_code"]
+    ]
+    assert repo.mark_done("acs5", 2024, stale) == 1
+    assert repo.count_units("acs5", 2024, "pending") == 1
+    assert repo.release([token]) == 0
+
+
+def test_mark_done_without_lease_needs_an_unleased_unit(db_client):
+    repo = WorkUnitRepository(db_client)
+    repo.add_units("acs5", 2024, [unit("01000")])
+    assert repo.mark_done("acs5", 2024, [unit("01000")]) == 1
+    assert repo.count_units("acs5", 2024, "done") == 1
+
+
+def test_add_units_skips_known_units_and_reprioritizes_pending(db_client):
+    repo = WorkUnitRepository(db_client)
+    other_state = {**unit("01000"), "state_fips": "06"}
+    assert repo.add_units("acs5", 2024, [unit("01000"), other_state]) == 2
+    assert repo.add_units("acs5", 2024, [{**unit("01000"), "priority": 5}]) == 0
+    assert repo.add_units("acs5", 2024, [unit("02000")]) == 1
+
+    priorities = {
+        (u["state_fips"], u["geo_code"]): u["priority"]
+        for u in repo.get_units("acs5", 2024)
+    }
+    assert priorities == {("36", "01000"): 5, ("06", "01000"): 0, ("36", "02000"): 0}
+
+
+def test_rows_of_units_follows_put_order():
+    units = [
+        {**unit("01000"), "rows": 2},
+        {**unit("02000"), "rows": 0},
+        {**unit("03000"), "rows": 1},
+    ]
+    rows = [{"n": 1}, {"n": 2}, {"n": 3}]
+    assert rows_of_units(rows, units, [units[2]]) == [{"n": 3}]
+    assert rows_of_units(rows, units, units[:1]) == [{"n": 1}, {"n": 2}]
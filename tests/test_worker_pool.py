@@ -0,0 +1,70 @@
+import asyncio
+
+from empowered.ingest.worker_pool import WorkerPool
+
+
+def test_pool_never_runs_more_than_its_concurrency():
+    running = []
+    peak = []
+
+    async def handler(job):
+        running.append(job)
+        peak.append(len(running))
+        await asyncio.sleep(0.001)
+        running.remove(job)
+
+    pool = WorkerPool(handler, concurrency=3, report_every=60)
+    stats = asyncio.run(pool.run(range(20)))
+
+    assert max(peak) == 3
+    assert stats["submitted"] == stats["completed"] == 20
+    assert stats["failed"] == 0 and stats["busy"] == 0
+
+
+def test_producer_stays_within_the_queue_bound():
+    pulled = []
+    handled = []
+
+    def jobs():
+        for n in range(10):
+            pulled.append(n)
+            yield n
+
+    async def handler(job):
+        # by the time the first job runs, only the queue's worth is pulled
+        handled.append(len(pulled))
+        await asyncio.sleep(0.001)
+
+    asyncio.run(WorkerPool(handler, concurrency=1, queue_size=2).run(jobs()))
+    assert handled[0] <= 1 + 2 + 1
+    assert len(pulled) == 10
+
+
+def test_failed_jobs_are_counted_without_stopping_the_pool():
+    done = []
+
+    async def handler(job):
+        if job % 3 == 0:
+            raise RuntimeError(f"job {job} failed")
+        done.append(job)
+
+    stats = asyncio.run(WorkerPool(handler, concurrency=2).run(range(9)))
+
+    assert stats["failed"] == 3
+    assert stats["completed"] == 6
+    assert sorted(done) == [1, 2, 4, 5, 7, 8]
+
+
+def test_async_job_sources_are_drained():
+    async def jobs():
+        for n in range(5):
+            await asyncio.sleep(0)
+            yield n
+
+    seen = []
+
+    async def handler(job):
+        seen.append(job)
+
+    asyncio.run(WorkerPool(handler, concurrency=2).run(jobs()))
+    assert sorted(seen) == [0, 1, 2, 3, 4]